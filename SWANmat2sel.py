@@ -23,6 +23,10 @@
 # For now, it only works for stationary SWAN simulations.
 # TODO: update for non-stationary output as well
 #
+# Revised: Oct 17, 2026
+# The *.cli file is now written by getIPOBO_IKLE() directly, without a
+# temporary file.
+#
 # Uses: Python 2 or 3, Numpy, Scipy
 #
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -105,12 +109,9 @@ for i in range(num_pts):
 #n,e,x,y,z,ikle = readAdcirc(adcirc_file)
 
 # use getIPOBO_IKLE() to get IPOBO and IKLE arrays
-# this method also writes a 'temp.cli' file as well
-n,e,x,y,z,IKLE,IPOBO = getIPOBO_IKLE(adcirc_file)
-
-# rename temp.cli to proper name
+# this method also writes the *.cli file as well
 cli_file = output_file.split('.',1)[0] + '.cli'
-os.rename('temp.cli',cli_file)
+n,e,x,y,z,IKLE,IPOBO = getIPOBO_IKLE(adcirc_file, cli_file)
 
 # make it a double precision *.slf file
 ftype = 'd'
@@ -29,6 +29,11 @@
 # bnd_extr_stbtel.f90 (pre-compiled binaries are available for
 # Linux 32, Linux 64, and Windows).
 #
+# Revised: Oct 17, 2026
+# The IPOBO array and the *.cli file are now generated in python (with
+# getIPOBO_IKLE() from utilities.py), without the pre-compiled binaries
+# and without temporary files.
+#
 # Uses: Python 2 or 3, Numpy
 #
 # Example:
@@ -44,8 +49,6 @@
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 import os,sys                              # system parameters
 import numpy as np                         # numpy
-import struct                              # to determine sys architecture
-import subprocess                          # to execute binaries
 from ppmodules.selafin_io_pp import *      # pp's SELAFIN io
 from ppmodules.readMesh import *           # for the readAdcirc function
 from ppmodules.utilities import *          # getIPOBO_IKLE() method
@@ -70,12 +73,9 @@ precision = sys.argv[4]
 output_file = sys.argv[6]
 
 # reads mesh data using the get IPOBO_IKLE() method from utilities.py
-# the ikle and the ppIPOB are one-based
-n,e,x,y,z,ikle,ppIPOB = getIPOBO_IKLE(adcirc_file)
-
-# the above method generates a file called temp.cli, which we rename here
+# the ikle and the ppIPOB are one-based; the method also writes the *.cli
 cli_file = output_file.split('.',1)[0] + '.cli'
-os.rename('temp.cli',cli_file)
+n,e,x,y,z,ikle,ppIPOB = getIPOBO_IKLE(adcirc_file, cli_file)
 
 # now we can write the *.slf file
 #######################################################################
@@ -17,6 +17,10 @@
 # Revised: Feb 18, 2017
 # Added precision (single or double) as a command line input.
 #
+# Revised: Oct 17, 2026
+# The *.cli file is now written by getIPOBO_IKLE() directly, without a
+# temporary file.
+#
 # Uses: Python 2 or 3, Numpy
 #
 # Example:
@@ -70,13 +74,10 @@ if (n1 != n2) or (e1 != e2):
   sys.exit()
 
 # use getIPOBO_IKLE() to get the geometry from the bathy file
-# this method also writes a 'temp.cli' file as well
+# this method also writes the *.cli file as well
 # note indices in ikle and ipobo are one based
-n,e,x,y,z,IKLE,IPOBO = getIPOBO_IKLE(bathy_file)
-
-# rename temp.cli to proper name
 cli_file = output_file.split('.',1)[0] + '.cli'
-os.rename('temp.cli',cli_file)
+n,e,x,y,z,IKLE,IPOBO = getIPOBO_IKLE(bathy_file, cli_file)
 
 # It needs these to write the *.slf file
 NELEM = e
@@ -32,6 +32,10 @@
 # value that was hard coded. This version retains the original values
 # for nodes outside of the polygons.
 #
+# Revised: Oct 17, 2026
+# The output mesh is written with writeAdcirc() from writeMesh.py, which
+# formats all of the nodes and elements in large chunks.
+#
 # Uses: Python 2 or 3, Matplotlib, Numpy
 #
 # Example:
@@ -50,6 +54,7 @@
 import os,sys                              # system parameters
 import numpy             as np             # numpy
 from ppmodules.readMesh import *           # to get all readMesh functions
+from ppmodules.writeMesh import *          # to get all writeMesh functions
 import matplotlib.path as mplPath          # for point in poly test
 import timeit
 from progressbar import ProgressBar, Bar, Percentage, ETA
@@ -75,9 +80,6 @@ boundary_file = sys.argv[4]
 dummy3 = sys.argv[5]
 output_file = sys.argv[6]
 
-# to create the output file
-fout = open(output_file,"w")
-
 # read the adcirc file
 n,e,x,y,z,ikle = readAdcirc(input_file)
 
@@ -174,19 +176,7 @@ pbar.finish()
 #	print('Assigning default value of ' + str(default) + ' as attribute')
 
 # now to write the adcirc mesh file
-fout.write("ADCIRC" + "\n")
-# writes the number of elements and number of nodes in the header file
-fout.write(str(e) + " " + str(n) + "\n")
-
-# writes the nodes
-for i in range(n):
-	fout.write(str(i+1) + " " + str("{:.3f}".format(x[i])) + " " + 
-		str("{:.3f}".format(y[i])) + " " + str("{:.3f}".format(f[i])) + "\n")
-#
-# writes the elements
-for i in range(e):
-	fout.write(str(i+1) + " 3 " + str(ikle[i,0]+1) + " " + str(ikle[i,1]+1) + " " + 
-		str(ikle[i,2]+1) + "\n")	
+writeAdcirc(n, e, x, y, f, ikle, output_file)
 #
 end_time = timeit.default_timer()
 
@@ -16,6 +16,15 @@
 # defined such that they are perpedicular to the flow. If the sections
 # are not perpedicular to the flow, garbage results may be reported.
 #
+# Revised: Oct 17, 2026
+# Only the depth and velocity variables are decoded at each time step.
+#
+# Revised: Oct 17, 2026
+# Q is computed for the time steps on all cores, with mapFrames() from
+# parallel_pp.py. Each worker process of the pool opens the *.slf file
+# once, reads the time steps it is given, and calls computeQatTime() on
+# them; the Q of each time step comes back in time step order.
+#
 # Uses: Python 2 or 3, Numpy
 #
 # Example:
@@ -36,9 +45,53 @@ import numpy             as np             # numpy
 import matplotlib.tri    as mtri           # matplotlib triangulations
 from ppmodules.selafin_io_pp import *      # to get SELAFIN I/O 
 from ppmodules.utilities import *          # to get the utilities
+from ppmodules.parallel_pp import *        # to use all cores
 from scipy.integrate import simps          # simpson's rule integration 
 # 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+#
+# computes Q through each line for a single time step; called by 
+# mapFrames() with vals holding depth, velu and velv
+def computeQatTime(slf, t, time, vals, shared):
+  triang, x_lns, y_lns, sta, shapeid_lns, unique_lines = shared
+  n_lns = len(unique_lines)
+  
+  # store depths, velu and velv from the input file
+  depths = vals[0, :]
+  velu = vals[1, :]
+  velv = vals[2, :]
+  
+  # to perform the interpolations at the nodes of the resampled lines
+  # for depth, velu, and velv
+  interpolator_depths = mtri.LinearTriInterpolator(triang, depths)
+  depths_lns = interpolator_depths(x_lns, y_lns)
+
+  interpolator_velu = mtri.LinearTriInterpolator(triang, velu)
+  velu_lns = interpolator_velu(x_lns, y_lns)
+  
+  interpolator_velv = mtri.LinearTriInterpolator(triang, velv)
+  velv_lns = interpolator_velv(x_lns, y_lns)
+  
+  uh = velu_lns[:] * depths_lns[:]
+  vh =  velv_lns[:] * depths_lns[:]
+  mag = np.sqrt( uh*uh + vh*vh)
+
+  # now go through each line, and integrate
+  Qt = np.zeros(n_lns)
+  for j in range(n_lns):
+    cursta = list()
+    curmag = list()
+    for i in range(len(mag)):
+      if (abs(unique_lines[j] - shapeid_lns[i]) < 0.01):
+        cursta.append(sta[i])
+        curmag.append(mag[i])
+    Qt[j] = simps(curmag,cursta)
+  
+  return Qt
+# 
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # MAIN
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~  
 curdir = os.getcwd()
@@ -138,45 +191,15 @@ if ((depth_idx < 0) or (velu_idx < 0) or (velv_idx < 0) ):
 # the final results variable where the results will be saved
 Q = np.zeros( (len(times), n_lns) )
 
-# this is the start of the main loop
-for t in range(len(times)):
+# this is the start of the main loop; the time steps are handed out to
+# a pool of processes, and Q for each one comes back in order
+shared = (triang, x_lns, y_lns, sta, shapeid_lns, unique_lines)
+for t, time, Qt in mapFrames(input_file, computeQatTime, 
+  vars=[depth_idx, velu_idx, velv_idx], shared=shared):
   
   # print time step to the user
   print('Computing Q at time step index :' + str(t))
-  
-  # read the snapshot for time t from the *.slf file
-  slf.readVariables(t)
-  master_results = slf.getVarValues()
-  
-  # store depths, velu and velv from the input file
-  depths = master_results[depth_idx, :]
-  velu = master_results[velu_idx, :]
-  velv = master_results[velv_idx, :]
-  
-  # to perform the interpolations at the nodes of the resampled lines
-  # for depth, velu, and velv
-  interpolator_depths = mtri.LinearTriInterpolator(triang, depths)
-  depths_lns = interpolator_depths(x_lns, y_lns)
-
-  interpolator_velu = mtri.LinearTriInterpolator(triang, velu)
-  velu_lns = interpolator_velu(x_lns, y_lns)
-  
-  interpolator_velv = mtri.LinearTriInterpolator(triang, velv)
-  velv_lns = interpolator_velv(x_lns, y_lns)
-  
-  uh = velu_lns[:] * depths_lns[:]
-  vh =  velv_lns[:] * depths_lns[:]
-  mag = np.sqrt( uh*uh + vh*vh)
-
-  # now go through each line, and integrate
-  for j in range(n_lns):
-    cursta = list()
-    curmag = list()
-    for i in range(len(mag)):
-      if (abs(unique_lines[j] - shapeid_lns[i]) < 0.01):
-        cursta.append(sta[i])
-        curmag.append(mag[i])
-    Q[t,j] = simps(curmag,cursta)
+  Q[t,:] = Qt
 
 # prints the final result to the file    
 # write the header string
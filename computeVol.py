@@ -18,6 +18,10 @@
 # when the reference plane and a particular element intersect. An error
 # is thrown in this case, and the script terminates!
 #
+# Revised: Oct 17, 2026
+# The orientation, area and volume of the elements are computed all at
+# once, with the ppMesh class from mesh_pp.py.
+#
 # Uses: Python 2 or 3, Numpy
 #
 # Example:
@@ -35,21 +39,12 @@ import os,sys                              # system parameters
 import numpy             as np             # numpy 
 from ppmodules.utilities import *          # to get the utilities
 from ppmodules.readMesh import *           # to get the readAdcirc fun
+from ppmodules.mesh_pp import *            # to get the ppMesh class
 # 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # MAIN
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~  
 #
-def element_area(x1,y1,x2,y2,x3,y3):
-	# signs in eqs work when the elements are CCW
-	twoA = (x2*y3 - x3*y2) - (x1*y3-x3*y1) + (x1*y2 - x2*y1)
-	area = twoA / 2.0
-	return area
-  
-# this works for python 2 and 3
-def CCW(x1,y1,x2,y2,x3,y3):
-   return (y3-y1)*(x2-x1) > (y2-y1)*(x3-x1)
-#
 def computeVolume(input_file, ref_level):
   # now read the input mesh file (ikle are zero based)
   n,e,x,y,z,ikle = readAdcirc(input_file)
@@ -65,34 +60,15 @@ def computeVolume(input_file, ref_level):
     print('Reference level too high. Reduce it, and try again. Exiting.')
     sys.exit()
   
-  # make sure the elements are oriented in CCW fashion
-  # go through each element, and make sure it is oriented in CCW fashion
-  for i in range(len(ikle)):
-    
-    # if the element is not CCW then must change its orientation
-    if not CCW( x[ikle[i,0]], y[ikle[i,0]], x[ikle[i,1]], y[ikle[i,1]], 
-      x[ikle[i,2]], y[ikle[i,2]] ):
-    
-      t0 = ikle[i,0]
-      t1 = ikle[i,1]
-      t2 = ikle[i,2]
-      
-      # switch orientation
-      ikle[i,0] = t2
-      ikle[i,2] = t0
-  
-  # compute the area and volume of each element in the mesh (or tin) file
-  area = np.zeros(e)
-  vol = np.zeros(e)
+  # the area of each element, with the elements oriented in CCW fashion
+  mesh = ppMesh(n,e,x,y,z,ikle)
+  ikle = mesh.getCCWIkle()
+  area = mesh.getAreas()
   
-  for i in range(e):
-    area[i] = element_area(x[ikle[i,0]], y[ikle[i,0]], 
-      x[ikle[i,1]], y[ikle[i,1]], x[ikle[i,2]], y[ikle[i,2]])
-      
-    # the volume between the reference level and the surface in a tin model
-    # is the same as the volume of truncated right triangular prism
-    vol[i] = (area[i] / 3.0) * ( (z[ikle[i,0]] - ref_level) +
-      (z[ikle[i,1]] - ref_level) + (z[ikle[i,2]] - ref_level) )
+  # the volume between the reference level and the surface in a tin model
+  # is the same as the volume of truncated right triangular prism
+  vol = (area / 3.0) * ( (z[ikle[:,0]] - ref_level) +
+    (z[ikle[:,1]] - ref_level) + (z[ikle[:,2]] - ref_level) )
     
   # the total volume is the sum of the the individual vol[i]
   volTotal = np.sum(vol)
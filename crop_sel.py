@@ -15,6 +15,10 @@
 # start files for use in TELEMAC simulations. To know which time step
 # to retain, make sure you run probe.py script first.
 #
+# Revised: Oct 17, 2026
+# The retained time step is sliced from a memory mapped view of the input
+# file, rather than found by reading through the file.
+#
 # Uses: Python 2 or 3, Numpy
 #
 # Usage:
@@ -64,9 +68,9 @@ NELEM, NPOIN, NDP, IKLE, IPOBO, x, y = slf.getMesh()
 # number of variables
 NVAR = len(vnames)
 
-# read the variables for the specified time step t
-slf.readVariables(t)
-results = slf.getVarValues()
+# read the variables for the specified time step t from the memory
+# mapped view of the input file
+results = slf.memmapVariables()[t].astype(np.float64)
 
 # now write the SELAFIN file for the extracted time step t
 slf_cr = ppSELAFIN(output_file)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 crop_sel_xy.py                        #
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+#
+# Date: Oct 17, 2026
+#
+# Purpose: Script designed to take an existing SELAFIN result file, and
+# retain only the part of the mesh that is inside a polygon (or inside a
+# bounding box), for all time steps. An element is retained if its
+# centroid is inside the polygon. The nodes of the retained elements are
+# renumbered, the boundary (IPOBO) of the cropped mesh is rebuilt, and
+# every time step of the input file is written to the output file. This
+# is useful when post-processing a small area of a large model. Works
+# for 2d *.slf files only. The crop_sel.py script crops in time. Where
+# the retained elements meet only at a node (a bow tie), the smaller 
+# groups of elements at that node are removed, with a warning, so that 
+# the boundary is valid.
+#
+# Uses: Python 2 or 3, Numpy, Matplotlib
+#
+# Usage:
+# python crop_sel_xy.py -i result.slf -p polygon.csv -o result_crop.slf
+# python crop_sel_xy.py -i result.slf -b 100.0 200.0 500.0 800.0 -o result_crop.slf
+#
+# where:
+# -i input *.slf file
+# -p polygon file in pputils format (shapeid,x,y); only one polygon
+# -b bounding box as xmin ymin xmax ymax
+# -o output *.slf file
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+import sys
+import numpy as np
+import matplotlib.path as mplPath
+from ppmodules.selafin_io_pp import *
+from ppmodules.utilities import *
+#
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+# MAIN
+#+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
+#
+# I/O
+if len(sys.argv) == 7 and sys.argv[3] == '-p':
+  input_file = sys.argv[2]         # input *.slf file
+  polygon_file = sys.argv[4]       # polygon file
+  output_file  = sys.argv[6]       # output *.slf file
+  bbox = None
+elif len(sys.argv) == 10 and sys.argv[3] == '-b':
+  input_file = sys.argv[2]         # input *.slf file
+  bbox = [float(sys.argv[4]), float(sys.argv[5]), float(sys.argv[6]),
+    float(sys.argv[7])]            # xmin ymin xmax ymax
+  output_file  = sys.argv[9]       # output *.slf file
+else:
+  print('Wrong number of arguments ... stopping now ...')
+  print('Usage:')
+  print('python crop_sel_xy.py -i result.slf -p polygon.csv -o result_crop.slf')
+  print('python crop_sel_xy.py -i result.slf -b 100.0 200.0 500.0 800.0 -o result_crop.slf')
+  sys.exit()
+
+# use selafin_io_pp class ppSELAFIN
+slf = ppSELAFIN(input_file)
+slf.readHeader()
+slf.readTimes()
+
+# reads the header information from the SELAFIN file
+times = slf.getTimes()
+vnames = slf.getVarNames()
+vunits = slf.getVarUnits()
+float_type,float_size = slf.getPrecision()
+NELEM, NPOIN, NDP, IKLE, IPOBO, x, y = slf.getMesh()
+
+if (slf.getNPLAN() > 1):
+  print('3d *.slf files not supported yet. Exiting!')
+  sys.exit()
+
+# centroids of all elements
+xc = np.mean(x[IKLE-1], axis=1)
+yc = np.mean(y[IKLE-1], axis=1)
+
+# find the elements to retain
+if (bbox is None):
+  poly_data = np.loadtxt(polygon_file, delimiter=',',skiprows=0,unpack=True)
+
+  if (len(np.unique(poly_data[0,:])) > 1):
+    print('Number of polygons in input file greater than 1. Exiting.')
+    sys.exit()
+
+  path = mplPath.Path(np.column_stack((poly_data[1,:], poly_data[2,:])))
+  inside = path.contains_points(np.column_stack((xc, yc)))
+else:
+  inside = (xc >= bbox[0]) & (yc >= bbox[1]) & (xc <= bbox[2]) & (yc <= bbox[3])
+
+elems = np.where(inside)[0]
+
+if (len(elems) == 0):
+  print('No elements found inside the cropping area. Exiting!')
+  sys.exit()
+
+# elements that touch the rest of the cropped mesh only at a node (a bow
+# tie) would make the boundary visit that node twice; at each such node,
+# only the largest group of elements is kept
+keep, pinch = removePinchNodes(IKLE[elems]-1)
+if (len(pinch) > 0):
+  print('Warning: ' + str(len(pinch)) + ' node(s) where elements meet ' +
+    'only at a vertex; removed ' + str(np.sum(~keep)) + ' element(s) ' +
+    'at node(s) ' + ' '.join([str(p+1) for p in pinch]))
+  elems = elems[keep]
+
+# mesh of the cropped area; node_idx is the gather index into the input
+NELEM_cr, NPOIN_cr, NDP_cr, IKLE_cr, node_idx = slf.getSubMesh(elems)
+x_cr = x[node_idx]
+y_cr = y[node_idx]
+
+# rebuild the boundary of the cropped mesh
+nbor = getBoundaryNodes(x_cr, y_cr, IKLE_cr-1)
+IPOBO_cr = np.zeros(NPOIN_cr, dtype=np.int32)
+IPOBO_cr[nbor] = np.arange(1, len(nbor)+1)
+
+print('Number of nodes retained: ' + str(NPOIN_cr) + ' of ' + str(NPOIN))
+print('Number of elements retained: ' + str(NELEM_cr) + ' of ' + str(NELEM))
+
+# now write the cropped SELAFIN file
+slf_cr = ppSELAFIN(output_file)
+slf_cr.setPrecision(float_type, float_size)
+slf_cr.setTitle('created with pputils')
+slf_cr.setVarNames(vnames)
+slf_cr.setVarUnits(vunits)
+slf_cr.setIPARAM([1, 0, 0, 0, 0, 0, 0, 0, 0, 1])
+slf_cr.setDATE(slf.getDATE())
+slf_cr.setMesh(NELEM_cr, NPOIN_cr, NDP_cr, IKLE_cr, IPOBO_cr, x_cr, y_cr)
+slf_cr.writeHeader()
+
+# stream every time step through the gather index
+for t, time, results in slf.iterFrames():
+  slf_cr.writeVariables(time, results[:,node_idx])
+
+slf.close()
+slf_cr.close()
+
+print('All done!')
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 decimate_sel.py                       #
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+#
+# Date: Oct 17, 2026
+#
+# Purpose: Script takes in a *.slf file, and writes a new *.slf file with
+# fewer time steps. The time steps can be reduced by keeping every n-th
+# time step, by keeping the time steps inside a time window, by linear
+# interpolation onto a new regular time step, or by averaging the time
+# steps over blocks of time. The time window can be combined with the
+# other three options. The input file is read one time step at a time
+# (at most two are held in memory), so the script works on files that
+# are much larger than the available memory. The crop_sel.py script keeps
+# a single time step. Works for 2d and 3d *.slf files.
+#
+# Uses: Python 2 or 3, Numpy
+#
+# Example:
+#
+# python decimate_sel.py -i in.slf -n 10 -o out.slf
+# python decimate_sel.py -i in.slf -w 3600 7200 -o out.slf
+# python decimate_sel.py -i in.slf -r 600 -o out.slf
+# python decimate_sel.py -i in.slf -a 600 -o out.slf
+# python decimate_sel.py -i in.slf -n 10 -o out.slf -w 3600 7200
+# where:
+# -i input *.slf file
+# -n keep every n-th time step
+# -w keep the time steps with times (in seconds) within t0 and t1
+# -r interpolate the time steps onto a regular time step (in seconds)
+# -a average the time steps over blocks of time (in seconds); the time of
+#    each block is the mean time of the time steps in the block
+# -o output *.slf file
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+import os,sys
+import numpy as np
+from ppmodules.selafin_io_pp import *
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# MAIN
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+curdir = os.getcwd()
+#
+# I/O
+t0 = None
+t1 = None
+if len(sys.argv) == 7 and sys.argv[3] in ['-n', '-r', '-a']:
+  input_file = sys.argv[2]
+  option = sys.argv[3]
+  param = float(sys.argv[4])
+  output_file = sys.argv[6]
+elif len(sys.argv) == 8 and sys.argv[3] == '-w':
+  input_file = sys.argv[2]
+  option = sys.argv[3]
+  param = 1
+  t0 = float(sys.argv[4])
+  t1 = float(sys.argv[5])
+  output_file = sys.argv[7]
+elif (len(sys.argv) == 10 and sys.argv[3] in ['-n', '-r', '-a'] and
+  sys.argv[7] == '-w'):
+  input_file = sys.argv[2]
+  option = sys.argv[3]
+  param = float(sys.argv[4])
+  output_file = sys.argv[6]
+  t0 = float(sys.argv[8])
+  t1 = float(sys.argv[9])
+else:
+  print('Wrong number of Arguments, stopping now...')
+  print('Usage:')
+  print('python decimate_sel.py -i in.slf -n 10 -o out.slf')
+  print('python decimate_sel.py -i in.slf -w 3600 7200 -o out.slf')
+  print('python decimate_sel.py -i in.slf -r 600 -o out.slf')
+  print('python decimate_sel.py -i in.slf -a 600 -o out.slf')
+  print('python decimate_sel.py -i in.slf -n 10 -o out.slf -w 3600 7200')
+  sys.exit()
+
+if (param <= 0):
+  print('The value after ' + option + ' must be greater than zero. Exiting!')
+  sys.exit()
+
+if (option == '-n' and (param < 1 or param != int(param))):
+  print('The value after -n must be an integer of 1 or more. Exiting!')
+  sys.exit()
+
+# reads the *.slf file
+slf = ppSELAFIN(input_file)
+slf.readHeader()
+slf.readTimes()
+
+times = slf.getTimes()
+vnames = slf.getVarNames()
+vunits = slf.getVarUnits()
+float_type,float_size = slf.getPrecision()
+NELEM, NPOIN, NDP, IKLE, IPOBO, x, y = slf.getMesh()
+
+if (len(times) < 1):
+  print('No time steps in the input file. Exiting!')
+  sys.exit()
+
+# the time window defaults to all of the time steps
+if (t0 is None):
+  t0 = times[0]
+  t1 = times[-1]
+
+if (t1 < t0):
+  print('End of the time window is before its start. Exiting!')
+  sys.exit()
+
+# write the front matter of the output *.slf file; the IPARAM is copied,
+# so that 3d files keep their number of planes
+outslf = ppSELAFIN(output_file)
+outslf.setPrecision(float_type, float_size)
+outslf.setTitle('created with pputils')
+outslf.setVarNames(vnames)
+outslf.setVarUnits(vunits)
+outslf.setIPARAM(slf.IPARAM)
+outslf.setDATE(slf.getDATE())
+outslf.setMesh(NELEM, NPOIN, NDP, IKLE, IPOBO, x, y)
+outslf.writeHeader()
+
+count = 0
+if (option == '-n' or option == '-w'):
+  # indices of the time steps inside the window, then every n-th one
+  idx = [t for t in range(len(times)) if (times[t] >= t0 and times[t] <= t1)]
+  for t in idx[::int(param)]:
+    slf.readVariables(t)
+    outslf.writeVariables(times[t], slf.getVarValues())
+    count = count + 1
+elif (option == '-r'):
+  # new regular times within the window (and within the times of the 
+  # file); the window end is included when it falls on the new time step
+  t0 = max(t0, times[0])
+  t1 = min(t1, times[-1])
+  if (t1 < t0):
+    print('Time window is outside the times of the input file. Exiting!')
+    sys.exit()
+  new_times = t0 + param * np.arange(int(np.floor((t1 - t0) / param + 1.0e-9)) + 1)
+  for time, results in slf.resampleFrames(new_times):
+    outslf.writeVariables(time, results)
+    count = count + 1
+elif (option == '-a'):
+  for time, results in slf.averageFrames(param, t0, t1):
+    outslf.writeVariables(time, results)
+    count = count + 1
+
+print('Number of time steps written: ' + str(count) + ' of ' + str(len(times)))
+
+slf.close()
+outslf.close()
+
+print('All done!')
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 envelope_sel.py                       #
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+#
+# Date: Oct 17, 2026
+#
+# Purpose: Script takes in a *.slf file, and computes the envelope of
+# each variable at each node over all time steps (i.e., the maximum, the
+# minimum, the time of the maximum, and the mean). The envelope is
+# written as a *.slf file with a single time step. If the input file has
+# VELOCITY U and VELOCITY V (and no SCALAR VELOCITY), the envelope of the
+# velocity magnitude is computed as well. The time steps are read one at
+# a time, so the memory used does not depend on the number of time steps.
+# Works for 2d *.slf files only.
+#
+# Uses: Python 2 or 3, Numpy
+#
+# Example:
+#
+# python envelope_sel.py -i in.slf -o envelope.slf
+# where:
+# -i input *.slf file
+# -o output *.slf file with the envelope variables
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+import os,sys
+import numpy as np
+from ppmodules.selafin_io_pp import *
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# MAIN
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+curdir = os.getcwd()
+#
+# I/O
+if len(sys.argv) != 5 :
+  print('Wrong number of Arguments, stopping now...')
+  print('Usage:')
+  print('python envelope_sel.py -i in.slf -o envelope.slf')
+  sys.exit()
+
+input_file = sys.argv[2]
+output_file = sys.argv[4]
+
+# reads the *.slf file
+slf = ppSELAFIN(input_file)
+slf.readHeader()
+slf.readTimes()
+
+# get times of the selafin file, and the variable names
+times = slf.getTimes()
+variables = slf.getVarNames()
+units = slf.getVarUnits()
+float_type,float_size = slf.getPrecision()
+
+# gets some mesh properties from the *.slf file
+NELEM, NPOIN, NDP, IKLE, IPOBO, x, y = slf.getMesh()
+
+if (slf.getNPLAN() > 1):
+  print('3d *.slf files not supported yet. Exiting!')
+  sys.exit()
+
+if (len(times) < 1):
+  print('No time steps in the input file. Exiting!')
+  sys.exit()
+
+# find the velocity variables, to compute the velocity magnitude
+velu_idx = -1
+velv_idx = -1
+scalar_vel = False
+for i in range(len(variables)):
+  if ((variables[i].find('VELOCITY U') > -1)):
+    velu_idx = i
+  if ((variables[i].find('VELOCITY V') > -1)):
+    velv_idx = i
+  if ((variables[i].find('SCALAR VELOCITY') > -1)):
+    scalar_vel = True
+
+add_mag = (velu_idx > -1) and (velv_idx > -1) and (not scalar_vel)
+
+# names and units of the variables that are enveloped
+env_names = [variables[i].strip() for i in range(len(variables))]
+env_units = [units[i].strip() for i in range(len(units))]
+if add_mag:
+  env_names.append('SCALAR VELOCITY')
+  env_units.append(env_units[velu_idx])
+
+NVAR = len(env_names)
+
+# running envelope arrays (one value per variable per node)
+vmax = np.zeros((NVAR, NPOIN))
+vmin = np.zeros((NVAR, NPOIN))
+tmax = np.zeros((NVAR, NPOIN))
+vsum = np.zeros((NVAR, NPOIN))
+
+print('Computing the envelope ...')
+
+# stream through all time steps once
+for t, time, results in slf.iterFrames():
+  if add_mag:
+    mag = np.sqrt(results[velu_idx,:]**2 + results[velv_idx,:]**2)
+    results = np.vstack((results, mag))
+
+  if (t == 0):
+    vmax[:,:] = results
+    vmin[:,:] = results
+    tmax[:,:] = time
+  else:
+    new_max = results > vmax
+    vmax[new_max] = results[new_max]
+    tmax[new_max] = time
+    np.minimum(vmin, results, out=vmin)
+
+  vsum += results
+
+vmean = vsum / len(times)
+
+# variable names and units of the output file
+out_names = list()
+out_units = list()
+for prefix, unit in [('MAX ', None), ('MIN ', None), ('TMAX ', 'S'),
+  ('MEAN ', None)]:
+  for i in range(NVAR):
+    out_names.append((prefix + env_names[i])[0:16])
+    if (unit is None):
+      out_units.append(env_units[i][0:16])
+    else:
+      out_units.append(unit)
+
+# write the front matter of the output *.slf file
+outslf = ppSELAFIN(output_file)
+outslf.setPrecision(float_type, float_size)
+outslf.setTitle('created with pputils')
+outslf.setVarNames(out_names)
+outslf.setVarUnits(out_units)
+outslf.setIPARAM([1, 0, 0, 0, 0, 0, 0, 0, 0, 1])
+outslf.setDATE(slf.getDATE())
+outslf.setMesh(NELEM, NPOIN, NDP, IKLE, IPOBO, x, y)
+outslf.writeHeader()
+
+# the envelope is written as a single time step
+outslf.writeVariables(0.0, np.vstack((vmax, vmin, tmax, vmean)))
+
+slf.close()
+outslf.close()
+
+print('All done!')
@@ -18,6 +18,10 @@
 # that it can be used to force a local TELEMAC-2D model using my bord.f
 # subroutine.
 #
+# Revised: Oct 17, 2026
+# The results at all extraction nodes are read in a single pass through
+# the *.slf file with readVariablesAtNodes().
+#
 # Uses: Python 2 or 3, Matplotlib, Numpy, Scipy
 #
 # Example:
@@ -98,21 +102,16 @@ npoints = len(ox)
 source = np.column_stack((x,y))
 tree = spatial.cKDTree(source)
 
-# list of output for final results for bord.f
-all_res = np.empty([npoints,ntimes,NVAR])
-
-# for each coordinate in the points data, find the corresponding node
-# in the results file mesh
-for i in range(npoints):
-    
-  # find the node index using cKDTree        
-  d, idx = tree.query((ox[i],oy[i]), k = 1)
+# find the node index of each coordinate in the points data using cKDTree
+d, idx = tree.query(np.column_stack((ox,oy)), k = 1)
 
-  # now that we know which node it is, use methods in ppSELAFIN_io class
-  slf.readVariablesAtNode(idx)
-  result = slf.getVarValuesAtNode()
+# now that we know which nodes they are, read the results at all nodes in
+# a single pass through the file; result has shape (time, variable, node)
+slf.readVariablesAtNodes(idx)
+result = slf.getVarValuesAtNodes()
 
-  all_res[i,:,:] = result
+# list of output for final results for bord.f
+all_res = np.transpose(result, (2,0,1))
   
 # to write a separate file for each variable
 for k in range(NVAR):
@@ -20,6 +20,12 @@
 # Revised: Jun 14, 2019
 # Added the progress bar.
 #
+# Revised: Oct 17, 2026
+# Time steps are read in the background with iterFrames().
+#
+# Revised: Oct 17, 2026
+# Uses the shared frame cache if PPUTILS_FRAME_CACHE is set.
+#
 # Uses: Python 2 or 3, Numpy
 #
 # Usage:
@@ -67,6 +73,7 @@ print('Reading result file headers ...')
 slf = ppSELAFIN(input_file)
 slf.readHeader()
 slf.readTimes()
+slf.useFrameCacheFromEnv()
 
 # get the mesh properties from the resultfile
 NELEM, NPOIN, NDP, IKLE, IPOBO, x, y = slf.getMesh()
@@ -117,13 +124,11 @@ print('Interpolating ...')
 w = [Percentage(), Bar(), ETA()]
 pbar = ProgressBar(widgets=w, maxval=len(times)).start()
 
-for i in range(len(times)):
+# the next time steps are read in the background while interpolating
+for i, time, results in slf.iterFrames(vars=[v]):
   #print('Interpolating time: ' + str(times[i]) + ' out of ' + str(times[len(times)-1]))
-  
-  slf.readVariables(i)
-  results = slf.getVarValues()
 
-  interpolator = mtri.LinearTriInterpolator(triang, results[v,:])
+  interpolator = mtri.LinearTriInterpolator(triang, results[0,:])
   ln_interp[i,:] = interpolator(lnx,lny)
   
   # update the pbar
@@ -39,6 +39,14 @@
 # for 3d files had to be adjusted, so that output remained the same as
 # before.
 #
+# Revised: Oct 17, 2026
+# The time series at the node is sliced from a memory mapped view of the
+# *.slf file, rather than read with readVariablesAtNode().
+#
+# Revised: Oct 17, 2026
+# If there is a valid time major companion file (see transpose_sel.py),
+# the time series at the node is read from it instead.
+#
 # Uses: Python 2 or 3, Matplotlib, Numpy
 #
 # Example:
@@ -165,14 +173,25 @@ for i in range(NVAR):
   fout.write(units[i] + ', ')
 fout.write('\n')
 
+# results at the node on each plane, with shape (time, variable, plane);
+# these come from the time major companion file if there is a valid one,
+# and otherwise from a memory mapped view of the *.slf file
+if slf.readTransposed():
+  slf.readVariablesAtNodes(idx_all)
+  values = slf.getVarValuesAtNodes()
+else:
+  values = slf.memmapVariables()[:, :, idx_all]
+
+# only the time steps that are complete in the file have values
+numTimes = min(len(times), values.shape[0])
+
 ########################################################################
 # extract results for every plane (if there are multiple planes that is)
 for p in range(NPLAN):
-  slf.readVariablesAtNode(idx_all[p])
-  results = slf.getVarValuesAtNode()
+  results = values[:, :, p].astype(np.float64)
   
   # outputs the results 'd %b %Y %H:%M'
-  for i in range(len(times)):
+  for i in range(numTimes):
     fout.write(str(pydate.strftime('%Y-%m-%d %H:%M') + ', '))
     fout.write(str("{:.3f}").format(times[i]) + ', ')
     
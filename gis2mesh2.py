@@ -23,6 +23,10 @@
 # Revised: May 6, 2017
 # Placed a call to processor type inside the posix if statement.
 #
+# Revised: Oct 17, 2026
+# The centroids of the elements of mesh_initial.grd are computed all at
+# once, with the ppMesh class from mesh_pp.py.
+#
 # Uses: Python 2 or 3, Numpy
 #
 # Example:
@@ -92,6 +96,7 @@ from collections import OrderedDict        # for removal of duplicate nodes
 import struct                              # to determine sys architecture
 import subprocess                          # to execute binaries
 from ppmodules.readMesh import *           # to get all readMesh functions
+from ppmodules.mesh_pp import *            # to get the ppMesh class
 import matplotlib.tri    as mtri           # matplotlib triangulations
 #
 #
@@ -205,14 +210,7 @@ subprocess.call([pystr, 'adcirc2wkt.py', '-i', 'mesh_initial.grd',
 n,e,x,y,z,ikle = readAdcirc('mesh_initial.grd')
 
 # create centroids for each element in mesh_initial.grd
-centroid_x = np.zeros(e)
-centroid_y = np.zeros(e)
-
-for i in range(e):
-  centroid_x[i] = (x[ikle[i,0]] +x[ikle[i,1]] + \
-    x[ikle[i,2]]) / 3.0  
-  centroid_y[i] = (y[ikle[i,0]] +y[ikle[i,1]] + \
-    y[ikle[i,2]]) / 3.0 
+centroid_x, centroid_y = ppMesh(n,e,x,y,z,ikle).getCentroids()
 
 # read the tin file
 print('Reading TIN ...')
@@ -44,6 +44,14 @@
 # if (abs(A) < 1.0E-6):
 # The break statement was removed.
 #
+# Revised: Oct 17, 2026
+# The output mesh is written with writeAdcirc() from writeMesh.py, which
+# formats all of the nodes and elements in large chunks.
+#
+# Revised: Oct 17, 2026
+# The centroids of the tin elements are computed all at once, with the
+# ppMesh class from mesh_pp.py.
+#
 # Uses: Python 2 or 3, Numpy, Scipy
 #
 # Example:
@@ -63,6 +71,8 @@ import numpy             as np             # numpy
 from scipy import spatial                  # kd tree for searching coords
 from scipy import linalg                   # linear algebra package
 from ppmodules.readMesh import *           # to get all readMesh functions
+from ppmodules.writeMesh import *          # to get all writeMesh functions
+from ppmodules.mesh_pp import *            # to get the ppMesh class
 from ppmodules.utilities import * 
 from progressbar import ProgressBar, Bar, Percentage, ETA
 #
@@ -86,9 +96,6 @@ if (neigh < 2):
 	print('Number of neighbours must be greater than 1 ... Exiting')
 	sys.exit()
 
-# to create the output file
-fout = open(output_file,'w')
-
 # read the adcirc tin file
 print('Reading TIN ...')
 t_n,t_e,t_x,t_y,t_z,t_ikle = readAdcirc(tin_file)
@@ -98,14 +105,8 @@ minz = np.amin(t_z)
 maxz = np.amax(t_z)
 
 # compute centroids of each tin element
-centroid_x = np.zeros(t_e)
-centroid_y = np.zeros(t_e)
-
-for i in range(t_e):
-	centroid_x[i] = (t_x[t_ikle[i,0]] +t_x[t_ikle[i,1]] + \
-		t_x[t_ikle[i,2]]) / 3.0  
-	centroid_y[i] = (t_y[t_ikle[i,0]] +t_y[t_ikle[i,1]] + \
-		t_y[t_ikle[i,2]]) / 3.0
+tin = ppMesh(t_n,t_e,t_x,t_y,t_z,t_ikle)
+centroid_x, centroid_y = tin.getCentroids()
 
 # read the adcirc mesh file
 print('Reading mesh ...')
@@ -199,23 +200,7 @@ pbar.finish()
 
 # now write the adcirc mesh file
 print('Writing results to file ...')
-# to create the output file (this is the interpolated mesh)
-fout = open(output_file,'w')
-
-# now to write the adcirc mesh file
-fout.write('ADCIRC' + '\n')
-# writes the number of elements and number of nodes in the header file
-fout.write(str(m_e) + ' ' + str(m_n) + '\n')
-
-# writes the nodes
-for i in range(0,m_n):
-	fout.write(str(i+1) + ' ' + str('{:.3f}'.format(m_x[i])) + ' ' + 
-		str('{:.3f}'.format(m_y[i])) + ' ' + str('{:.3f}'.format(m_z[i])) + '\n')
-#
-# writes the elements
-for i in range(0,m_e):
-	fout.write(str(i+1) + ' 3 ' + str(m_ikle[i,0]+1) + ' ' + str(m_ikle[i,1]+1) + ' ' + 
-		str(m_ikle[i,2]+1) + '\n')
+writeAdcirc(m_n, m_e, m_x, m_y, m_z, m_ikle, output_file)
 
 print('All done')	
 	
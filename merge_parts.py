@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 merge_parts.py                        #
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+#
+# Date: Oct 17, 2026
+#
+# Purpose: Script merges the *.slf result files written by each processor
+# of a parallel TELEMAC run (i.e., T2DRES00003-00000 to T2DRES00003-00003
+# for a run on 4 processors) into a single *.slf file for the whole mesh;
+# it does the same job as TELEMAC's gretel. In each of these files, the
+# IPOBO record holds the global node number of each local node (KNOLG).
+# The global index of the nodes of each file is found once, and then the
+# time steps are read from all files at the same time (each file is read
+# on its own thread), and written to the merged file one time step at a
+# time. Nodes that are on the interface of two sub-domains are in both
+# files, and have the same values.
+#
+# If the geometry file of the run is given, the mesh of the merged file
+# is the one of the geometry file (like gretel). Otherwise, the mesh is
+# put together from the files of the sub-domains; the nodes have their
+# global numbers, the elements are in the order of the sub-domains, and
+# the boundary is rebuilt. Works for 2d *.slf files only.
+#
+# Uses: Python 2 or 3, Numpy
+#
+# Example:
+#
+# python merge_parts.py -i T2DRES -n 4 -o result.slf
+# python merge_parts.py -i T2DRES -n 4 -g geo.slf -o result.slf
+# where:
+# -i the name of the result files of the sub-domains, without the
+#    processor numbers (T2DRES reads T2DRES00003-00000, etc.)
+# -n number of processors (i.e., sub-domains) of the run
+# -g geometry *.slf file of the run (optional)
+# -o merged *.slf file
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+import os,sys
+import numpy as np
+from ppmodules.selafin_io_pp import *
+from ppmodules.utilities import *
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# MAIN
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+curdir = os.getcwd()
+#
+# I/O
+geo_file = None
+if len(sys.argv) == 7:
+  parts_name = sys.argv[2]
+  nparts = int(sys.argv[4])
+  output_file = sys.argv[6]
+elif len(sys.argv) == 9:
+  parts_name = sys.argv[2]
+  nparts = int(sys.argv[4])
+  geo_file = sys.argv[6]
+  output_file = sys.argv[8]
+else:
+  print('Wrong number of Arguments, stopping now...')
+  print('Usage:')
+  print('python merge_parts.py -i T2DRES -n 4 -o result.slf')
+  print('python merge_parts.py -i T2DRES -n 4 -g geo.slf -o result.slf')
+  sys.exit()
+
+if (nparts < 1):
+  print('Number of processors must be at least 1. Exiting!')
+  sys.exit()
+
+# reads the headers of the files of all sub-domains
+parts = list()
+for i in range(nparts):
+  part_file = parts_name + '{:0>5d}'.format(nparts-1) + '-' + \
+    '{:0>5d}'.format(i)
+  if not os.path.isfile(part_file):
+    print('File ' + part_file + ' not found. Exiting!')
+    sys.exit()
+
+  slf = ppSELAFIN(part_file)
+  slf.readHeader()
+  slf.readTimes()
+
+  if (slf.getNPLAN() > 1):
+    print('3d *.slf files not supported yet. Exiting!')
+    sys.exit()
+
+  parts.append(slf)
+
+# the first sub-domain sets the variables, precision and times
+vnames = parts[0].getVarNames()
+vunits = parts[0].getVarUnits()
+float_type,float_size = parts[0].getPrecision()
+times = parts[0].getTimes()
+
+for slf in parts[1:]:
+  if (slf.getVarNames() != vnames):
+    print('Variables of ' + slf.slf_file + ' are not the same. Exiting!')
+    sys.exit()
+  if (slf.getTimes() != times):
+    print('Times of ' + slf.slf_file + ' are not the same. Exiting!')
+    sys.exit()
+
+# global node number (zero based) of each local node of each sub-domain;
+# this is the scatter index into the merged results
+knolg = [slf.getIPOBO().astype(np.int64) - 1 for slf in parts]
+NPOIN = int(max([np.max(k) for k in knolg])) + 1
+
+if (geo_file is not None):
+  # the mesh of the geometry file
+  geo = ppSELAFIN(geo_file)
+  geo.readHeader()
+  NELEM, NPOIN_geo, NDP, IKLE, IPOBO, x, y = geo.getMesh()
+  DATE = geo.getDATE()
+  geo.close()
+
+  if (NPOIN_geo < NPOIN):
+    print('Geometry file has fewer nodes than the sub-domains. Exiting!')
+    sys.exit()
+  NPOIN = NPOIN_geo
+else:
+  # the mesh is put together from the sub-domains
+  NDP = parts[0].NDP
+  x = np.zeros(NPOIN)
+  y = np.zeros(NPOIN)
+  IKLE_parts = list()
+  for p in range(nparts):
+    x[knolg[p]] = parts[p].x
+    y[knolg[p]] = parts[p].y
+    IKLE_parts.append(knolg[p][parts[p].IKLE - 1] + 1)
+  IKLE = np.vstack(IKLE_parts).astype(np.int32)
+  NELEM = len(IKLE)
+  DATE = parts[0].getDATE()
+
+  # rebuild the boundary of the merged mesh
+  nbor = getBoundaryNodes(x, y, IKLE-1)
+  IPOBO = np.zeros(NPOIN, dtype=np.int32)
+  IPOBO[nbor] = np.arange(1, len(nbor)+1)
+
+# every node of the merged mesh has to come from some sub-domain
+covered = np.zeros(NPOIN, dtype=bool)
+for k in knolg:
+  covered[k] = True
+if not np.all(covered):
+  print('Warning: ' + str(NPOIN - np.sum(covered)) + ' nodes are not in ' +
+    'any sub-domain; they are set to zero.')
+
+print('Number of sub-domains: ' + str(nparts))
+print('Number of nodes in the merged mesh: ' + str(NPOIN))
+print('Number of elements in the merged mesh: ' + str(NELEM))
+
+# write the front matter of the merged *.slf file
+merged = ppSELAFIN(output_file)
+merged.setPrecision(float_type, float_size)
+merged.setTitle('created with pputils')
+merged.setVarNames(vnames)
+merged.setVarUnits(vunits)
+merged.setIPARAM([1, 0, 0, 0, 0, 0, 0, 0, 0, 1])
+merged.setDATE(DATE)
+merged.setMesh(NELEM, NPOIN, NDP, IKLE, IPOBO, x, y)
+merged.writeHeader()
+
+# results of the merged mesh for a single time step
+results = np.zeros((len(vnames), NPOIN))
+
+# each sub-domain is read on its own thread, a couple of time steps ahead
+readers = [slf.iterFrames(prefetch=2) for slf in parts]
+
+for frames in zip(*readers):
+  t = frames[0][0]
+  for p in range(nparts):
+    results[:, knolg[p]] = frames[p][2]
+
+  merged.writeVariables(times[t], results)
+  print('Time step index ' + str(t) + ' written')
+
+for slf in parts:
+  slf.close()
+merged.close()
+
+print('All done!')
@@ -14,6 +14,12 @@
 # names (and the same order of variable names), and merges them
 # to a single file. 
 #
+# Revised: Oct 17, 2026
+# If the merged file is the same as the first file, the time steps of the
+# second file are appended to the first file in place, rather than both
+# files being re-written (the first file must not end with a partial
+# time step).
+#
 # Uses: Python 2 or 3, Matplotlib, Numpy
 #
 # Example:
@@ -22,7 +28,7 @@
 # where:
 # -a first *.slf file
 # -b second *.slf file
-# -o merged *.slf file
+# -o merged *.slf file (can be the same as -a, to append b to a)
 #
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Global Imports
@@ -138,22 +144,32 @@ for i in range(a_NVAR):
     sys.exit()
 
 # now we are ready to merge the files
-# write the front matter of the output *.slf file
-merged = ppSELAFIN(merged_file)
-merged.setPrecision(a_float_type, a_float_size)
-merged.setTitle('created with pputils')
-merged.setVarNames(a_variables)
-merged.setVarUnits(a_units)
-merged.setIPARAM([1, 0, 0, 0, 0, 0, 0, 0, 0, 1])
-merged.setMesh(a_NELEM, a_NPOIN, a_NDP, a_IKLE, a_IPOBO, a_x, a_y)
-merged.writeHeader()
-
-# read the results from a, and write it to the merged
-for t in range(len(a_times)):
-  a.readVariables(t)
-  res = a.getVarValues()
-  
-  merged.writeVariables(a_times[t], res)
+if (os.path.abspath(merged_file) == os.path.abspath(a_file)):
+  # append the results from b to the end of a
+  a.close()
+  merged = ppSELAFIN(merged_file)
+  try:
+    merged.appendHeader()
+  except ValueError as e:
+    print(str(e) + '. Exiting!')
+    sys.exit()
+else:
+  # write the front matter of the output *.slf file
+  merged = ppSELAFIN(merged_file)
+  merged.setPrecision(a_float_type, a_float_size)
+  merged.setTitle('created with pputils')
+  merged.setVarNames(a_variables)
+  merged.setVarUnits(a_units)
+  merged.setIPARAM([1, 0, 0, 0, 0, 0, 0, 0, 0, 1])
+  merged.setMesh(a_NELEM, a_NPOIN, a_NDP, a_IKLE, a_IPOBO, a_x, a_y)
+  merged.writeHeader()
+
+  # read the results from a, and write it to the merged
+  for t in range(len(a_times)):
+    a.readVariables(t)
+    res = a.getVarValues()
+    
+    merged.writeVariables(a_times[t], res)
   
 # read the results from b, and write it to the merged  
 for t in range(len(b_times)):
@@ -18,6 +18,10 @@
 # for finding potentially troubling spots in the input topology (i.e., bad
 # breaklines) that cause creation of zero area triangles.
 #
+# Revised: Oct 17, 2026
+# The areas and centroids of the elements are computed all at once, with
+# the ppMesh class from mesh_pp.py.
+#
 # Uses: Python 2 or 3, Matplotlib, Numpy
 #
 # Example:
@@ -34,23 +38,8 @@
 import os,sys
 import numpy as np
 from ppmodules.readMesh import *
+from ppmodules.mesh_pp import *
 #
-#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-# Functions
-#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-def elemprop(x1,y1,x2,y2,x3,y3):
-	# element properties - computes area and centroids of each element
-	
-	# signs in eqs work when the elements are CCW (for example Triangle mesh
-	# generator produces these) 
-	# outputs element area, and its centroid coordinate
-	twoA = (x2*y3 - x3*y2) - (x1*y3-x3*y1) + (x1*y2 - x2*y1)
-	area = twoA / 2.0
-	
-	xc = (x1 + x2 + x3) / 3.0
-	yc = (y1 + y2 + y3) / 3.0
-	return area, xc, yc
-
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # MAIN
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
@@ -74,14 +63,13 @@ fout = open(output_file,"w")
 # read the adcirc file
 n,e,x,y,z,ikle = readAdcirc(adcirc_file)
 
-# define properties arrays
-area = np.zeros(e)
-xc = np.zeros(e)
-yc = np.zeros(e)
+# element properties - area and centroid of each element; the signs of
+# the areas are right when the elements are CCW (for example Triangle mesh
+# generator produces these) 
+mesh = ppMesh(n,e,x,y,z,ikle)
+area = mesh.getSignedAreas()
+xc, yc = mesh.getCentroids()
 
-for i in range(e):
-	area[i],xc[i],yc[i] = elemprop(x[ikle[i,0]], y[ikle[i,0]],
-		x[ikle[i,1]], y[ikle[i,1]],	x[ikle[i,2]], y[ikle[i,2]])
-	if (area[i] < area_threshold):
-		fout.write(str(xc[i]) + ',' + str(yc[i]) + ',' + str(area[i]) + '\n')
+for i in np.where(area < area_threshold)[0]:
+	fout.write(str(xc[i]) + ',' + str(yc[i]) + ',' + str(area[i]) + '\n')
 	
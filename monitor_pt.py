@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 monitor_pt.py                         #
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+#
+# Date: Oct 17, 2026
+#
+# Purpose: Script takes in a *.slf file that is still being written by a
+# running TELEMAC simulation, and x,y node coordinates, and writes the
+# values of all variables at that node for every time step in the file.
+# Unlike extract_pt.py, the script keeps the *.slf file open, and writes
+# new time steps to the output file as the simulation produces them. The
+# script stops once no new time step is written for the specified wait
+# time. Works for 2d *.slf files only.
+#
+# Uses: Python 2 or 3, Numpy, Scipy
+#
+# Example:
+#
+# python monitor_pt.py -i in.slf -x 100.0 -y 200.0 -o out.txt -w 600
+# where:
+# -i input *.slf file (can still be written by the simulation)
+# -x, y coordinates of the node for which to extract data
+# -o output text file
+# -w time in seconds to wait for a new time step before stopping
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+import os,sys
+from scipy import spatial
+import numpy as np
+from ppmodules.selafin_io_pp import *
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# MAIN
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+curdir = os.getcwd()
+#
+# I/O
+if len(sys.argv) != 11 :
+  print('Wrong number of Arguments, stopping now...')
+  print('Usage:')
+  print('python monitor_pt.py -i in.slf -x 100.0 -y 200.0 -o out.txt -w 600')
+  sys.exit()
+
+input_file = sys.argv[2]
+xu = float(sys.argv[4])
+yu = float(sys.argv[6])
+output_file = sys.argv[8]
+wait = float(sys.argv[10])
+
+# reads the header of the *.slf file (the time steps are read as they
+# are written by the simulation)
+slf = ppSELAFIN(input_file)
+slf.readHeader()
+
+variables = slf.getVarNames()
+units = slf.getVarUnits()
+
+# number of variables
+NVAR = len(variables)
+
+# to remove duplicate spaces from variables and units
+for i in range(NVAR):
+  variables[i] = ' '.join(variables[i].split())
+  units[i] = ' '.join(units[i].split())
+
+# gets some of the mesh properties from the *.slf file
+NELEM, NPOIN, NDP, IKLE, IPOBO, x, y = slf.getMesh()
+
+if (slf.getNPLAN() > 1):
+  print('Input file is a 3d, which is not yet supported. Sorry.')
+  sys.exit()
+
+# find the index of the node the user is seeking
+source = np.column_stack((x,y))
+tree = spatial.cKDTree(source)
+d, idx = tree.query((xu,yu), k = 1)
+
+print('Monitoring node at: ' + str(x[idx]) + ' ' + str(y[idx]))
+
+# the output file
+fout = open(output_file, 'w')
+
+fout.write('TIME, ')
+for i in range(NVAR):
+  fout.write(variables[i] + ', ')
+fout.write('\n')
+
+fout.write('S, ')
+for i in range(NVAR):
+  fout.write(units[i] + ', ')
+fout.write('\n')
+
+# check the file for new time steps every few seconds
+poll = min(5.0, wait)
+
+for t, time, results in slf.followFrames(poll=poll, timeout=wait):
+  fout.write(str("{:.3f}").format(time) + ', ')
+  for j in range(NVAR):
+    fout.write(str("{:.12f}").format(results[j,idx]) + ', ')
+  fout.write('\n')
+
+  # make the new line visible to whoever is watching the output file
+  fout.flush()
+  print('Time step index ' + str(t) + ' written')
+
+fout.close()
+slf.close()
+
+print('All done!')
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 partition_mesh.py                     #
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+#
+# Date: Oct 17, 2026
+#
+# Purpose: Script takes in a mesh in ADCIRC format, and splits its
+# elements into a number of parts of (almost) the same size, for use in
+# parallel runs. The elements are split by recursive bisection of their
+# centroids (along the principal axis of the centroids, or along x or y),
+# and the interfaces of the parts are then smoothed, so that the parts
+# share as few edges as possible. The script writes the part of each
+# element, and for each part its mesh (in ADCIRC format) and the global
+# numbers of its nodes and elements. The quality of the partition (the
+# imbalance of the parts, the number of element edges cut, and the number
+# of nodes on the interfaces) is printed.
+#
+# Uses: Python 2 or 3, Numpy
+#
+# Example:
+#
+# python partition_mesh.py -i mesh.grd -n 8 -o part
+# python partition_mesh.py -i mesh.grd -n 8 -m rcb -o part
+# where:
+# -i input mesh in ADCIRC format
+# -n number of parts
+# -m method of bisection; inertial (default) or rcb
+# -o name of the output files; writes part.epart (the part of each
+#    element, one per line, starting at 0), and for each part p the files
+#    part_0000p.grd (its mesh), part_0000p.nmap and part_0000p.emap (the
+#    global node and element numbers of the part, starting at 1)
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+import os,sys
+import numpy as np
+from ppmodules.readMesh import *
+from ppmodules.writeMesh import *
+from ppmodules.utilities import *
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# MAIN
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+curdir = os.getcwd()
+#
+# I/O
+if len(sys.argv) == 7:
+  input_file = sys.argv[2]
+  nparts = int(sys.argv[4])
+  method = 'inertial'
+  output_name = sys.argv[6]
+elif len(sys.argv) == 9:
+  input_file = sys.argv[2]
+  nparts = int(sys.argv[4])
+  method = sys.argv[6]
+  output_name = sys.argv[8]
+else:
+  print('Wrong number of Arguments, stopping now...')
+  print('Usage:')
+  print('python partition_mesh.py -i mesh.grd -n 8 -o part')
+  print('python partition_mesh.py -i mesh.grd -n 8 -m rcb -o part')
+  sys.exit()
+
+if (method not in ['inertial', 'rcb']):
+  print('Method must be inertial or rcb. Exiting!')
+  sys.exit()
+
+if (nparts < 1):
+  print('Number of parts must be at least 1. Exiting!')
+  sys.exit()
+
+# reads the mesh (ikle is zero based)
+n,e,x,y,z,ikle = readAdcirc(input_file)
+
+print('Partitioning the mesh ...')
+epart = partitionMesh(n, e, x, y, ikle, nparts, method=method)
+
+# quality of the partition
+sizes, imbalance, edge_cut, interface = getPartitionMetrics(ikle, epart,
+  nparts)
+
+print('Number of elements in each part: ' + ' '.join(map(str, sizes)))
+print('Imbalance (largest / average part): ' +
+  str("{:.4f}".format(imbalance)))
+print('Edge cut: ' + str(edge_cut))
+print('Interface nodes: ' + str(interface))
+
+# the part of each element
+np.savetxt(output_name + '.epart', epart, fmt='%d')
+
+# the mesh and node and element maps of each part
+for p in range(nparts):
+  part_name = output_name + '_' + '{:0>5d}'.format(p)
+  print('Writing ' + part_name + '.grd')
+
+  n_p, e_p, x_p, y_p, z_p, ikle_p, node_map, elem_map = getPartMesh(x, y,
+    z, ikle, epart, p)
+
+  writeAdcirc(n_p, e_p, x_p, y_p, z_p, ikle_p, part_name + '.grd')
+  np.savetxt(part_name + '.nmap', node_map + 1, fmt='%d')
+  np.savetxt(part_name + '.emap', elem_map + 1, fmt='%d')
+
+print('All done!')
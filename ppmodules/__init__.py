@@ -1 +1 @@
-__all__ = ["readMesh","writeMesh","utilities","selafin_io_pp"]
+__all__ = ["readMesh","writeMesh","utilities","selafin_io_pp","parallel_pp","mesh_pp"]
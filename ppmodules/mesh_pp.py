@@ -0,0 +1,197 @@
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 mesh_pp.py                            #
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+#
+# Date: Oct 17, 2026
+#
+# Purpose: A class that holds a triangular mesh (the n,e,x,y,z,ikle that
+# the readMesh functions return), and that computes the quantities that
+# scripts need from the mesh (element areas, centroids, orientation, the
+# edges, the neighbours of each element, the elements of each node, and
+# the boundary) for all elements at once, with numpy. Each quantity is
+# computed the first time it is asked for, and is then kept, so that a
+# script (and the functions it calls) can share one ppMesh object rather
+# than compute the same things again.
+#
+# The ikle array is zero based. The x, y, z and ikle arrays must not be
+# changed once the object is created (the kept quantities would be wrong).
+#
+# Uses: Python 2 or 3, Numpy
+#
+# Example:
+#
+# from ppmodules.readMesh import *
+# from ppmodules.mesh_pp import *
+#
+# mesh = ppMesh(*readAdcirc('mesh.grd'))
+# xc, yc = mesh.getCentroids()
+# area = mesh.getAreas()
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+import numpy as np
+from ppmodules.utilities import getBoundaryNodes, getDualEdges
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Classes
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+class ppMesh(object):
+  __slots__ = ('n', 'e', 'x', 'y', 'z', 'ikle', '_cache')
+
+  # the arguments are the same as what the readMesh functions return
+  def __init__(self, n, e, x, y, z, ikle):
+    self.x = np.ascontiguousarray(x, dtype=np.float64)
+    self.y = np.ascontiguousarray(y, dtype=np.float64)
+    self.z = np.ascontiguousarray(z, dtype=np.float64)
+    self.ikle = np.ascontiguousarray(ikle, dtype=np.int64)
+    self.n = len(self.x)
+    self.e = len(self.ikle)
+
+    # quantities computed so far
+    self._cache = dict()
+
+  # returns what was kept under name, computing it with func the first
+  # time
+  def _cached(self, name, func):
+    if name not in self._cache:
+      self._cache[name] = func()
+    return self._cache[name]
+
+  def getMesh(self):
+    return self.n, self.e, self.x, self.y, self.z, self.ikle
+
+  # x and y of the three nodes of each element
+  def _corners(self, ikle):
+    return (self.x[ikle[:,0]], self.y[ikle[:,0]], self.x[ikle[:,1]],
+      self.y[ikle[:,1]], self.x[ikle[:,2]], self.y[ikle[:,2]])
+
+  # True for the elements that are oriented in CCW fashion (the same test
+  # as the CCW() function in utilities.py)
+  def getOrientation(self):
+    def compute():
+      x1,y1,x2,y2,x3,y3 = self._corners(self.ikle)
+      return (y3-y1)*(x2-x1) > (y2-y1)*(x3-x1)
+    return self._cached('orientation', compute)
+
+  # copy of the ikle array, with the elements that are not CCW turned
+  # around (the first and third nodes switched)
+  def getCCWIkle(self):
+    def compute():
+      ikle = self.ikle.copy()
+      cw = ~self.getOrientation()
+      ikle[cw,0] = self.ikle[cw,2]
+      ikle[cw,2] = self.ikle[cw,0]
+      return ikle
+    return self._cached('ccw_ikle', compute)
+
+  # area of each element, with the nodes in the order of the ikle array
+  # (negative for the elements that are not CCW)
+  def getSignedAreas(self):
+    def compute():
+      x1,y1,x2,y2,x3,y3 = self._corners(self.ikle)
+      twoA = (x2*y3 - x3*y2) - (x1*y3-x3*y1) + (x1*y2 - x2*y1)
+      return twoA / 2.0
+    return self._cached('signed_areas', compute)
+
+  # area of each element, with the elements oriented in CCW fashion
+  def getAreas(self):
+    def compute():
+      x1,y1,x2,y2,x3,y3 = self._corners(self.getCCWIkle())
+      twoA = (x2*y3 - x3*y2) - (x1*y3-x3*y1) + (x1*y2 - x2*y1)
+      return twoA / 2.0
+    return self._cached('areas', compute)
+
+  # x and y of the centroid of each element
+  def getCentroids(self):
+    def compute():
+      x1,y1,x2,y2,x3,y3 = self._corners(self.ikle)
+      return (x1 + x2 + x3) / 3.0, (y1 + y2 + y3) / 3.0
+    return self._cached('centroids', compute)
+
+  # returns the edges of the mesh (the two nodes of each edge, the lower
+  # one first), and for each element the edges from its node j to its
+  # node j+1, as an array with three columns
+  def getEdges(self):
+    def compute():
+      edges = self.ikle[:,[0,1,1,2,2,0]].reshape(-1,2)
+      lo = np.minimum(edges[:,0], edges[:,1])
+      hi = np.maximum(edges[:,0], edges[:,1])
+      keys = lo * max(self.n, 1) + hi
+      unique_keys, first, inverse = np.unique(keys, return_index=True,
+        return_inverse=True)
+      return (np.column_stack((lo[first], hi[first])),
+        inverse.reshape(-1,3))
+    return self._cached('edges', compute)
+
+  # the element on the other side of the edge from node j to node j+1 of
+  # each element, as an array with three columns (-1 on the boundary)
+  def getNeighbours(self):
+    def compute():
+      neigh = np.full(3*self.e, -1, dtype=np.int64)
+      if (self.e > 0):
+        pairs = getDualEdges(self.ikle, slots=True)
+        neigh[pairs[:,0]] = pairs[:,1] // 3
+        neigh[pairs[:,1]] = pairs[:,0] // 3
+      return neigh.reshape(-1,3)
+    return self._cached('neighbours', compute)
+
+  # the elements of each node, in compressed (CSR) form; the elements of
+  # node i are elems[ptr[i]:ptr[i+1]], in increasing order
+  def getNodeElements(self):
+    def compute():
+      nodes = self.ikle.ravel()
+      order = np.argsort(nodes, kind='stable')
+      ptr = np.zeros(self.n + 1, dtype=np.int64)
+      ptr[1:] = np.cumsum(np.bincount(nodes, minlength=self.n))
+      return ptr, order // 3
+    return self._cached('node_elements', compute)
+
+  # the (zero based) boundary nodes, in the order of getBoundaryNodes() in
+  # utilities.py (the outer boundary CCW, then the islands CW)
+  def getBoundaryNodes(self):
+    def compute():
+      if (self.e == 0):
+        return np.zeros(0, dtype=np.int64)
+      return getBoundaryNodes(self.x, self.y, self.getCCWIkle())
+    return self._cached('boundary_nodes', compute)
+
+  # the boundary nodes split into closed loops (the outer boundary first,
+  # then the islands), as a list of arrays
+  def getBoundaryLoops(self):
+    def compute():
+      nbor = self.getBoundaryNodes()
+      if (len(nbor) == 0):
+        return list()
+
+      # the boundary edges, from node to node in the CCW elements
+      # (an edge is on the boundary if it belongs to only one element)
+      ikle = self.getCCWIkle()
+      edges = ikle[:,[0,1,1,2,2,0]].reshape(-1,2)
+      lo = np.minimum(edges[:,0], edges[:,1])
+      hi = np.maximum(edges[:,0], edges[:,1])
+      unique_keys, inverse, counts = np.unique(lo * self.n + hi,
+        return_inverse=True, return_counts=True)
+      bnd = edges[counts[inverse.ravel()] == 1]
+      bnd_keys = np.sort(bnd[:,0] * self.n + bnd[:,1])
+
+      def isEdge(a, b):
+        k = a * self.n + b
+        i = np.searchsorted(bnd_keys, k)
+        return i < len(bnd_keys) and bnd_keys[i] == k
+
+      # a loop ends at the node that has a boundary edge back to the first
+      # node of the loop
+      loops = list()
+      start = 0
+      for i in range(len(nbor)):
+        if (i == len(nbor)-1 or isEdge(nbor[i], nbor[start])):
+          loops.append(nbor[start:i+1])
+          start = i + 1
+      return loops
+    return self._cached('boundary_loops', compute)
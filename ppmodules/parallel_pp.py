@@ -0,0 +1,206 @@
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 parallel_pp.py                        #
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+#
+# Date: Oct 17, 2026
+#
+# Purpose: Functions that apply a function to every time step of a *.slf
+# file using a pool of processes. Most scripts that work on *.slf files
+# read a time step, compute something from it, and then write it out (or
+# add it to a total); these functions do the same on all cores.
+#
+# Each worker process opens the *.slf file once, when it starts, and
+# reads the time steps it is given itself; only the time step indices go
+# to the workers, and only the results come back. The mesh (and whatever
+# else the function needs, passed as shared) is given to each worker
+# once, not with every time step.
+#
+# The function is called as func(slf, t, time, vals, shared), where slf
+# is the worker's ppSELAFIN object (use it for the mesh, i.e. getMesh()),
+# t is the time step index, time is the time, vals has the values of the
+# variables (rows in the order of vars, or all variables), and shared is
+# the object that was passed in. The function must be defined at the top
+# level of a module (or script), so that the workers can find it.
+#
+# The workers are started by forking the current process, which is not
+# available on Windows; there (or when processes = 1) the time steps are
+# done one after another in the current process, with the same results.
+#
+# If PPUTILS_FRAME_CACHE is set, the workers read the time steps through
+# the shared frame cache (see ppFrameCache in selafin_io_pp.py).
+#
+# Uses: Python 3, Numpy
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+import os,sys
+import multiprocessing
+from collections import deque
+import numpy as np
+from ppmodules.selafin_io_pp import *
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Functions
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+# state of each worker process (set by _initWorker)
+_worker = dict()
+
+def _initWorker(slf_file, func, shared, vars):
+  slf = ppSELAFIN(slf_file)
+  slf.readHeader()
+  slf.readTimes()
+  slf.useFrameCacheFromEnv()
+
+  _worker['slf'] = slf
+  _worker['func'] = func
+  _worker['shared'] = shared
+  _worker['vars'] = vars
+
+# applies the function to a single time step
+def _mapOne(t):
+  slf = _worker['slf']
+  slf.readVariables(t, _worker['vars'])
+  return _worker['func'](slf, t, slf.time[t], slf.getVarValues(),
+    _worker['shared'])
+
+# applies the function to a block of time steps, and combines the results
+def _reduceBlock(block):
+  combine = _worker['shared'][1]
+  acc = None
+  for i, t in enumerate(block):
+    slf = _worker['slf']
+    slf.readVariables(t, _worker['vars'])
+    r = _worker['shared'][0](slf, t, slf.time[t], slf.getVarValues(),
+      _worker['shared'][2])
+    if (i == 0):
+      acc = r
+    else:
+      acc = combine(acc, r)
+  return acc
+
+# number of processes and of time steps that can be in progress at once;
+# each time step in progress takes roughly two copies of its values
+def _getWorkers(slf_file, vars, processes, max_mem):
+  if (processes is None):
+    processes = multiprocessing.cpu_count()
+
+  slf = ppSELAFIN(slf_file)
+  slf.readHeader()
+  if (vars is None):
+    nvars = slf.NBV1
+  else:
+    nvars = len(vars)
+  frame_bytes = 2 * 8 * max(nvars * slf.NPOIN, 1)
+  slf.close()
+
+  in_flight = int(max(1, min(2*processes, max_mem // frame_bytes)))
+  processes = int(max(1, min(processes, in_flight)))
+
+  if ('fork' not in multiprocessing.get_all_start_methods()):
+    processes = 1
+
+  return processes, in_flight
+
+# generator that yields (t, time, result) for each time step index in
+# frames (all time steps if None), in the order of frames, where result
+# is func(slf, t, time, vals, shared) computed by a pool of processes.
+# Results are yielded as soon as they are ready (and all earlier ones are
+# yielded), so they can be written to a *.slf file as they come. At most
+# max_mem bytes (roughly) of time steps are in progress at once.
+def mapFrames(slf_file, func, frames=None, vars=None, shared=None,
+  processes=None, max_mem=1024*1024*1024):
+
+  slf = ppSELAFIN(slf_file)
+  slf.readHeader()
+  slf.readTimes()
+  times = slf.getTimes()
+  slf.close()
+
+  if (frames is None):
+    frames = range(len(times))
+  frames = list(frames)
+
+  processes, in_flight = _getWorkers(slf_file, vars, processes, max_mem)
+
+  # one after another in this process
+  if (processes == 1):
+    _initWorker(slf_file, func, shared, vars)
+    for t in frames:
+      yield t, times[t], _mapOne(t)
+    _worker['slf'].close()
+    return
+
+  ctx = multiprocessing.get_context('fork')
+  pool = ctx.Pool(processes, initializer=_initWorker,
+    initargs=(slf_file, func, shared, vars))
+
+  try:
+    pending = deque()
+    next_frame = 0
+    while (next_frame < len(frames) or len(pending) > 0):
+      # keep in_flight time steps in progress
+      while (next_frame < len(frames) and len(pending) < in_flight):
+        t = frames[next_frame]
+        pending.append((t, pool.apply_async(_mapOne, (t,))))
+        next_frame = next_frame + 1
+
+      # the oldest one is yielded first, to keep the order
+      t, res = pending.popleft()
+      yield t, times[t], res.get()
+  finally:
+    pool.terminate()
+    pool.join()
+
+# applies func to each time step index in frames (all time steps if None),
+# and combines the results with combine(a, b), which must not depend on
+# how the time steps are grouped (i.e., sum, min, max); returns the
+# combined result. Each worker combines the results of a block of time
+# steps, so only one result per block comes back.
+def reduceFrames(slf_file, func, combine, frames=None, vars=None,
+  shared=None, processes=None, max_mem=1024*1024*1024):
+
+  slf = ppSELAFIN(slf_file)
+  slf.readHeader()
+  slf.readTimes()
+  numTimes = len(slf.getTimes())
+  slf.close()
+
+  if (frames is None):
+    frames = range(numTimes)
+  frames = list(frames)
+
+  if (len(frames) == 0):
+    return None
+
+  processes, in_flight = _getWorkers(slf_file, vars, processes, max_mem)
+
+  # about four blocks for each process, so that they finish together
+  nblocks = min(len(frames), 4*processes)
+  blocks = [b.tolist() for b in np.array_split(frames, nblocks)]
+
+  # the function and combine are passed to the workers with shared
+  if (processes == 1):
+    _initWorker(slf_file, None, (func, combine, shared), vars)
+    partials = [_reduceBlock(b) for b in blocks]
+    _worker['slf'].close()
+  else:
+    ctx = multiprocessing.get_context('fork')
+    pool = ctx.Pool(processes, initializer=_initWorker,
+      initargs=(slf_file, None, (func, combine, shared), vars))
+    try:
+      partials = pool.map(_reduceBlock, blocks, chunksize=1)
+    finally:
+      pool.terminate()
+      pool.join()
+
+  acc = partials[0]
+  for p in partials[1:]:
+    acc = combine(acc, p)
+  return acc
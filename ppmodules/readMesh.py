@@ -1,99 +1,130 @@
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Global Imports
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+import os
+import io
+import hashlib
 import numpy as np # numpy
 # 
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Functions
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
-def readAdcirc(adcirc_file):
-
-  fin = open(adcirc_file)
-
-  # first line is the title string
-  str = fin.readline()
-
-  # second line is e, n
-  str = fin.readline()
-  e = int(str.split()[0])
-  n = int(str.split()[1])
-
-  # now we can declare the arrays that are needed to store the values read
-  x = np.zeros(n, dtype=np.float64)
-  y = np.zeros(n, dtype=np.float64)
-  z = np.zeros(n, dtype=np.float64)
-
-  ikle = np.zeros( (e,3), dtype = np.int64)
-
-  # now we can read in the nodes
-  for i in range(n):
-    str = fin.readline()
-    lst = str.split()
-
-    x[i] = lst[1]
-    y[i] = lst[2]
-    z[i] = lst[3]
+# reads a text file, and returns its bytes as a numpy array, along with
+# the position of the first byte of each line and of the byte after it
+def _readLines(fname):
+  with open(fname, 'rb') as f:
+    arr = np.frombuffer(f.read(), dtype=np.uint8)
+  
+  nl = np.flatnonzero(arr == 10)
+  starts = np.concatenate(([0], nl + 1))
+  ends = np.concatenate((nl, [len(arr)]))
+  
+  # no line after the last end of line
+  if (len(starts) > 1 and starts[-1] == len(arr)):
+    starts = starts[0:-1]
+    ends = ends[0:-1]
+  
+  return arr, starts, ends
+
+# parses the lines with indices in lines (sorted), and returns the numbers
+# in columns cols of each line as an array of type dtype, with shape 
+# (len(lines), len(cols)); the first skip characters of each line are
+# ignored (i.e., the ND in a *.2dm file). The lines are decoded in bulk,
+# all at once; if that fails (i.e., the lines do not all have the same
+# number of columns), the lines are parsed one at a time instead. A line
+# that does not have all of the columns in cols (or that has something
+# that is not a number in them) raises a ValueError that names the line.
+def _parseColumns(arr, starts, ends, lines, cols, dtype=np.float64, skip=0):
+  lines = np.asarray(lines, dtype=np.int64)
+  nlines = len(lines)
+  if (nlines == 0):
+    return np.zeros((0, len(cols)), dtype=dtype)
+  
+  # bytes of the lines (each with its end of line), as one block
+  lengths = ends[lines] - starts[lines] + 1
+  if (np.all(np.diff(lines) == 1)):
+    text = arr[starts[lines[0]]:ends[lines[-1]]+1]
+    if (skip > 0):
+      text = np.array(text)
+  else:
+    sel = np.zeros(len(starts), dtype=bool)
+    sel[lines] = True
+    line_len = np.diff(np.append(starts, len(arr)))
+    text = arr[np.repeat(sel, line_len)]
+  if (len(text) < np.sum(lengths)):
+    text = np.append(text, np.uint8(10))
+  
+  line_start = np.concatenate(([0], np.cumsum(lengths)[0:-1]))
+  for k in range(skip):
+    text[line_start + k] = 32
+  
+  block = text.tobytes()
+  try:
+    return np.loadtxt(io.BytesIO(block), dtype=dtype, comments=None,
+      usecols=cols, ndmin=2)
+  except ValueError:
+    pass
+  
+  out = np.zeros((nlines, len(cols)), dtype=dtype)
+  for i in range(nlines):
+    line = block[line_start[i]:line_start[i]+lengths[i]]
+    lst = line.split()
+    valid = True
+    try:
+      for j in range(len(cols)):
+        out[i,j] = float(lst[cols[j]])
+    except (IndexError, ValueError):
+      valid = False
+    if not valid:
+      raise ValueError('Line ' + str(lines[i]+1) + ' of the mesh file ' + 
+        'is not valid: ' + line.strip().decode('ascii', 'replace'))
+  return out
+
+def _readAdcirc(adcirc_file):
+
+  # the whole file is read at once, and the nodes and elements are parsed
+  # in bulk (rather than a line at a time)
+  arr, starts, ends = _readLines(adcirc_file)
+
+  # first line is the title string; second line is e, n
+  str = arr[starts[1]:ends[1]].tobytes().split()
+  e = int(str[0])
+  n = int(str[1])
+
+  # now we can read in the nodes (the node number is not needed)
+  nodes = _parseColumns(arr, starts, ends, np.arange(2, 2+n), (1,2,3))
+  x = np.ascontiguousarray(nodes[:,0])
+  y = np.ascontiguousarray(nodes[:,1])
+  z = np.ascontiguousarray(nodes[:,2])
 
   # now we can read in the element connectivity
-  for j in range(e):
-    str = fin.readline()
-    lst = str.split()
-
-    ikle[j,0] = int(lst[2])
-    ikle[j,1] = int(lst[3])
-    ikle[j,2] = int(lst[4])
+  ikle = _parseColumns(arr, starts, ends, np.arange(2+n, 2+n+e), (2,3,4),
+    dtype=np.int64)
 
   # now we shift the element connectivities, so that they are zero based
-  ikle[:,0] = ikle[:,0] - 1
-  ikle[:,1] = ikle[:,1] - 1
-  ikle[:,2] = ikle[:,2] - 1
+  ikle = ikle - 1
   
   return n,e,x,y,z,ikle
 
-def read2dm(two_dm_file):
-
-  fin = open(two_dm_file)
+def _read2dm(two_dm_file):
 
-  # https://stackoverflow.com/questions/845058/how-to-get-line-count-of-a-large-file-cheaply-in-python
-  # this code here cheaply reads the number of lines of a text file
-  def _make_gen(reader):
-    b = reader(1024 * 1024)
-    while b:
-      yield b
-      b = reader(1024*1024)
-  def rawgencount(filename):
-    f = open(filename, 'rb')
-    f_gen = _make_gen(f.raw.read)
-    return sum( buf.count(b'\n') for buf in f_gen )
+  arr, starts, ends = _readLines(two_dm_file)
 
-  num_lines = rawgencount(two_dm_file)
-
-  # because of the header line, the total number of lines in the file
-  # (which is nodes and elements joined is) n_plus_e
-  n_plus_e = num_lines - 1
-
-  # reads the header line
-  str = fin.readline()
-
-  # the number of elements counter
-  e = 0
-  n = 0
+  # the first line is the header line; the others are found from their
+  # first characters (ND for nodes, E3T for elements)
+  c0 = arr[np.minimum(starts, len(arr)-1)]
+  c1 = arr[np.minimum(starts+1, len(arr)-1)]
+  c2 = arr[np.minimum(starts+2, len(arr)-1)]
+  length = ends - starts
   
-  # go through each line and count the total number of elements and nodes
-  for i in range(n_plus_e):
-    str = fin.readline()
-    three_chars = str[0:3]
-    two_chars = str[0:2]
-    
-    if (three_chars == 'E3T'):
-      e = e + 1
-    if (two_chars == 'ND'):
-      n = n + 1
-
-  fin.close()
-
-  # open the same file again
-  fin = open(two_dm_file)
+  is_node = (length >= 2) & (c0 == ord('N')) & (c1 == ord('D'))
+  is_elem = (length >= 3) & (c0 == ord('E')) & (c1 == ord('3')) & \
+    (c2 == ord('T'))
+  is_node[0] = False
+  is_elem[0] = False
+
+  n = int(np.sum(is_node))
+  e = int(np.sum(is_elem))
   
   # now we can declare the arrays that are needed to store the values read
   x = np.zeros(n, dtype=np.float64)
@@ -102,192 +133,229 @@ def read2dm(two_dm_file):
 
   ikle = np.zeros( (e,3), dtype = np.int64)
 
-  # counters for nodes and elements
-  node_count = 0
-  ele_count = 0
-  
-  # now to fill in x,y,z and ikle arrays
-  for i in range(n_plus_e):
-    str = fin.readline()
-    three_chars = str[0:3]
-    two_chars = str[0:2]
-    tmp = str.split(' ')
-    
-    if (three_chars == 'E3T'):
-      
-      ele_count = int(tmp[1])
-      ikle[ele_count-1,0] = int(tmp[2])
-      ikle[ele_count-1,1] = int(tmp[3])
-      ikle[ele_count-1,2] = int(tmp[4])
-
-    if (two_chars == 'ND'):
-      node_count = int(tmp[1])
-      x[node_count-1] = float(tmp[2])
-      y[node_count-1] = float(tmp[3])
-      z[node_count-1] = float(tmp[4])
+  # now to fill in x,y,z and ikle arrays; each node and element is put in
+  # the place of its number
+  nodes = _parseColumns(arr, starts, ends, np.flatnonzero(is_node),
+    (0,1,2,3), skip=2)
+  node_count = nodes[:,0].astype(np.int64)
+  x[node_count-1] = nodes[:,1]
+  y[node_count-1] = nodes[:,2]
+  z[node_count-1] = nodes[:,3]
 
-  fin.close()
+  elements = _parseColumns(arr, starts, ends, np.flatnonzero(is_elem),
+    (0,1,2,3), dtype=np.int64, skip=3)
+  ikle[elements[:,0]-1,:] = elements[:,1:4]
 
   # now we shift the element connectivities, so that they are zero based
-  ikle[:,0] = ikle[:,0] - 1
-  ikle[:,1] = ikle[:,1] - 1
-  ikle[:,2] = ikle[:,2] - 1
+  ikle = ikle - 1
   
   return n,e,x,y,z,ikle
 
-def readPly(ply_file):
+def _readPly(ply_file):
   #{{{
-  # define lists
-  x = list()
-  y = list()
-  z = list()
-  e1 = list()
-  e2 = list()
-  e3 = list()
-  
-  # each line in the file is a list object
-  line = list()
-  with open(ply_file, 'r') as f1:
-    for i in f1:
-      line.append(i)
+  arr, starts, ends = _readLines(ply_file)
   
   # reads the nodes from    
-  n = line[3].split()[2]
+  n = arr[starts[3]:ends[3]].tobytes().split()[2]
   n = int(n)
-  e = line[7].split()[2]
+  e = arr[starts[7]:ends[7]].tobytes().split()[2]
   e = int(e)
   
-  node_str = str("")
   # read nodes from file
-  for i in range(10,n+10):
-    node_str = line[i]
-    node_str_list = node_str.split()
-    x.append(node_str_list[0])
-    y.append(node_str_list[1])
-    z.append(node_str_list[2])
-    
+  nodes = _parseColumns(arr, starts, ends, np.arange(10, n+10), (0,1,2))
+  xx = np.ascontiguousarray(nodes[:,0])
+  yy = np.ascontiguousarray(nodes[:,1])
+  zz = np.ascontiguousarray(nodes[:,2])
   
-  # write the temp elements file
-  for i in range(n+10,n+10+e):
-    ele_str = line[i]
-    ele_str_list = ele_str.split()
-    e1.append(ele_str_list[1])
-    e2.append(ele_str_list[2])
-    e3.append(ele_str_list[3])
-    
-  # turn these into numpy arrays
-  xx = np.zeros(n)
-  yy = np.zeros(n)
-  zz = np.zeros(n)
-  e11 = np.zeros(e)
-  e22 = np.zeros(e)
-  e33 = np.zeros(e)
-  
-  for i in range(0,n):
-    xx[i] = x[i]
-    yy[i] = y[i]
-    zz[i] = z[i]
-    
-  # +1 to change index of elements to match
-  for i in range(0,e):
-    e11[i] = int(e1[i])+1
-    e22[i] = int(e2[i])+1
-    e33[i] = int(e3[i])+1
-    
-  # stack the elements
-  ikle = np.column_stack((e11,e22,e33))  
-  ikle = ikle.astype(np.int32)
+  # read the elements; +1 to change index of elements to match
+  ikle = _parseColumns(arr, starts, ends, np.arange(n+10, n+10+e), (1,2,3),
+    dtype=np.int32) + 1
   
   return n,e,xx,yy,zz,ikle
 
-# reads a *.dat mesh file format; stores the ikle indexes as zero based
-def readDat(dat_file):
+def _readDat(dat_file):
 
-  # open the file
-  fin = open(dat_file, 'r')
+  arr, starts, ends = _readLines(dat_file)
 
   # read the first line of the *.dat file (and get nodes and elements)
-  line = fin.readline()
-
-  # these are strings
-  n = int( line.split()[0] )
-  e = int( line.split()[1] ) # this includes the 1d elements too
+  line = arr[starts[0]:ends[0]].tobytes().split()
+  n = int( line[0] )
+  e = int( line[1] ) # this includes the 1d elements too
+
+  # read the nodes; do not have to read the node number
+  nodes = _parseColumns(arr, starts, ends, np.arange(1, n+1), (1,2,3))
+  x = np.ascontiguousarray(nodes[:,0])
+  y = np.ascontiguousarray(nodes[:,1])
+  z = np.ascontiguousarray(nodes[:,2])
+
+  # read the element type flags (103 = 1d mesh; 203 = 2d mesh) of all of
+  # the elements (1d+2d), and then the nodes of the 2d elements only
+  elem_lines = np.arange(n+1, n+1+e)
+  mesh_flag = _parseColumns(arr, starts, ends, elem_lines, (1,), 
+    dtype=np.int64)[:,0]
+  ikle2d = _parseColumns(arr, starts, ends, elem_lines[mesh_flag == 203],
+    (2,3,4), dtype=np.int64)
 
-  # now we can define numpy arrays to store the mesh data
-  x = np.zeros(n, dtype=np.float64)
-  y = np.zeros(n, dtype=np.float64)
-  z = np.zeros(n, dtype=np.float64)
+  # change the indexes of the ikle2d array to zero based
+  ikle2d = ikle2d - 1
+      
+  # the number of 2d elements is this
+  e = len(ikle2d)
 
-  # this is the ikle array, but it has the shape that includes all
-  # elements (1d+2d)
-  ikle = np.zeros( (e,3), dtype=np.int64)
+  return n,e,x,y,z,ikle2d
 
-  # element type flag in the *.dat mesh (103 = 1d mesh; 203 = 2d mesh)
-  mesh_flag = np.zeros(e, dtype=np.int64)
+# The mesh cache (off unless it is turned on). After a mesh file is parsed
+# the first time, its n, e, x, y, z and ikle are saved to a binary *.npz
+# snapshot; later reads of the same file load the snapshot instead, as 
+# long as the size, the modification time and a hash of the start and end
+# of the mesh file have not changed. The cache is turned on with 
+# useMeshCache(), or by setting PPUTILS_MESH_CACHE; its value is 'local' to
+# save the snapshot next to the mesh file (i.e., tin.grd.npz), or a 
+# directory for all snapshots. The snapshots in a directory are kept to 
+# PPUTILS_MESH_CACHE_SIZE MB (2048 by default) in total, by deleting the
+# ones that were used the longest ago. If the cache can not be used (i.e.,
+# a read only directory), the mesh file is read without it.
+_mesh_cache = dict(is_set=False, location=None, max_size=None)
+
+# turns the mesh cache on (or off, if location is None or False) for this
+# process; this wins over PPUTILS_MESH_CACHE
+def useMeshCache(location='local', max_size=2048):
+  _mesh_cache['is_set'] = True
+  _mesh_cache['location'] = location
+  _mesh_cache['max_size'] = max_size
+
+def _cacheSettings():
+  location = _mesh_cache['location']
+  max_size = _mesh_cache['max_size']
+  if not _mesh_cache['is_set']:
+    location = os.environ.get('PPUTILS_MESH_CACHE', '')
+  elif (location is None or location is False):
+    location = ''
+  if (max_size is None):
+    max_size = float(os.environ.get('PPUTILS_MESH_CACHE_SIZE', 2048))
+  return location, max_size * 1024 * 1024
+
+# size, modification time and hash (of the first and last MB) of a file
+def _fileKey(fname):
+  st = os.stat(fname)
+  h = hashlib.md5()
+  with open(fname, 'rb') as f:
+    h.update(f.read(1024*1024))
+    if (st.st_size > 2*1024*1024):
+      f.seek(-1024*1024, 2)
+      h.update(f.read(1024*1024))
+  return st.st_size, st.st_mtime, h.hexdigest()
+
+def _cacheFile(fname, location, kind):
+  if (location == 'local'):
+    return fname + '.npz'
+  key = (os.path.abspath(fname) + '|' + kind).encode()
+  return os.path.join(location, 'mesh_' + hashlib.md5(key).hexdigest()[0:16]
+    + '_' + os.path.basename(fname) + '.npz')
+
+# returns (n,e,x,y,z,ikle) from a snapshot, or None if there is no 
+# snapshot, or it does not match the key of the mesh file
+def _loadCache(cache_file, kind, key):
+  if not os.path.isfile(cache_file):
+    return None
+  try:
+    with np.load(cache_file) as npz:
+      if (str(npz['kind']) != kind or int(npz['file_size']) != key[0] or
+        float(npz['mtime']) != key[1] or str(npz['hash']) != key[2]):
+        return None
+      n = int(npz['n'])
+      e = int(npz['e'])
+      
+      # regular arrays, so that the snapshot is closed once it is read
+      out = [np.array(npz[name]) for name in ['x', 'y', 'z', 'ikle']]
+  except Exception:
+    return None
   
-  # now we can read the *.dat file line by line, and store into arrays
-  # read the nodes
-  for i in range(n):
-    # reads the file from the file stream as a string
-    line = fin.readline()
-
-    # converts the line as a list of strings
-    lst = line.split()
-
-    # do not have to read the node number (at lst[0])
-    x[i] = float( lst[1])
-    y[i] = float( lst[2])
-    z[i] = float( lst[3])
-
-  # now we are ready to store the elements into the ikle array
-  # count for the 2d elements
-  count = 0
-
-  # read the elements
-  for i in range(e):
-    # reads the file from the file stream as a string
-    line = fin.readline()
+  # the snapshot was used now (for the eviction)
+  try:
+    os.utime(cache_file, None)
+  except OSError:
+    pass
+  return (n, e) + tuple(out)
+
+def _saveCache(cache_file, location, kind, key, mesh, max_size):
+  n,e,x,y,z,ikle = mesh
+  tmp_file = cache_file + '.tmp' + str(os.getpid())
+  try:
+    with open(tmp_file, 'wb') as f:
+      np.savez(f, kind=kind, file_size=key[0], mtime=key[1], hash=key[2],
+        n=n, e=e, x=x, y=y, z=z, ikle=ikle)
+    if os.path.isfile(cache_file):
+      os.remove(cache_file)
+    os.rename(tmp_file, cache_file)
+  except (IOError, OSError):
+    # the cache is only an aid; the mesh was read anyway
+    if os.path.isfile(tmp_file):
+      os.remove(tmp_file)
+    return
+  
+  # snapshots next to the mesh files are not evicted
+  if (location != 'local'):
+    _evictCache(location, cache_file, max_size)
+
+# deletes the snapshots in the cache directory used the longest ago, until
+# they take no more than max_size bytes (the newest one is always kept)
+def _evictCache(cache_dir, newest, max_size):
+  files = list()
+  for name in os.listdir(cache_dir):
+    if (name.startswith('mesh_') and name.endswith('.npz')):
+      path = os.path.join(cache_dir, name)
+      try:
+        st = os.stat(path)
+      except OSError:
+        continue
+      files.append((st.st_mtime, st.st_size, path))
+  
+  total = sum([f[1] for f in files])
+  for mtime, size, path in sorted(files):
+    if (total <= max_size):
+      break
+    if (path == newest):
+      continue
+    try:
+      os.remove(path)
+      total = total - size
+    except OSError:
+      pass
+
+# reads the mesh with reader, through the cache if it is turned on
+def _cachedRead(fname, kind, reader):
+  location, max_size = _cacheSettings()
+  if (location == ''):
+    return reader(fname)
+  
+  # the cache is only an aid; if it can not be used, read without it
+  try:
+    if (location != 'local'):
+      os.makedirs(location, exist_ok=True)
+    cache_file = _cacheFile(fname, location, kind)
+    key = _fileKey(fname)
+    mesh = _loadCache(cache_file, kind, key)
+  except Exception:
+    return reader(fname)
+  
+  if (mesh is None):
+    mesh = reader(fname)
+    try:
+      _saveCache(cache_file, location, kind, key, mesh, max_size)
+    except Exception:
+      pass
+  return mesh
 
-    # converts the line as a list of strings
-    lst = line.split()
+def readAdcirc(adcirc_file):
+  return _cachedRead(adcirc_file, 'adcirc', _readAdcirc)
 
-    # store the mesh flag (convert string to an integer)
-    mesh_flag[i] = int(lst[1])
-
-    # store everything in the ikle array (1d+2d)
-    # count the ones that are 203 (these are 2d elements)
-    if (mesh_flag[i] == 203):
-      ikle[i,0] = lst[2]
-      ikle[i,1] = lst[3]
-      ikle[i,2] = lst[4]
-
-      # update the count
-      count = count + 1
-
-  # now that we have the count for the number of 2d elements, we can define
-  # the ikle2d array
-  ikle2d = np.zeros((count, 3), dtype=np.int64)
-
-  # go through the ikle array, and write only the 2d elements to the ikle2d array
-  a = 0 
-  for i in range(e):
-    if (mesh_flag[i] == 203):
-      ikle2d[a,0] = ikle[i,0]
-      ikle2d[a,1] = ikle[i,1]
-      ikle2d[a,2] = ikle[i,2]
-
-      # increment the counter
-      a = a + 1
-      
-  # the number of 2d elements is this
-  e = count
+def read2dm(two_dm_file):
+  return _cachedRead(two_dm_file, '2dm', _read2dm)
 
-  # change the indexes of the ikle2d array to zero based
-  ikle2d[:,0] = ikle2d[:,0] - 1
-  ikle2d[:,1] = ikle2d[:,1] - 1
-  ikle2d[:,2] = ikle2d[:,2] - 1
-  
-  # close the input file
-  fin.close()
+def readPly(ply_file):
+  return _cachedRead(ply_file, 'ply', _readPly)
 
-  return n,e,x,y,z,ikle2d
+# reads a *.dat mesh file format; stores the ikle indexes as zero based
+def readDat(dat_file):
+  return _cachedRead(dat_file, 'dat', _readDat)
@@ -33,14 +33,488 @@
 # Revised: Nov 24, 2019
 # Made the change recommended by Qilong Bi to work in writing 3d files.
 #
+# Revised: Oct 17, 2026
+# The IKLE, IPOBO, x and y records in readHeader() are now decoded in bulk
+# with numpy, instead of one value at a time with unpack().
+#
+# Revised: Oct 17, 2026
+# readTimes() now stores the byte offset of each time step, so that
+# readVariables() and readVariablesAtNode() seek directly to the frame
+# rather than walking through the file from the start. A time step that
+# is cut short at the end of the file is not listed.
+#
+# Revised: Oct 17, 2026
+# Added memmapVariables() that returns a memory mapped (time, variable,
+# node) view of the results, without reading the whole file.
+#
+# Revised: Oct 17, 2026
+# Added readVariablesAtNodes() to extract time series at many nodes in a
+# single pass through the file.
+#
+# Revised: Oct 17, 2026
+# writeHeader() and writeVariables() write each record as one buffer,
+# instead of packing and writing one value at a time.
+#
+# Revised: Oct 17, 2026
+# Added writeIndex() and readIndex() that write and reuse a sidecar 
+# *.slfidx file with the times, frame offsets and per time step min, max 
+# and mean of each variable.
+#
+# Revised: Oct 17, 2026
+# Added iterFrames() generator that reads the next time steps on a
+# background thread while the caller processes the current one.
+#
+# Revised: Oct 17, 2026
+# readVariables() takes an optional list of variable indices, and skips
+# the records of the variables that are not requested.
+#
+# Revised: Oct 17, 2026
+# Added appendHeader() that opens an existing *.slf file, so that new time
+# steps can be written at its end.
+#
+# Revised: Oct 17, 2026
+# Added followFrames() that yields new time steps of a *.slf file while 
+# it is being written by a running simulation.
+#
+# Revised: Oct 17, 2026
+# Added getSubMesh() that keeps a subset of the elements, and renumbers
+# the nodes of the subset.
+#
+# Revised: Oct 17, 2026
+# The index file also stores the min, max, mean, std, approximate
+# percentiles and number of non-finite values of each variable over all
+# time steps.
+#
+# Revised: Oct 17, 2026
+# Added resampleFrames() and averageFrames() generators that interpolate
+# the time steps onto new times, or average them over blocks of time.
+#
+# Revised: Oct 17, 2026
+# Added writeTransposed() and readTransposed() for a time major companion 
+# file (*.slft). When it is valid, readVariablesAtNode() and 
+# readVariablesAtNodes() read the series from it if that is cheaper.
+#
+# Revised: Oct 17, 2026
+# Added writeArchive() and extractArchive() for compressed archives of
+# *.slf files (each record is compressed on its own, and the values can be
+# rounded to a tolerance). An archive is read by the same methods as a 
+# *.slf file, as readHeader() recognizes it.
+#
+# Revised: Oct 17, 2026
+# Added ppFrameCache, a cache of decoded time steps in shared memory for
+# processes that read the same file at the same time. It is used with
+# useFrameCache(), or by setting PPUTILS_FRAME_CACHE (only in the scripts
+# that call useFrameCacheFromEnv()).
+#
 # Uses: Python 2 or 3, Numpy
 #
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Global Imports
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 from struct import unpack,pack
-import sys
+import os,sys
+import time as pytime
+import threading
+import zlib
+import io
 import numpy as np
+try:
+  import queue
+except ImportError:
+  import Queue as queue # python 2
+try:
+  import lzma
+except ImportError:
+  lzma = None # python 2
+try:
+  from multiprocessing import shared_memory
+except ImportError:
+  shared_memory = None # python 3.8 or newer only
+try:
+  import fcntl
+except ImportError:
+  fcntl = None # windows
+import hashlib
+import tempfile
+#
+# archives written by writeArchive() start and end with this string
+ARCHIVE_MAGIC = b'PPSLFZ01'
+#
+# read only view of the values of an archive, with the shape (time, 
+# variable, node); it is indexed like the array from memmapVariables(), 
+# and only the time steps that are indexed are decompressed
+class _ArchiveValues:
+  def __init__(self, slf):
+    self.slf = slf
+    self.shape = (len(slf.frame_offsets), slf.NBV1, slf.NPOIN)
+    self.ndim = 3
+    self.dtype = np.dtype(np.float64)
+    
+  def __len__(self):
+    return self.shape[0]
+  
+  def __getitem__(self, key):
+    if not isinstance(key, tuple):
+      key = (key,)
+    
+    frames = np.arange(self.shape[0])[key[0]]
+    if (np.ndim(frames) == 0):
+      return self.slf._readFrame(self.slf.f, 
+        self.slf.frame_offsets[int(frames)])[key[1:]]
+    
+    vals = [self.slf._readFrame(self.slf.f, 
+      self.slf.frame_offsets[t])[key[1:]] for t in frames]
+    if (len(vals) == 0):
+      return np.zeros((0,) + np.zeros(self.shape[1:])[key[1:]].shape)
+    return np.array(vals)
+#
+# name of the shared memory cache of a *.slf file (see ppFrameCache); it
+# is found by the path, size and modification time of the file (and the
+# version of the layout of the control block)
+def _frameCacheName(slf_file):
+  st = os.stat(slf_file)
+  key = os.path.abspath(slf_file) + '|' + str(st.st_size) + '|' + \
+    str(st.st_mtime) + '|2'
+  return 'pp' + hashlib.md5(key.encode()).hexdigest()[0:16]
+#
+# removes the shared memory blocks of the cache with the given name (the
+# ones that exist); returns the number of blocks removed
+def _removeFrameCacheBlocks(name):
+  count = 0
+  for suffix in ['_c', '_f', '_m']:
+    try:
+      shm = shared_memory.SharedMemory(name=name + suffix)
+    except FileNotFoundError:
+      continue
+    shm.close()
+    try:
+      shm.unlink()
+      count = count + 1
+    except FileNotFoundError:
+      pass
+  return count
+#
+# removes the cache of a *.slf file from memory, if there is one (without
+# creating it); returns True if a cache was removed
+def removeFrameCache(slf_file):
+  if (shared_memory is None):
+    return False
+  name = _frameCacheName(slf_file)
+  count = _removeFrameCacheBlocks(name)
+  lock_file = os.path.join(tempfile.gettempdir(), name + '.lock')
+  if os.path.isfile(lock_file):
+    os.remove(lock_file)
+  return (count > 0)
+#
+# cache of decoded time steps of a *.slf file (or archive) in shared 
+# memory, so that processes that work on the same file at the same time
+# (i.e., several scripts running in parallel) read and decode each time 
+# step only once. The first process creates the cache, and the others 
+# attach to it; the cache is found by the path, size and modification 
+# time of the file. It holds the x, y and IKLE of the mesh, and nslots 
+# time steps; if nslots is not given, it is the number of time steps that
+# fit in max_bytes (at least one). When all slots are used, the least 
+# recently used time step is dropped. The cache stays in memory after the
+# processes exit, until unlink() or removeFrameCache() is called (see 
+# slfcache.py). Needs Python 3.8 or newer.
+class ppFrameCache:
+  def __init__(self, slf, nslots=None, max_bytes=256*1024*1024):
+    if (shared_memory is None):
+      raise RuntimeError('Frame cache needs Python 3.8 or newer')
+    
+    NBV1 = slf.NBV1
+    NPOIN = slf.NPOIN
+    
+    if (nslots is None):
+      nslots = max(int(max_bytes // max(8*NBV1*NPOIN, 1)), 1)
+      if (len(slf.frame_offsets) > 0):
+        nslots = min(nslots, len(slf.frame_offsets))
+    if (nslots < 1):
+      raise ValueError('Frame cache needs at least one slot')
+    
+    self.slf = slf
+    self.fin = open(slf.slf_file, 'rb')
+    
+    # the threads of this process (i.e., the reader of iterFrames) share
+    # the control block and the file handle; tlock guards the first, and
+    # read_lock the second
+    self.tlock = threading.Lock()
+    self.read_lock = threading.Lock()
+    
+    self.name = _frameCacheName(slf.slf_file)
+    self.lock_file = os.path.join(tempfile.gettempdir(), self.name + '.lock')
+    
+    # the control block holds: ready flag, nslots, LRU clock, and for each 
+    # slot the time step index (-1 if empty), last use, state (0 = empty, 
+    # 1 = being read, 2 = ready), number of users holding it, and the pid
+    # of the process that is reading it
+    flock = self._lock()
+    try:
+      try:
+        self.shm_ctl = self._shm(self.name + '_c')
+        self.shm_frames = self._shm(self.name + '_f')
+        self.shm_mesh = self._shm(self.name + '_m')
+        ready = (bytes(self.shm_ctl.buf[0:8]) == np.int64(1).tobytes())
+      except FileNotFoundError:
+        ready = False
+      
+      # blocks that are missing or not ready were left by a process that
+      # was stopped while it created the cache; they are made again
+      if not ready:
+        for a in ['shm_ctl', 'shm_frames', 'shm_mesh']:
+          if hasattr(self, a):
+            getattr(self, a).close()
+        _removeFrameCacheBlocks(self.name)
+        
+        self.shm_ctl = self._shm(self.name + '_c', 8*(3 + 5*nslots))
+        self.shm_frames = self._shm(self.name + '_f', 
+          max(8*nslots*NBV1*NPOIN, 1))
+        self.shm_mesh = self._shm(self.name + '_m', 
+          max(8*2*NPOIN + 4*slf.NELEM*slf.NDP, 1))
+        
+        ctl = np.ndarray((3 + 5*nslots,), dtype=np.int64, 
+          buffer=self.shm_ctl.buf)
+        ctl[:] = 0
+        ctl[1] = nslots
+        ctl[3:3+nslots] = -1
+        
+        mesh = self.shm_mesh.buf
+        np.ndarray((NPOIN,), dtype=np.float64, buffer=mesh)[:] = slf.x
+        np.ndarray((NPOIN,), dtype=np.float64, buffer=mesh, 
+          offset=8*NPOIN)[:] = slf.y
+        np.ndarray((slf.NELEM, slf.NDP), dtype=np.int32, buffer=mesh,
+          offset=16*NPOIN)[:,:] = slf.IKLE
+        ctl[0] = 1
+    finally:
+      self._unlock(flock)
+    
+    self.ctl = np.ndarray((self.shm_ctl.size // 8,), dtype=np.int64, 
+      buffer=self.shm_ctl.buf)
+    self.nslots = int(self.ctl[1])
+    self.slot_frame = self.ctl[3:3+self.nslots]
+    self.slot_stamp = self.ctl[3+self.nslots:3+2*self.nslots]
+    self.slot_state = self.ctl[3+2*self.nslots:3+3*self.nslots]
+    self.slot_pins = self.ctl[3+3*self.nslots:3+4*self.nslots]
+    self.slot_owner = self.ctl[3+4*self.nslots:3+5*self.nslots]
+    
+    self.frames = np.ndarray((self.nslots, NBV1, NPOIN), dtype=np.float64,
+      buffer=self.shm_frames.buf)
+    
+  # creates (if size is given) or attaches to a shared memory block; the
+  # block is not removed when the process exits
+  def _shm(self, name, size=None):
+    create = (size is not None)
+    try:
+      return shared_memory.SharedMemory(name=name, create=create, 
+        size=(size or 0), track=False)
+    except TypeError:
+      # python older than 3.13 removes the block at exit, unless it is
+      # taken off the list of resources of the process
+      shm = shared_memory.SharedMemory(name=name, create=create, 
+        size=(size or 0))
+      try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, 'shared_memory')
+      except Exception:
+        pass
+      return shm
+  
+  # lock shared by all processes that use the cache (a lock file in the 
+  # temporary directory, taken while the thread lock of this process is
+  # held); returns the handle of the lock file, which is given back to
+  # _unlock(). On windows, the lock file is not used.
+  def _lock(self):
+    self.tlock.acquire()
+    try:
+      flock = open(self.lock_file, 'a')
+      if (fcntl is not None):
+        fcntl.flock(flock, fcntl.LOCK_EX)
+    except BaseException:
+      self.tlock.release()
+      raise
+    return flock
+  
+  def _unlock(self, flock):
+    try:
+      if (fcntl is not None):
+        fcntl.flock(flock, fcntl.LOCK_UN)
+      flock.close()
+    finally:
+      self.tlock.release()
+  
+  # reads time step t from the file (None if it is not complete in the 
+  # file), with the file handle held by this thread only
+  def _readFile(self, t):
+    with self.read_lock:
+      pos = self._offset(t)
+      if (pos is None):
+        return None
+      return self.slf._readFrameFromFile(self.fin, pos)
+  
+  # True if the process with the given pid is running; on windows this 
+  # can not be checked, and it is assumed to be running
+  def _alive(self, pid):
+    if (os.name != 'posix'):
+      return True
+    try:
+      os.kill(int(pid), 0)
+    except ProcessLookupError:
+      return False
+    except OSError:
+      pass
+    return True
+  
+  # empties slot i (must be called with the lock held)
+  def _clearSlot(self, i):
+    self.slot_frame[i] = -1
+    self.slot_state[i] = 0
+    self.slot_pins[i] = 0
+    self.slot_owner[i] = 0
+  
+  # byte offset of time step t in the file
+  def _offset(self, t):
+    slf = self.slf
+    if (t < len(slf.frame_offsets)):
+      return slf.frame_offsets[t]
+    if slf.archive:
+      if (t < len(slf.arch_offsets)):
+        return slf.arch_offsets[t,0]
+      return None
+    return slf.header_size + t*slf.getFrameSize()
+  
+  # returns the slot that holds time step t, reading it into the least 
+  # recently used free slot if it is not in the cache; the slot is held 
+  # (i.e., can not be dropped) until _release() is called. Returns -1 if 
+  # the time step is not complete in the file, and -2 if all slots are 
+  # held by other users.
+  def _acquire(self, t):
+    while True:
+      flock = self._lock()
+      try:
+        hit = np.where(self.slot_frame == t)[0]
+        if (len(hit) > 0 and self.slot_state[hit[0]] == 2):
+          i = hit[0]
+          self.ctl[2] += 1
+          self.slot_stamp[i] = self.ctl[2]
+          self.slot_pins[i] += 1
+          return i
+        
+        # the process that was reading this time step was killed before
+        # it finished, so the slot is taken back
+        if (len(hit) > 0 and not self._alive(self.slot_owner[hit[0]])):
+          self._clearSlot(hit[0])
+          hit = hit[0:0]
+        
+        if (len(hit) == 0):
+          free = np.where(self.slot_pins == 0)[0]
+          if (len(free) == 0):
+            return -2
+          i = free[np.argmin(self.slot_stamp[free])]
+          self.slot_frame[i] = t
+          self.slot_state[i] = 1
+          self.slot_pins[i] = 1
+          self.slot_owner[i] = os.getpid()
+          break
+      finally:
+        self._unlock(flock)
+      
+      # another process is reading this time step
+      pytime.sleep(0.001)
+    
+    # if the read fails (or is interrupted), the slot is emptied, so that
+    # other processes do not wait for it
+    vals = None
+    done = False
+    try:
+      vals = self._readFile(t)
+      done = True
+    finally:
+      if not done:
+        flock = self._lock()
+        try:
+          self._clearSlot(i)
+        finally:
+          self._unlock(flock)
+    
+    flock = self._lock()
+    try:
+      if (vals is None):
+        self._clearSlot(i)
+        return -1
+      self.frames[i] = vals
+      self.ctl[2] += 1
+      self.slot_stamp[i] = self.ctl[2]
+      self.slot_state[i] = 2
+      self.slot_owner[i] = 0
+    finally:
+      self._unlock(flock)
+    return i
+  
+  def _release(self, i):
+    flock = self._lock()
+    try:
+      if (self.slot_pins[i] > 0):
+        self.slot_pins[i] -= 1
+    finally:
+      self._unlock(flock)
+  
+  # returns a copy of the values of time step t, with the shape (variable,
+  # node); None if the time step is not complete in the file
+  def getFrame(self, t):
+    i = self._acquire(t)
+    if (i == -1):
+      return None
+    if (i == -2):
+      return self._readFile(t)
+    try:
+      return np.array(self.frames[i])
+    finally:
+      self._release(i)
+  
+  # calls func with a read only view of the values of time step t in
+  # shared memory (i.e., without a copy), and returns what func returns;
+  # the time step stays in the cache while func runs
+  def withFrame(self, t, func):
+    i = self._acquire(t)
+    if (i == -1):
+      return func(None)
+    if (i == -2):
+      return func(self._readFile(t))
+    try:
+      view = self.frames[i]
+      view.flags.writeable = False
+      return func(view)
+    finally:
+      self._release(i)
+  
+  # read only views of the x, y and IKLE (one based) of the mesh in shared 
+  # memory
+  def getMesh(self):
+    NPOIN = self.slf.NPOIN
+    mesh = self.shm_mesh.buf
+    x = np.ndarray((NPOIN,), dtype=np.float64, buffer=mesh)
+    y = np.ndarray((NPOIN,), dtype=np.float64, buffer=mesh, offset=8*NPOIN)
+    IKLE = np.ndarray((self.slf.NELEM, self.slf.NDP), dtype=np.int32, 
+      buffer=mesh, offset=16*NPOIN)
+    for a in [x, y, IKLE]:
+      a.flags.writeable = False
+    return x, y, IKLE
+  
+  # detaches this process from the cache
+  def close(self):
+    self.ctl = None
+    self.slot_frame = self.slot_stamp = self.slot_state = None
+    self.slot_pins = self.slot_owner = self.frames = None
+    for shm in [self.shm_ctl, self.shm_frames, self.shm_mesh]:
+      shm.close()
+    self.fin.close()
+  
+  # removes the cache from memory (processes that are attached keep their
+  # view until they close it)
+  def unlink(self):
+    _removeFrameCacheBlocks(self.name)
+    if os.path.isfile(self.lock_file):
+      os.remove(self.lock_file)
 #
 class ppSELAFIN:
 
@@ -101,9 +575,73 @@ class ppSELAFIN:
     
     self.tempAtNode = np.zeros((0,0))
     
+    # array that holds results at a number of nodes, for all time steps
+    # (time, variable, node)
+    self.tempAtNodes = np.zeros((0,0,0))
+    
+    # byte offset of each time record in the file (filled by readTimes)
+    self.frame_offsets = []
+    
+    # size of the header in bytes (i.e., offset of the first time record)
+    self.header_size = 0
+    
+    # memory mapped view of the variables (see memmapVariables)
+    self.values = None
+    
+    # min, max and mean of each variable for each time step, with shape
+    # (time, variable, 3); filled by readIndex or writeIndex
+    self.stats = np.zeros((0,0,3))
+    
+    # min, max, mean and std of each variable over all time steps, the
+    # percentiles at pct_levels (estimated from a random sample of 
+    # sketch_size values of each variable), and the number of values that
+    # are not finite (nan or inf); filled by readIndex or writeIndex
+    self.gstats = np.zeros((0,4))
+    self.pct_levels = [1, 5, 25, 50, 75, 95, 99]
+    self.percentiles = np.zeros((0,7))
+    self.nonfinite = np.zeros(0, dtype=np.int64)
+    self.sketch_size = 10000
+    
+    # sidecar index file that sits next to the *.slf file
+    self.idx_file = os.path.splitext(slf_file)[0] + '.slfidx'
+    
+    # time major companion file that sits next to the *.slf file (see 
+    # writeTransposed), and its memory mapped view with the shape 
+    # (variable, node, time); tvalues stays None until a valid companion 
+    # file is opened by readTransposed
+    self.t_file = os.path.splitext(slf_file)[0] + '.slft'
+    self.tvalues = None
+    self.t_checked = False
+    
+    # compressed archives (see writeArchive); the header of the original 
+    # *.slf file starts at hdr_start, and the index of the archive gives 
+    # the offset, length and encoding of the compressed record of each 
+    # variable at each time step, with the shape (time, variable)
+    self.archive = False
+    self.hdr_start = 0
+    self.arch_times = np.zeros(0)
+    self.arch_offsets = np.zeros((0,0), dtype=np.int64)
+    self.arch_lengths = np.zeros((0,0), dtype=np.int64)
+    self.arch_kinds = np.zeros((0,0), dtype=np.int8)
+    self.arch_step = 0.0
+    self.arch_compression = 'zlib'
+    
+    # shared memory cache of decoded time steps (see useFrameCache)
+    self.cache = None
+    
   # methods start here
   def readHeader(self):
     self.f = open(self.slf_file, 'rb')
+    
+    # an archive starts with a magic string, followed by the header of the
+    # original *.slf file
+    self.archive = (self.f.read(8) == ARCHIVE_MAGIC)
+    if self.archive:
+      self.hdr_start = 8
+    else:
+      self.hdr_start = 0
+    self.f.seek(self.hdr_start)
+    
     garbage = unpack('>i', self.f.read(4))[0]
       
     if (self.version == 2):
@@ -176,23 +714,19 @@ class ppSELAFIN:
     dummy = unpack('>i', self.f.read(4))[0]
     garbage = unpack('>i', self.f.read(4))[0]
     
-    self.IKLE = np.zeros((self.NELEM, self.NDP), dtype=np.int32)
-    
+    # the connectivity and coordinate records are decoded in bulk using
+    # big endian numpy dtypes, rather than one value at a time
     garbage = unpack('>i', self.f.read(4))[0]
-    for i in range(self.NELEM):
-      for j in range(self.NDP):
-        self.IKLE[i,j] = unpack('>l', self.f.read(4))[0]
+    self.IKLE = np.frombuffer(self.f.read(4*self.NELEM*self.NDP), 
+      dtype='>i4').astype(np.int32).reshape(self.NELEM, self.NDP)
     garbage = unpack('>i', self.f.read(4))[0]    
     
-    self.IPOBO = np.zeros(self.NPOIN, dtype=np.int32)
-    
     garbage = unpack('>i', self.f.read(4))[0]
-    for i in range(self.NPOIN):
-      self.IPOBO[i] = unpack('>l', self.f.read(4))[0]
+    self.IPOBO = np.frombuffer(self.f.read(4*self.NPOIN), 
+      dtype='>i4').astype(np.int32)
     garbage = unpack('>i', self.f.read(4))[0]
       
     # reads x
-    self.x = np.zeros(self.NPOIN)
     garbage = unpack('>i', self.f.read(4))[0]
     
     # this is where we decide if it is single of double precision
@@ -202,19 +736,33 @@ class ppSELAFIN:
       self.float_type = 'd'
       self.float_size = 8  
     
-    for i in range(self.NPOIN):
-      self.x[i] = unpack('>' + self.float_type, self.f.read(self.float_size))[0]
+    self.x = np.frombuffer(self.f.read(self.float_size*self.NPOIN), 
+      dtype=self.endian + self.float_type).astype(np.float64)
     garbage = unpack('>i', self.f.read(4))[0]
     
     # reads y 
-    self.y = np.zeros(self.NPOIN)
     garbage = unpack('>i', self.f.read(4))[0]
-    for i in range(self.NPOIN):
-      self.y[i] = unpack('>' + self.float_type, self.f.read(self.float_size))[0]
+    self.y = np.frombuffer(self.f.read(self.float_size*self.NPOIN), 
+      dtype=self.endian + self.float_type).astype(np.float64)
     garbage = unpack('>i', self.f.read(4))[0]
     
+    # the time records start right after the header
+    self.header_size = self.f.tell()
+    
+    if self.archive:
+      self._readArchiveIndex()
+      self.f.seek(self.header_size)
+    
+  # numpy dtype of a single variable record (i.e., 4 bytes, NPOIN floats, 
+  # then 4 bytes); used to read and write whole records at once
+  def _recordDtype(self):
+    return np.dtype([('head', '>i4'), 
+      ('vals', self.endian + self.float_type, (self.NPOIN,)), ('tail', '>i4')])
+    
   def writeHeader(self):
-    self.f = open(self.slf_file, 'wb')
+    # each record is written as one contiguous buffer, through a large
+    # buffered writer
+    self.f = open(self.slf_file, 'wb', buffering=4*1024*1024)
     
     # added on 2016.06.23 thanks to Yoann Audouin
     # before writing the variable names, make sure they are padded with spaces!
@@ -229,64 +777,105 @@ class ppSELAFIN:
       self.vunits[i] = '{:<16}'.format(self.vunits[i])
     
     # now we are ready to write the data
-    self.f.write(pack('>i', 80))
-    self.f.write(pack('>72s', self.title.encode()))
-    self.f.write(pack('>8s', self.precision.encode()))
-    self.f.write(pack('>i', 80))
+    self.f.write(pack('>i72s8si', 80, self.title.encode(), 
+      self.precision.encode(), 80))
     
-    self.f.write(pack('>i', 8))
-    self.f.write(pack('>i', self.NBV1))
-    self.f.write(pack('>i', self.NBV2))
-    self.f.write(pack('>i', 8))
+    self.f.write(pack('>4i', 8, self.NBV1, self.NBV2, 8))
     
     # writeHeader() must only be called after setVarUnits and setVarNames
     for i in range(self.NBV1):
-      self.f.write(pack('>i',32))
-      self.f.write(pack('>16s',self.vnames[i].encode()))
-      self.f.write(pack('>16s',self.vunits[i].encode()))
-      self.f.write(pack('>i',32))
+      self.f.write(pack('>i16s16si', 32, self.vnames[i].encode(), 
+        self.vunits[i].encode(), 32))
 
-    self.f.write(pack('>i', 40))
-    for i in range(len(self.IPARAM)):
-      self.f.write(pack('>i', self.IPARAM[i]))
-    self.f.write(pack('>i', 40))
+    self.f.write(pack('>i', 40) + 
+      np.asarray(self.IPARAM, dtype='>i4').tobytes() + pack('>i', 40))
     
     if (self.IPARAM[-1] == 1):
-      self.f.write(pack('>i', 24))
       # date is 6 integers stored as a list
-      for i in range(len(self.DATE)):
-        self.f.write(pack('>i', self.DATE[i]))
-      self.f.write(pack('>i', 24))
+      self.f.write(pack('>i', 24) + 
+        np.asarray(self.DATE, dtype='>i4').tobytes() + pack('>i', 24))
       
-    self.f.write(pack('>i', 16))
-    self.f.write(pack('>i', self.NELEM))
-    self.f.write(pack('>i', self.NPOIN))
-    self.f.write(pack('>i', self.NDP))
-    self.f.write(pack('>i', 1)) # NPLAN???
-    self.f.write(pack('>i', 16))
-    
-    self.f.write(pack('>i', 4*self.NELEM*self.NDP))
-    for i in range(self.NELEM):
-      for j in range(self.NDP):
-        self.f.write(pack('>i', self.IKLE[i,j]))
-    self.f.write(pack('>i', 4*self.NELEM*self.NDP))
-    
-    self.f.write(pack('>i', 4*self.NPOIN))
-    for i in range(len(self.IPOBO)):
-      self.f.write(pack('>i', self.IPOBO[i]))
-    self.f.write(pack('>i', 4*self.NPOIN))
+    self.f.write(pack('>6i', 16, self.NELEM, self.NPOIN, self.NDP, 1, 16)) # NPLAN???
+    
+    self.f.write(pack('>i', 4*self.NELEM*self.NDP) + 
+      np.asarray(self.IKLE)[0:self.NELEM,0:self.NDP].astype('>i4').tobytes() + 
+      pack('>i', 4*self.NELEM*self.NDP))
+    
+    self.f.write(pack('>i', 4*self.NPOIN) + 
+      np.asarray(self.IPOBO).astype('>i4').tobytes() + pack('>i', 4*self.NPOIN))
     
     # this is the garbage record that determines the float size
     # I have no idea why this works, but it does!!!
-    self.f.write(pack('>i', self.float_size*self.NPOIN))
-    for i in range(len(self.x)):
-      self.f.write(pack('>'+self.float_type, self.x[i]))
-    self.f.write(pack('>i', self.float_size*self.NPOIN))
+    ftype = self.endian + self.float_type
+    self.f.write(pack('>i', self.float_size*self.NPOIN) + 
+      np.asarray(self.x).astype(ftype).tobytes() + 
+      pack('>i', self.float_size*self.NPOIN))
 
-    self.f.write(pack('>i', self.float_size*self.NPOIN))
-    for i in range(len(self.y)):
-      self.f.write(pack('>'+self.float_type, self.y[i]))
-    self.f.write(pack('>i', self.float_size*self.NPOIN))
+    self.f.write(pack('>i', self.float_size*self.NPOIN) + 
+      np.asarray(self.y).astype(ftype).tobytes() + 
+      pack('>i', self.float_size*self.NPOIN))
+    
+  # opens an existing *.slf file so that new time steps can be added to 
+  # its end with writeVariables(); the header is read and checked. If this
+  # object was set up (with setVarNames() and setMesh()), the number of
+  # variables, the number of nodes and the precision of the file must match
+  # it. A partially written time step at the end of the file raises a
+  # ValueError, unless truncate is True, in which case it is dropped
+  def appendHeader(self, truncate=False):
+    # what this object expects to write, before the header replaces it
+    expected = None
+    if (self.NBV1 > 0 or self.NPOIN > 0):
+      expected = (self.NBV1, self.NPOIN, self.float_type, self.float_size,
+        self.getFrameSize())
+    
+    # readHeader() finds the precision of the file starting from single
+    self.float_type = 'f'
+    self.float_size = 4
+    self.readHeader()
+    
+    if self.archive:
+      print(self.slf_file + ' is an archive, and can not be appended to. Exiting!')
+      sys.exit()
+    
+    # the record that ends the header must match the precision and the
+    # number of nodes that were read
+    self.f.seek(self.header_size - 4)
+    garbage = unpack('>i', self.f.read(4))[0]
+    if (garbage != self.float_size * self.NPOIN):
+      print('Header of ' + self.slf_file + ' is not valid. Exiting!')
+      sys.exit()
+    
+    found = (self.NBV1, self.NPOIN, self.float_type, self.float_size,
+      self.getFrameSize())
+    if (expected is not None and found != expected):
+      raise ValueError(self.slf_file + ' has ' + str(found[0]) + 
+        ' variables, ' + str(found[1]) + ' nodes and float size ' + 
+        str(found[3]) + ', but ' + str(expected[0]) + ' variables, ' + 
+        str(expected[1]) + ' nodes and float size ' + str(expected[3]) + 
+        ' are to be appended')
+    
+    # the data after the header must be a whole number of time steps
+    file_size = os.path.getsize(self.slf_file)
+    numTimes, partial = divmod(file_size - self.header_size, 
+      self.getFrameSize())
+    if (partial != 0 and not truncate):
+      raise ValueError(self.slf_file + ' ends with a partial time step of ' +
+        str(partial) + ' bytes')
+    
+    self.readTimes()
+    
+    # keep only the time steps that are complete in the file
+    numTimes = min(numTimes, len(self.time))
+    
+    self.time = self.time[0:numTimes]
+    self.frame_offsets = self.frame_offsets[0:numTimes]
+    
+    # re-open the file for writing, and drop any partial time step
+    self.f.close()
+    self.f = open(self.slf_file, 'r+b', buffering=4*1024*1024)
+    end_pos = self.header_size + numTimes*self.getFrameSize()
+    self.f.truncate(end_pos)
+    self.f.seek(end_pos)
     
   def writeVariables(self,time,temp):
     # appends object's time 
@@ -296,27 +885,45 @@ class ppSELAFIN:
     self.temp = temp
     
     # write the time 
-    self.f.write(pack('>i', 4))
-    self.f.write(pack('>'+self.float_type, time))
-    self.f.write(pack('>i', 4))
+    self.f.write(pack('>i', 4) + pack('>'+self.float_type, time) + pack('>i', 4))
     
-    # writes the rest of the variables
-    for j in range(self.NBV1):
-      self.f.write(pack('>i', self.float_size*self.NPOIN))
-      for k in range(self.NPOIN):
-        self.f.write(pack('>'+self.float_type, self.temp[j,k]))
-      self.f.write(pack('>i', self.float_size*self.NPOIN))
+    # writes the rest of the variables as one buffer
+    recs = np.empty(self.NBV1, dtype=self._recordDtype())
+    recs['head'] = self.float_size*self.NPOIN
+    recs['vals'] = np.asarray(self.temp)[0:self.NBV1,0:self.NPOIN]
+    recs['tail'] = self.float_size*self.NPOIN
+    self.f.write(recs.tobytes())
     
   def readTimes(self):
+    # the times of an archive are in its index
+    if self.archive:
+      self.time = self.arch_times.tolist()
+      self.frame_offsets = self.arch_offsets[:,0].tolist()
+      return
+    
     pos_prior_to_time_reading = self.f.tell()
     
+    # a time step that is cut short at the end of the file (i.e., the run
+    # was stopped while writing it) is not listed, as its values are not
+    # all there
+    file_size = os.fstat(self.f.fileno()).st_size
+    frame_size = self.getFrameSize()
+    
     while True:
       try:
+        # position of the start of the time record
+        frame_pos = self.f.tell()
+        if (frame_pos + frame_size > file_size):
+          break
+        
         # get the times
         self.f.seek(4,1)
         self.time.append( unpack('>'+self.float_type, self.f.read(self.float_size))[0] )
         self.f.seek(4,1)
         
+        # store the offset, so that the frame can be read directly later
+        self.frame_offsets.append(frame_pos)
+        
         # skip through the variables
         self.f.seek(self.NBV1*(4+self.float_size*self.NPOIN+4), 1)
         
@@ -328,39 +935,96 @@ class ppSELAFIN:
       except:
         break
     self.f.seek(pos_prior_to_time_reading)
-    
-  def readVariables(self,t_des):
+  
+  # returns the size in bytes of a single time step (time record plus
+  # the records of all variables)
+  def getFrameSize(self):
+    return (4+self.float_size+4) + self.NBV1*(4+self.float_size*self.NPOIN+4)
+    
+  # returns the byte offset of time step t; the offsets recorded by 
+  # readTimes() are used, and if they are not there the offset is computed
+  # from the current position in the file (i.e., the end of the header)
+  def getFrameOffset(self,t):
+    if (self.archive and len(self.frame_offsets) == 0):
+      self.frame_offsets = self.arch_offsets[:,0].tolist()
+    if (len(self.frame_offsets) > 0):
+      if (t < len(self.frame_offsets)):
+        return self.frame_offsets[t]
+      else:
+        return None
+    return self.f.tell() + t*self.getFrameSize()
+    
+  # reads the variable records of the time step that starts at frame_pos
+  # from the open file fin; if var_indices is given, the records of the
+  # other variables are skipped. Returns None if the time step is not 
+  # complete in the file.
+  def _readFrame(self, fin, frame_pos, var_indices=None):
+    if (self.cache is not None):
+      vals = self._readCachedFrame(frame_pos)
+      if (vals is None or var_indices is None):
+        return vals
+      return vals[list(var_indices),:]
+    return self._readFrameFromFile(fin, frame_pos, var_indices)
+  
+  # reads the time step from the cache, by its byte offset
+  def _readCachedFrame(self, frame_pos):
+    if self.archive:
+      t = int(np.searchsorted(self.arch_offsets[:,0], frame_pos))
+    else:
+      t = (frame_pos - self.header_size) // self.getFrameSize()
+    return self.cache.getFrame(t)
+  
+  # reads the time step from the file (see _readFrame)
+  def _readFrameFromFile(self, fin, frame_pos, var_indices=None):
+    if self.archive:
+      return self._readArchiveFrame(fin, frame_pos, var_indices)
+    
+    rec_dtype = self._recordDtype()
+    
+    # position of the first variable record (i.e., after the time record)
+    vars_pos = frame_pos + 4 + self.float_size + 4
+    
+    if (var_indices is None):
+      fin.seek(vars_pos)
+      buf = fin.read(self.NBV1 * rec_dtype.itemsize)
+      if (len(buf) < self.NBV1 * rec_dtype.itemsize):
+        return None
+      return np.frombuffer(buf, dtype=rec_dtype)['vals'].astype(np.float64)
+    
+    vals = np.zeros((len(var_indices), self.NPOIN))
+    for i in range(len(var_indices)):
+      fin.seek(vars_pos + var_indices[i]*rec_dtype.itemsize)
+      buf = fin.read(rec_dtype.itemsize)
+      if (len(buf) < rec_dtype.itemsize):
+        return None
+      vals[i,:] = np.frombuffer(buf, dtype=rec_dtype)['vals'][0]
+    return vals
+    
+  # reads the variables at time step index t_des; if var_indices is a list
+  # of variable indices, only those variables are read, and the values
+  # have one row for each index in var_indices
+  def readVariables(self,t_des,var_indices=None):
     # print('Desired time: ' + str(t_des) + '\n')
     pos_prior_to_var_reading = self.f.tell()
     
     # reads data for all variables in the *.slf file at desired time t_des
-    self.temp = np.zeros((self.NBV1,self.NPOIN))
+    if (var_indices is None):
+      self.temp = np.zeros((self.NBV1,self.NPOIN))
+    else:
+      self.temp = np.zeros((len(var_indices),self.NPOIN))
     
-    # it reads the time again, but this it is not used
-    time2 = []
+    # t_des has to be a valid time step index; otherwise nothing is read
+    if (t_des < 0 or t_des != int(t_des)):
+      return
     
-    # time index
-    t = -1
+    frame_pos = self.getFrameOffset(int(t_des))
+    if (frame_pos is None):
+      return
     
-    while True:
-      try:
-        self.f.seek(4,1)
-        time2.append( unpack('>'+self.float_type, self.f.read(self.float_size))[0] )
-        self.f.seek(4,1)
-        
-        t = t + 1
-        
-        if (t == t_des):
-          # print('slf time: ' + str(t))
-          for i in range(self.NBV1):
-            self.f.seek(4,1)
-            for j in range(self.NPOIN):
-              self.temp[i,j] = unpack('>'+self.float_type, self.f.read(self.float_size))[0]
-            self.f.seek(4,1)
-        else:
-          self.f.seek(self.NBV1*(4+self.float_size*self.NPOIN+4), 1)
-      except:
-        break
+    # jump straight to the desired time step
+    vals = self._readFrame(self.f, frame_pos, var_indices)
+    if (vals is not None):
+      self.temp = vals
         
     # need to re-set in case another variable needs to be read!
     self.f.seek(pos_prior_to_var_reading)    
@@ -375,34 +1039,672 @@ class ppSELAFIN:
     # reads data for all variables in the *.slf file at desired time t_des
     self.tempAtNode = np.zeros((numTimes, self.NBV1))
     
-    # it reads the time again, but this it is not used
-    time2 = []
+    # the series at the node is contiguous in the time major companion
+    # file, which makes it a single read for each variable
+    if self._transposedIsCheaper(1):
+      numT = self.tvalues.shape[2]
+      self.tempAtNode[0:numT,:] = np.transpose(self.tvalues[:,node,:])
+      return
+    
+    # the records of an archive are compressed, so each time step is read
+    if self.archive:
+      for t in range(min(numTimes, len(self.frame_offsets))):
+        self.tempAtNode[t,:] = self._readFrame(self.f, 
+          self.frame_offsets[t])[:,node]
+      self.f.seek(pos_prior_to_var_reading)
+      return
+    
+    # size of a single variable record
+    rec_size = 4 + self.float_size*self.NPOIN + 4
+    
+    # the offset of each time step is known, so seek directly to the node
+    for t in range(min(numTimes, len(self.frame_offsets))):
+      for i in range(self.NBV1):
+        self.f.seek(self.frame_offsets[t] + 4 + self.float_size + 4 + 
+          i*rec_size + 4 + node*self.float_size)
+        val = self.f.read(self.float_size)
+        if (len(val) < self.float_size):
+          break
+        self.tempAtNode[t,i] = unpack('>'+self.float_type, val)[0]
+        
+    # need to re-set in case another variable needs to be read!
+    self.f.seek(pos_prior_to_var_reading)  
     
-    # time index
-    t = -1
+  # extracts the values of all variables at a number of nodes, for all 
+  # time steps, in a single sequential pass through the file; the result
+  # has the shape (time, variable, node)
+  def readVariablesAtNodes(self,nodes):
     
-    while True:
+    nodes = np.asarray(nodes, dtype=np.int64)
+    numTimes = min(len(self.time), len(self.frame_offsets))
+    
+    pos_prior_to_var_reading = self.f.tell()
+    
+    self.tempAtNodes = np.zeros((len(self.time), self.NBV1, len(nodes)))
+    
+    # use the time major companion file if reading it costs less
+    if self._transposedIsCheaper(len(nodes)):
+      numT = self.tvalues.shape[2]
+      self.tempAtNodes[0:numT,:,:] = np.transpose(self.tvalues[:,nodes,:], 
+        (2,0,1))
+      return
+    
+    if self.archive:
+      for t in range(numTimes):
+        self.tempAtNodes[t,:,:] = self._readFrame(self.f, 
+          self.frame_offsets[t])[:,nodes]
+      self.f.seek(pos_prior_to_var_reading)
+      return
+    
+    rec_dtype = self._recordDtype()
+    
+    for t in range(numTimes):
+      self.f.seek(self.frame_offsets[t] + 4 + self.float_size + 4)
+      buf = self.f.read(self.NBV1 * rec_dtype.itemsize)
+      if (len(buf) < self.NBV1 * rec_dtype.itemsize):
+        break
+      self.tempAtNodes[t,:,:] = np.frombuffer(buf, dtype=rec_dtype)['vals'][:,nodes]
+    
+    # need to re-set in case another variable needs to be read!
+    self.f.seek(pos_prior_to_var_reading)  
+    
+  # writes the time major companion file (*.slft) next to the *.slf file;
+  # it holds the values of all complete time steps as an array with the
+  # shape (variable, node, time) in *.npy format, so that the series of a 
+  # variable at a node is contiguous. The *.slf file is read once, a block
+  # of time steps at a time; max_mem limits the size of the block in bytes.
+  def writeTransposed(self, max_mem=256*1024*1024):
+    values = self.memmapVariables()
+    numTimes = values.shape[0]
+    
+    frame_bytes = max(self.NBV1 * self.NPOIN * self.float_size, 1)
+    block = max(1, int(max_mem // frame_bytes))
+    
+    # written to a temporary file first, so that a partially written file
+    # is never taken as valid
+    tmp_file = self.t_file + '.tmp'
+    tvalues = np.lib.format.open_memmap(tmp_file, mode='w+', 
+      dtype=self.endian + self.float_type, 
+      shape=(self.NBV1, self.NPOIN, numTimes))
+    
+    for t0 in range(0, numTimes, block):
+      t1 = min(t0 + block, numTimes)
+      tvalues[:,:,t0:t1] = np.transpose(values[t0:t1], (1,2,0))
+    
+    tvalues.flush()
+    del tvalues
+    
+    if os.path.isfile(self.t_file):
+      os.remove(self.t_file)
+    os.rename(tmp_file, self.t_file)
+    
+    self.tvalues = None
+    self.t_checked = False
+    
+  # opens the time major companion file as a memory mapped array; returns 
+  # False if there is no companion file, or if it does not match the *.slf
+  # file (i.e., it is older than the *.slf file, or the precision, number 
+  # of variables, nodes or complete time steps are different)
+  def readTransposed(self):
+    self.tvalues = None
+    self.t_checked = True
+    
+    if (self.archive or not os.path.isfile(self.t_file)):
+      return False
+    
+    if (os.path.getmtime(self.t_file) < os.path.getmtime(self.slf_file)):
+      return False
+    
+    file_size = os.path.getsize(self.slf_file)
+    numTimes = (file_size - self.header_size) // self.getFrameSize()
+    
+    try:
+      tvalues = np.load(self.t_file, mmap_mode='r')
+    except:
+      return False
+    
+    if (tvalues.shape != (self.NBV1, self.NPOIN, numTimes) or 
+      tvalues.dtype != np.dtype(self.endian + self.float_type)):
+      return False
+    
+    self.tvalues = tvalues
+    return True
+    
+  # True if the series at num_nodes nodes (for all time steps) are cheaper
+  # to read from the time major companion file than from the *.slf file; 
+  # the cost is the number of bytes read plus a fixed cost for each seek.
+  # The companion file is opened the first time this is called.
+  def _transposedIsCheaper(self, num_nodes):
+    if (self.tvalues is None and not self.t_checked):
+      self.readTransposed()
+    
+    if (self.tvalues is None):
+      return False
+    
+    numTimes = min(len(self.time), len(self.frame_offsets))
+    if (numTimes == 0 or numTimes != self.tvalues.shape[2]):
+      return False
+    
+    seek_cost = 256*1024
+    
+    # frame major: every time step is read, for every variable
+    frame_cost = numTimes * (seek_cost + 
+      self.NBV1 * self.NPOIN * self.float_size)
+    
+    # time major: one contiguous series for each variable and node
+    time_cost = self.NBV1 * num_nodes * (seek_cost + 
+      numTimes * self.float_size)
+    
+    return time_cost < frame_cost
+    
+  # keeps only the elements given in elems (zero based indices), and
+  # returns the mesh of that subset with its nodes renumbered compactly;
+  # node_idx holds the index of each kept node in this file, and is used
+  # to gather the results of the subset (i.e., values[:,node_idx]). The 
+  # returned IKLE is one based. IPOBO of the subset has to be rebuilt by 
+  # the caller (see getBoundaryNodes in utilities.py).
+  def getSubMesh(self,elems):
+    sub_IKLE = self.IKLE[elems,:] - 1
+    
+    # the nodes that are used by the kept elements, in their original order
+    node_idx = np.unique(sub_IKLE)
+    
+    # new number of each node of the original mesh
+    renum = np.zeros(self.NPOIN, dtype=np.int32)
+    renum[node_idx] = np.arange(len(node_idx), dtype=np.int32)
+    
+    sub_IKLE = renum[sub_IKLE] + 1
+    
+    return len(sub_IKLE), len(node_idx), self.NDP, sub_IKLE, node_idx
+    
+  # maps the time records of the file into memory, and returns a view of
+  # the variables with shape (time, variable, node); the record markers
+  # are skipped by the strides of the view, so nothing is copied until
+  # the view is sliced (i.e., values[t,v] or values[:,v,node])
+  def memmapVariables(self):
+    
+    # archives can not be memory mapped; the values are decompressed as
+    # they are indexed instead
+    if self.archive:
+      self.values = _ArchiveValues(self)
+      return self.values
+    
+    rec_dtype = self._recordDtype()
+    
+    # each time step is the time record followed by NBV1 variable records
+    frame_dtype = np.dtype([('head', '>i4'), 
+      ('time', self.endian + self.float_type), ('tail', '>i4'),
+      ('vars', rec_dtype, (self.NBV1,))])
+    
+    # only the complete time steps are mapped
+    file_size = os.path.getsize(self.slf_file)
+    numTimes = (file_size - self.header_size) // frame_dtype.itemsize
+    
+    if (numTimes < 1):
+      self.values = np.zeros((0, self.NBV1, self.NPOIN))
+      return self.values
+    
+    frames = np.memmap(self.slf_file, dtype=frame_dtype, mode='r', 
+      offset=self.header_size, shape=(numTimes,))
+    
+    self.values = frames['vars']['vals']
+    
+    return self.values
+    
+  # generator that yields (t, time, values) for time step indices in 
+  # range(start, stop, step); a background thread reads the next prefetch 
+  # time steps while the caller works on the current one. If vars is a 
+  # list of variable indices, values only has those rows (in that order). 
+  # Must be called after readTimes().
+  def iterFrames(self, start=0, stop=None, step=1, vars=None, prefetch=4):
+    if (stop is None):
+      stop = len(self.frame_offsets)
+    stop = min(stop, len(self.frame_offsets))
+    
+    frames = queue.Queue(maxsize=max(prefetch, 1))
+    done = threading.Event()
+    
+    # puts an item on the queue, unless the caller stopped iterating
+    def put(item):
+      while not done.is_set():
+        try:
+          frames.put(item, timeout=0.1)
+          return True
+        except queue.Full:
+          pass
+      return False
+    
+    # the reader uses its own file handle, so self.f is left alone
+    def reader():
       try:
-        self.f.seek(4,1)
-        time2.append( unpack('>'+self.float_type, self.f.read(self.float_size))[0] )
-        self.f.seek(4,1)
+        fin = open(self.slf_file, 'rb')
+        for t in range(start, stop, step):
+          vals = self._readFrame(fin, self.frame_offsets[t], vars)
+          if (vals is None):
+            break
+          if not put((t, self.time[t], vals)):
+            break
+        fin.close()
+      except Exception as e:
+        put(e)
+      put(None)
+    
+    th = threading.Thread(target=reader)
+    th.daemon = True
+    th.start()
+    
+    try:
+      while True:
+        item = frames.get()
+        if (item is None):
+          break
+        if isinstance(item, Exception):
+          raise item
+        yield item
+    finally:
+      done.set()
+      th.join()
+      
+  # generator for *.slf files that are still being written by a running 
+  # simulation; it yields (t, time, values) for every complete time step 
+  # starting at index start, and then waits for new time steps to be 
+  # written, checking the size of the file every poll seconds. A partially
+  # written time step at the end of the file is not read until it is 
+  # complete. The generator stops if no new time step is written for 
+  # timeout seconds (if timeout is None, it waits forever).
+  def followFrames(self, start=0, vars=None, poll=5.0, timeout=None):
+    frame_size = self.getFrameSize()
+    t = start
+    last_new = pytime.time()
+    
+    while True:
+      file_size = os.fstat(self.f.fileno()).st_size
+      
+      # read all time steps that are complete in the file
+      while (self.header_size + (t+1)*frame_size <= file_size):
+        frame_pos = self.header_size + t*frame_size
         
-        # this is the time step index
-        t = t + 1
+        self.f.seek(frame_pos + 4)
+        time = unpack('>'+self.float_type, self.f.read(self.float_size))[0]
+        # the file is still being written, so the time step is read from
+        # the file itself, not from the frame cache
+        vals = self._readFrameFromFile(self.f, frame_pos, vars)
         
-        for i in range(self.NBV1):
-          self.f.seek(4,1)
-          
-          self.f.seek( (node)*self.float_size, 1)
-          self.tempAtNode[t,i] = unpack('>'+self.float_type, self.f.read(self.float_size))[0]
-          self.f.seek ((self.NPOIN - node -1)*self.float_size , 1)
-              
-          self.f.seek(4,1)
-      except:
+        # keep track of the times and offsets of the new time steps
+        if (t == len(self.time)):
+          self.time.append(time)
+          self.frame_offsets.append(frame_pos)
+        
+        yield t, time, vals
+        t = t + 1
+        last_new = pytime.time()
+      
+      if (timeout is not None and pytime.time() - last_new > timeout):
         break
+      pytime.sleep(poll)
+    
+    self.f.seek(self.header_size)
+  
+  # generator that yields (time, values) at each of the new_times, found
+  # by linear interpolation between the two time steps of the file that
+  # bracket it; new_times must be increasing, and within the first and 
+  # last times of the file (a ValueError is raised otherwise, or if the
+  # file has no time steps). The file is read forward once, and only the
+  # two bracketing time steps are held in memory.
+  def resampleFrames(self, new_times, vars=None):
+    pos_prior_to_var_reading = self.f.tell()
+    numTimes = min(len(self.time), len(self.frame_offsets))
+    
+    if (numTimes == 0):
+      raise ValueError('No time steps to resample in ' + self.slf_file)
+    
+    new_times = np.asarray(new_times, dtype=np.float64)
+    if (len(new_times) > 0 and (np.min(new_times) < self.time[0] or 
+      np.max(new_times) > self.time[numTimes-1])):
+      raise ValueError('New times must be within the times of ' + 
+        self.slf_file + ' (' + str(self.time[0]) + ' to ' + 
+        str(self.time[numTimes-1]) + ')')
+    
+    # index of the time steps that are held (t0 <= new time <= t1)
+    i0 = -1
+    i1 = -1
+    vals0 = None
+    vals1 = None
+    
+    for time in new_times:
+      # nothing to interpolate between if there is a single time step
+      if (numTimes == 1):
+        yield time, self._readFrame(self.f, self.frame_offsets[0], vars)
+        continue
+      
+      # last time step with time <= the new time
+      t = np.searchsorted(self.time[0:numTimes], time, side='right') - 1
+      t = max(0, min(t, numTimes-2))
+      
+      if (t != i0):
+        if (t == i1):
+          vals0 = vals1
+        else:
+          vals0 = self._readFrame(self.f, self.frame_offsets[t], vars)
+        i0 = t
+        vals1 = self._readFrame(self.f, self.frame_offsets[t+1], vars)
+        i1 = t+1
+      
+      # weight of the later time step
+      w = (time - self.time[i0]) / (self.time[i1] - self.time[i0])
+      w = max(0.0, min(w, 1.0))
+      
+      yield time, (1.0 - w)*vals0 + w*vals1
+    
+    self.f.seek(pos_prior_to_var_reading)
+  
+  # generator that yields (time, values) with the average of the time 
+  # steps in consecutive blocks of window seconds, starting at time t0;
+  # the time of each block is the mean of the times of its time steps, and
+  # empty blocks are skipped. Only the running sum and the time step being 
+  # read are held in memory.
+  def averageFrames(self, window, t0=None, t1=None, vars=None):
+    pos_prior_to_var_reading = self.f.tell()
+    numTimes = min(len(self.time), len(self.frame_offsets))
+    
+    if (t0 is None):
+      t0 = self.time[0]
+    if (t1 is None):
+      t1 = self.time[numTimes-1]
+    
+    block = -1
+    count = 0
+    vsum = None
+    tsum = 0.0
+    
+    for t in range(numTimes):
+      if (self.time[t] < t0 or self.time[t] > t1):
+        continue
+      
+      # the block that this time step belongs to
+      b = int(np.floor((self.time[t] - t0) / window))
+      if (b != block and count > 0):
+        yield tsum / count, vsum / count
+        count = 0
+      block = b
+      
+      vals = self._readFrame(self.f, self.frame_offsets[t], vars)
+      if (count == 0):
+        vsum = vals
+        tsum = 0.0
+      else:
+        vsum += vals
+      tsum += self.time[t]
+      count += 1
+    
+    if (count > 0):
+      yield tsum / count, vsum / count
+    
+    self.f.seek(pos_prior_to_var_reading)
+    
+  # writes the time steps of this file (which must have been read with 
+  # readHeader and readTimes) to a compressed archive. The record of each 
+  # variable at each time step is compressed on its own (with zlib or lzma
+  # at the given level), so that any time step or variable can be read 
+  # without the others. If tolerance > 0, the values are rounded to a 
+  # multiple of 2*tolerance (i.e., the error is at most tolerance) before
+  # they are compressed; records with values that are not finite are kept
+  # as they are. The archive holds the header of this file as it is, the 
+  # compressed records, and an index of the records at the end.
+  def writeArchive(self, archive_file, compression='zlib', level=6, 
+    tolerance=0.0):
+    if (compression == 'lzma' and lzma is None):
+      print('lzma compression needs Python 3. Exiting!')
+      sys.exit()
+    
+    numTimes = min(len(self.time), len(self.frame_offsets))
+    step = 2.0*tolerance
+    
+    offsets = np.zeros((numTimes, self.NBV1), dtype=np.int64)
+    lengths = np.zeros((numTimes, self.NBV1), dtype=np.int64)
+    kinds = np.zeros((numTimes, self.NBV1), dtype=np.int8)
+    
+    fout = open(archive_file, 'wb', buffering=4*1024*1024)
+    
+    # magic string, then the header of this file as it is
+    self.f.seek(self.hdr_start)
+    header = self.f.read(self.header_size - self.hdr_start)
+    self.f.seek(self.header_size)
+    fout.write(ARCHIVE_MAGIC + header)
+    pos = len(ARCHIVE_MAGIC) + len(header)
+    
+    for t, time, vals in self.iterFrames(0, numTimes):
+      for i in range(self.NBV1):
+        buf, kinds[t,i] = self._encodeRecord(vals[i,:], step)
+        buf = self._compress(buf, compression, level)
+        fout.write(buf)
+        offsets[t,i] = pos
+        lengths[t,i] = len(buf)
+        pos = pos + len(buf)
+    
+    # the index goes at the end, followed by its offset and the magic string
+    idx = io.BytesIO()
+    np.savez(idx, times=np.array(self.time[0:numTimes], dtype=np.float64),
+      offsets=offsets, lengths=lengths, kinds=kinds, step=step,
+      compression=compression, NBV1=self.NBV1, NPOIN=self.NPOIN,
+      float_size=self.float_size)
+    fout.write(idx.getvalue())
+    fout.write(pack('>q', pos) + ARCHIVE_MAGIC)
+    fout.close()
+    
+  # writes the time steps of this archive (which must have been read with
+  # readHeader and readTimes) back to a *.slf file; the header is the same
+  # as the one of the original *.slf file
+  def extractArchive(self, slf_file):
+    out = ppSELAFIN(slf_file)
+    out.setPrecision(self.float_type, self.float_size)
+    out.setVarNames(self.vnames)
+    out.setMesh(self.NELEM, self.NPOIN, self.NDP, self.IKLE, self.IPOBO,
+      self.x, self.y)
+    
+    self.f.seek(self.hdr_start)
+    header = self.f.read(self.header_size - self.hdr_start)
+    self.f.seek(self.header_size)
+    
+    out.f = open(slf_file, 'wb', buffering=4*1024*1024)
+    out.f.write(header)
+    
+    for t, time, vals in self.iterFrames():
+      out.writeVariables(time, vals)
+    out.close()
+  
+  # reads the index at the end of an archive
+  def _readArchiveIndex(self):
+    self.f.seek(-16, 2)
+    idx_pos = unpack('>q', self.f.read(8))[0]
+    if (self.f.read(8) != ARCHIVE_MAGIC):
+      print('Index of archive ' + self.slf_file + ' is not valid. Exiting!')
+      sys.exit()
+    
+    self.f.seek(idx_pos)
+    idx = np.load(io.BytesIO(self.f.read()[0:-16]))
+    self.arch_times = idx['times']
+    self.arch_offsets = idx['offsets']
+    self.arch_lengths = idx['lengths']
+    self.arch_kinds = idx['kinds']
+    self.arch_step = float(idx['step'])
+    self.arch_compression = str(idx['compression'])
+    
+  # reads and decompresses the records of the archive time step whose 
+  # first record starts at frame_pos; see _readFrame
+  def _readArchiveFrame(self, fin, frame_pos, var_indices=None):
+    t = int(np.searchsorted(self.arch_offsets[:,0], frame_pos))
+    if (t >= len(self.arch_offsets) or self.arch_offsets[t,0] != frame_pos):
+      return None
+    
+    if (var_indices is None):
+      var_indices = range(self.NBV1)
+    
+    vals = np.zeros((len(var_indices), self.NPOIN))
+    for j, i in enumerate(var_indices):
+      fin.seek(self.arch_offsets[t,i])
+      buf = fin.read(self.arch_lengths[t,i])
+      if (len(buf) < self.arch_lengths[t,i]):
+        return None
+      buf = self._decompress(buf, self.arch_compression)
+      vals[j,:] = self._decodeRecord(buf, self.arch_kinds[t,i])
+    return vals
+  
+  # encodes the values of one variable at one time step; returns the bytes
+  # and the kind of encoding (0 = floats of the precision of the file, 
+  # 1 = differences between successive values rounded to multiples of 
+  # step). The bytes of each value are shuffled (i.e., all first bytes, 
+  # then all second bytes, etc.), which makes them compress much better.
+  def _encodeRecord(self, vals, step):
+    kind = 0
+    if (step > 0 and np.all(np.isfinite(vals))):
+      q = np.round(vals / step)
+      if (np.max(np.abs(q)) < 2.0**52):
+        kind = 1
+        q = q.astype(np.int64)
+        arr = np.diff(q, prepend=0).astype('>i8')
+    if (kind == 0):
+      arr = vals.astype(self.endian + self.float_type)
+    
+    b = np.frombuffer(arr.tobytes(), dtype=np.uint8)
+    return b.reshape(len(vals), arr.itemsize).T.tobytes(), kind
+  
+  # decodes the values of a record encoded by _encodeRecord
+  def _decodeRecord(self, buf, kind):
+    if (kind == 1):
+      dtype = np.dtype('>i8')
+    else:
+      dtype = np.dtype(self.endian + self.float_type)
+    
+    b = np.frombuffer(buf, dtype=np.uint8).reshape(dtype.itemsize, self.NPOIN)
+    arr = np.frombuffer(b.T.tobytes(), dtype=dtype)
+    
+    if (kind == 1):
+      return np.cumsum(arr.astype(np.int64)) * self.arch_step
+    return arr.astype(np.float64)
+  
+  def _compress(self, buf, compression, level):
+    if (compression == 'lzma'):
+      return lzma.compress(buf, preset=level)
+    return zlib.compress(buf, level)
+  
+  def _decompress(self, buf, compression):
+    if (compression == 'lzma'):
+      return lzma.decompress(buf)
+    return zlib.decompress(buf)
+    
+  # writes the sidecar index file (*.slfidx) next to the *.slf file; the
+  # index stores the size and modification time of the *.slf file, a 
+  # summary of the header, the times, the byte offset of each time step, 
+  # the min, max and mean of each variable for each time step, and the 
+  # statistics of each variable over all time steps (see below)
+  def writeIndex(self):
+    if (len(self.time) == 0):
+      self.readTimes()
+    
+    numTimes = min(len(self.time), len(self.frame_offsets))
+    self.stats = np.zeros((numTimes, self.NBV1, 3))
+    
+    # statistics over all time steps, for the finite values only; the 
+    # std is computed by combining the mean and sum of squared deviations
+    # of each time step with those of the previous time steps
+    gmin = np.full(self.NBV1, np.inf)
+    gmax = np.full(self.NBV1, -np.inf)
+    gcount = np.zeros(self.NBV1)
+    gmean = np.zeros(self.NBV1)
+    gm2 = np.zeros(self.NBV1)
+    self.nonfinite = np.zeros(self.NBV1, dtype=np.int64)
+    
+    # percentiles are estimated from a fixed size random sample (reservoir)
+    # of the finite values of each variable
+    rng = np.random.RandomState(0)
+    sketch = np.zeros((self.NBV1, self.sketch_size))
+    
+    for t, time, vals in self.iterFrames(0, numTimes):
+      self.stats[t,:,0] = np.min(vals, axis=1)
+      self.stats[t,:,1] = np.max(vals, axis=1)
+      self.stats[t,:,2] = np.mean(vals, axis=1)
+      
+      for i in range(self.NBV1):
+        v = vals[i, np.isfinite(vals[i,:])]
+        self.nonfinite[i] += self.NPOIN - len(v)
+        if (len(v) == 0):
+          continue
         
-    # need to re-set in case another variable needs to be read!
-    self.f.seek(pos_prior_to_var_reading)  
+        gmin[i] = min(gmin[i], np.min(v))
+        gmax[i] = max(gmax[i], np.max(v))
+        
+        n_old = gcount[i]
+        n_new = float(len(v))
+        mean_new = np.mean(v)
+        delta = mean_new - gmean[i]
+        gcount[i] = n_old + n_new
+        gmean[i] = gmean[i] + delta * n_new / gcount[i]
+        gm2[i] = gm2[i] + np.sum((v - mean_new)**2) + \
+          delta*delta * n_old * n_new / gcount[i]
+        
+        # reservoir sampling; the first sketch_size values fill the 
+        # sample, after which value k (counted over all time steps) 
+        # replaces a random one with probability sketch_size/(k+1)
+        k = n_old + np.arange(len(v))
+        slot = np.floor(rng.random_sample(len(v)) * (k+1)).astype(np.int64)
+        slot = np.where(k < self.sketch_size, k, slot).astype(np.int64)
+        keep = slot < self.sketch_size
+        sketch[i, slot[keep]] = v[keep]
+    
+    # global statistics are min, max, mean and std of each variable
+    self.gstats = np.zeros((self.NBV1, 4))
+    self.percentiles = np.zeros((self.NBV1, len(self.pct_levels)))
+    for i in range(self.NBV1):
+      if (gcount[i] > 0):
+        self.gstats[i,:] = [gmin[i], gmax[i], gmean[i], 
+          np.sqrt(gm2[i] / gcount[i])]
+        nsk = int(min(gcount[i], self.sketch_size))
+        self.percentiles[i,:] = np.percentile(sketch[i,0:nsk], self.pct_levels)
+      else:
+        self.gstats[i,:] = np.nan
+        self.percentiles[i,:] = np.nan
+    
+    st = os.stat(self.slf_file)
+    with open(self.idx_file, 'wb') as fidx:
+      np.savez(fidx, file_size=st.st_size, mtime=st.st_mtime, 
+        NELEM=self.NELEM, NPOIN=self.NPOIN, NBV1=self.NBV1, 
+        float_size=self.float_size, vnames=np.array(self.vnames),
+        times=np.array(self.time[0:numTimes], dtype=np.float64),
+        offsets=np.array(self.frame_offsets[0:numTimes], dtype=np.int64),
+        stats=self.stats, gstats=self.gstats, 
+        pct_levels=np.array(self.pct_levels, dtype=np.float64),
+        percentiles=self.percentiles, nonfinite=self.nonfinite)
+        
+  # reads the sidecar index file, if there is one; this method must be 
+  # called after readHeader(), and replaces readTimes(). It returns False 
+  # (and reads nothing) if the index is missing, or if it does not match 
+  # the size, modification time or header of the *.slf file
+  def readIndex(self):
+    if not os.path.isfile(self.idx_file):
+      return False
+      
+    st = os.stat(self.slf_file)
+    try:
+      idx = np.load(self.idx_file)
+      if (int(idx['file_size']) != st.st_size or 
+        float(idx['mtime']) != st.st_mtime or
+        int(idx['NELEM']) != self.NELEM or int(idx['NPOIN']) != self.NPOIN or
+        int(idx['NBV1']) != self.NBV1 or 
+        int(idx['float_size']) != self.float_size):
+        return False
+      
+      self.time = idx['times'].tolist()
+      self.frame_offsets = idx['offsets'].tolist()
+      self.stats = idx['stats']
+      self.gstats = idx['gstats']
+      self.pct_levels = idx['pct_levels'].tolist()
+      self.percentiles = idx['percentiles']
+      self.nonfinite = idx['nonfinite']
+    except:
+      return False
+      
+    return True
     
   # get methods start here
   def getPrecision(self):
@@ -441,6 +1743,15 @@ class ppSELAFIN:
   def getVarValuesAtNode(self):
     return self.tempAtNode
 
+  def getVarValuesAtNodes(self):
+    return self.tempAtNodes
+
+  def getVarStats(self):
+    return self.stats
+
+  def getVarGlobalStats(self):
+    return self.gstats, self.pct_levels, self.percentiles, self.nonfinite
+
   def getIPOBO(self):
     return self.IPOBO
 
@@ -487,5 +1798,21 @@ class ppSELAFIN:
     self.x = x
     self.y = y
     
+  # reads the time steps through the shared frame cache (see ppFrameCache);
+  # if nslots is not given, the cache holds as many time steps as fit in
+  # max_bytes
+  def useFrameCache(self, nslots=None, max_bytes=256*1024*1024):
+    self.cache = ppFrameCache(self, nslots, max_bytes)
+    
+  # uses the shared frame cache if the environment variable 
+  # PPUTILS_FRAME_CACHE is set (to the number of time steps to cache); for
+  # scripts that only read a finished *.slf file
+  def useFrameCacheFromEnv(self):
+    if (os.environ.get('PPUTILS_FRAME_CACHE', '') != ''):
+      self.useFrameCache(int(os.environ['PPUTILS_FRAME_CACHE']))
+    
   def close(self):
+    if (self.cache is not None):
+      self.cache.close()
+      self.cache = None
     self.f.close()
@@ -1,7 +1,5 @@
 import os,sys     
 import numpy as np
-import struct     
-import subprocess
 from collections import OrderedDict
 from scipy import spatial
 from ppmodules.readMesh import *
@@ -447,119 +445,381 @@ def idwm(elev,x,y):
 def CCW(x1,y1,x2,y2,x3,y3):
    return (y3-y1)*(x2-x1) > (y2-y1)*(x3-x1)
 
-# this method takes in an adcirc file, and returns the IPOBO and IKLE arrays
-# and also generates temp.cli file for use in Telemac
-# this version uses the output from bnd_extr_stbtel.f90 Fortran program
+# this method finds the boundary nodes of a mesh, and returns them in the
+# same order as the bnd_extr_stbtel.f90 Fortran program (which follows
+# ranbo.f from stbtel); the ikle array is zero based, and must have its 
+# elements oriented in CCW fashion. The returned nbor array is zero based. 
+# The outer boundary is traversed CCW, and the islands CW.
+def getBoundaryNodes(x,y,ikle):
+  
+  # the edges of each element (1-2, 2-3, 3-1), element by element
+  edges = ikle[:,[0,1,1,2,2,0]].reshape(-1,2).astype(np.int64)
+  
+  # an edge is on the boundary if it belongs to only one element
+  lo = np.minimum(edges[:,0], edges[:,1])
+  hi = np.maximum(edges[:,0], edges[:,1])
+  keys = lo * (int(np.max(ikle)) + 1) + hi
+  unique_keys, inverse, counts = np.unique(keys, return_inverse=True,
+    return_counts=True)
+  bnd = edges[counts[inverse.ravel()] == 1]
+  
+  nptfr = len(bnd)
+  if (nptfr == 0):
+    return np.zeros(0, dtype=np.int64)
+  
+  # the first boundary edge is the one whose first node has the smallest
+  # x+y (the one with the smallest y if there are ties); the loops below
+  # work on python lists, which is much faster than on numpy scalars
+  som = (x[bnd[:,0]] + y[bnd[:,0]]).tolist()
+  yb = y[bnd[:,0]].tolist()
+  som2 = float(x[0] + y[0])
+  y2 = float(y[0])
+  first = 0
+  for i in range(nptfr):
+    if (abs(som[i] - som2) <= abs(1.0E-6 * som[i])):
+      if (yb[i] <= y2):
+        y2 = yb[i]
+        som2 = som[i]
+        first = i
+    elif (som[i] <= som2):
+      y2 = yb[i]
+      som2 = som[i]
+      first = i
+  
+  # at[i] is the edge at position i in the boundary; pos is its inverse
+  at = list(range(nptfr))
+  at[0] = first
+  at[first] = 0
+  pos = list(at)
+  
+  # boundary edges sorted by their first node; the edges that can follow
+  # edge c are order[lft[c]:rgt[c]] (the ones that start at its end node)
+  order = np.argsort(bnd[:,0], kind='stable')
+  starts = bnd[order,0]
+  lft = np.searchsorted(starts, bnd[:,1], side='left').tolist()
+  rgt = np.searchsorted(starts, bnd[:,1], side='right').tolist()
+  order = order.tolist()
+  
+  # chain the edges; when a loop closes, the next island starts with the
+  # edge that is at that position
+  for i in range(1, nptfr):
+    c = at[i-1]
+    nxt = -1
+    for k in range(lft[c], rgt[c]):
+      d = order[k]
+      if (pos[d] >= i and (nxt < 0 or pos[d] < pos[nxt])):
+        nxt = d
+        
+    if (nxt >= 0 and pos[nxt] != i):
+      j = pos[nxt]
+      at[j] = at[i]
+      pos[at[j]] = j
+      at[i] = nxt
+      pos[nxt] = i
+  
+  return bnd[at,0]
+
+# this method finds the pinch nodes of a mesh (nodes where two groups of
+# elements meet only at the node, i.e., a bow tie), which getBoundaryNodes
+# can not follow. At each pinch node the largest group of elements (fan) 
+# is kept, and the other groups are removed; this is repeated until there
+# are no pinch nodes left. The ikle array is zero based. Returns a boolean
+# array with True for the elements that are kept, and the pinch nodes.
+def removePinchNodes(ikle):
+  ikle = np.asarray(ikle, dtype=np.int64)
+  keep = np.ones(len(ikle), dtype=bool)
+  pinch_nodes = list()
+  
+  while True:
+    elems = np.where(keep)[0]
+    if (len(elems) == 0):
+      break
+    
+    # the boundary edges (edges that belong to only one element)
+    edges = ikle[elems][:,[0,1,1,2,2,0]].reshape(-1,2)
+    lo = np.minimum(edges[:,0], edges[:,1])
+    hi = np.maximum(edges[:,0], edges[:,1])
+    keys = lo * (int(np.max(ikle)) + 1) + hi
+    unique_keys, inverse, counts = np.unique(keys, return_inverse=True,
+      return_counts=True)
+    bnd = edges[counts[inverse.ravel()] == 1]
+    
+    # a node with more than two boundary edges is a pinch node
+    nbnd = np.bincount(bnd.ravel(), minlength=int(np.max(ikle)) + 1)
+    pinch = np.where(nbnd > 2)[0]
+    if (len(pinch) == 0):
+      break
+    
+    removed = False
+    for p in pinch:
+      around = elems[np.any(ikle[elems] == p, axis=1)]
+      around = around[keep[around]]
+      
+      # elements around p are in the same fan if they share an edge that
+      # starts at p (i.e., they share a node other than p)
+      fan = list(range(len(around)))
+      def root(i):
+        while (fan[i] != i):
+          i = fan[i]
+        return i
+      for a in range(len(around)):
+        for b in range(a+1, len(around)):
+          shared = np.intersect1d(ikle[around[a]], ikle[around[b]])
+          if (len(shared) > 1):
+            fan[root(b)] = root(a)
+      
+      roots = np.array([root(i) for i in range(len(around))])
+      groups, sizes = np.unique(roots, return_counts=True)
+      if (len(groups) < 2):
+        continue
+      
+      # keep the largest fan (the first one if there is a tie)
+      largest = groups[np.argmax(sizes)]
+      keep[around[roots != largest]] = False
+      pinch_nodes.append(int(p))
+      removed = True
+    
+    if not removed:
+      break
+  
+  return keep, np.array(pinch_nodes, dtype=np.int64)
+
+# this method returns the pairs of elements that share an edge (i.e., the 
+# edges of the dual graph of the mesh), as an array with two columns; the
+# ikle array is zero based. If slots is True, each element is given as 
+# element*NDP + j instead, where j is the local edge (from node j to node
+# j+1) that the two elements share.
+def getDualEdges(ikle,slots=False):
+  
+  ndp = ikle.shape[1]
+  cols = np.ravel([[i, (i+1) % ndp] for i in range(ndp)])
+  edges = ikle[:,cols].reshape(-1,2).astype(np.int64)
+  
+  lo = np.minimum(edges[:,0], edges[:,1])
+  hi = np.maximum(edges[:,0], edges[:,1])
+  keys = lo * (int(np.max(ikle)) + 1) + hi
+  
+  # an interior edge appears twice in the sorted keys, once for each of
+  # the two elements that share it
+  order = np.argsort(keys)
+  keys = keys[order]
+  same = np.where(keys[1:] == keys[:-1])[0]
+  pairs = np.column_stack((order[same], order[same+1]))
+  
+  if slots:
+    return pairs
+  return pairs // ndp
+
+# this method splits the elements of a mesh into nparts parts of (almost)
+# the same number of elements, for parallel runs; the ikle array is zero 
+# based. The elements are split by recursive bisection of their centroids,
+# along the principal axis of the centroids (method = 'inertial') or along
+# the longer of the x and y extents (method = 'rcb'). Then, for a number 
+# of passes, elements on the interface of two parts move to the part that 
+# most of their neighbours are in, if that shortens the interface; the
+# parts are kept within tol of the average number of elements. Returns 
+# the (zero based) part of each element.
+def partitionMesh(n,e,x,y,ikle,nparts,method='inertial',passes=4,tol=0.03):
+  
+  epart = np.zeros(e, dtype=np.int64)
+  if (nparts < 2 or e == 0):
+    return epart
+  
+  # centroids of the elements
+  xc = np.mean(x[ikle], axis=1)
+  yc = np.mean(y[ikle], axis=1)
+  
+  # recursive bisection; each item is (elements, number of parts, first 
+  # part number)
+  stack = [(np.arange(e, dtype=np.int64), nparts, 0)]
+  while (len(stack) > 0):
+    elems, k, first = stack.pop()
+    if (k == 1 or len(elems) == 0):
+      epart[elems] = first
+      continue
+    
+    dx = xc[elems] - np.mean(xc[elems])
+    dy = yc[elems] - np.mean(yc[elems])
+    
+    if (method == 'rcb'):
+      if (np.ptp(dx) >= np.ptp(dy)):
+        proj = dx
+      else:
+        proj = dy
+    else:
+      # eigenvector of the largest eigenvalue of the covariance matrix
+      cov = np.array([[np.dot(dx,dx), np.dot(dx,dy)], 
+        [np.dot(dx,dy), np.dot(dy,dy)]])
+      w, v = np.linalg.eigh(cov)
+      proj = dx*v[0,1] + dy*v[1,1]
+    
+    # the first k1 parts get their share of the elements
+    k1 = k // 2
+    nsplit = int(round(len(elems) * float(k1) / k))
+    if (nsplit <= 0 or nsplit >= len(elems)):
+      order = np.argsort(proj, kind='stable')
+    else:
+      order = np.argpartition(proj, nsplit)
+    
+    stack.append((elems[order[nsplit:]], k-k1, first+k1))
+    stack.append((elems[order[0:nsplit]], k1, first))
+  
+  if (passes < 1):
+    return epart
+  
+  # neighbours of each element across each of its edges (-1 where the 
+  # edge is on the boundary)
+  pairs = getDualEdges(ikle, slots=True)
+  ndp = ikle.shape[1]
+  nbr = np.full(e * ndp, -1, dtype=np.int64)
+  nbr[pairs[:,0]] = pairs[:,1] // ndp
+  nbr[pairs[:,1]] = pairs[:,0] // ndp
+  nbr = nbr.reshape(e, ndp)
+  
+  avg = float(e) / nparts
+  max_size = int(np.floor(avg * (1.0 + tol)))
+  min_size = int(np.ceil(avg * (1.0 - tol)))
+  
+  for it in range(passes):
+    # only the elements on the interface of two parts can move
+    nbr_part = np.where(nbr >= 0, epart[nbr], -1)
+    cut = (nbr_part >= 0) & (nbr_part != epart[:,None])
+    active = np.where(np.any(cut, axis=1))[0]
+    if (len(active) == 0):
+      break
+    
+    nbr_part = nbr_part[active]
+    part = epart[active]
+    own = np.sum(nbr_part == part[:,None], axis=1)
+    
+    # the gain of moving each element to the part of each neighbour
+    gain = np.full(nbr_part.shape, -1, dtype=np.int64)
+    for j in range(nbr.shape[1]):
+      q = nbr_part[:,j]
+      count_q = np.sum(nbr_part == q[:,None], axis=1)
+      valid = (q >= 0) & (q != part)
+      
+      # parts only move one way in each pass, so that two neighbours do
+      # not swap parts
+      if (it % 2 == 0):
+        valid = valid & (q > part)
+      else:
+        valid = valid & (q < part)
+      gain[:,j] = np.where(valid, count_q - own, -1)
+    
+    best = np.argmax(gain, axis=1)
+    best_gain = gain[np.arange(len(active)), best]
+    sel = np.where(best_gain > 0)[0]
+    if (len(sel) == 0):
+      continue
+    
+    cand = active[sel]
+    cand_to = nbr_part[sel, best[sel]]
+    cand_from = part[sel]
+    cand_gain = best_gain[sel]
+    sizes = np.bincount(epart, minlength=nparts)
+    
+    # the elements with the largest gain move first, while the parts they
+    # move to (and from) stay within the size limits
+    keep = np.ones(len(cand), dtype=bool)
+    for cand_part, room in [(cand_to, max_size - sizes), 
+      (cand_from, sizes - min_size)]:
+      order = np.lexsort((-cand_gain, cand_part))
+      first_of = np.searchsorted(cand_part[order], np.arange(nparts))
+      rank = np.empty(len(cand), dtype=np.int64)
+      rank[order] = np.arange(len(cand)) - first_of[cand_part[order]]
+      keep = keep & (rank < room[cand_part])
+    
+    epart[cand[keep]] = cand_to[keep]
+  
+  return epart
+
+# this method returns the quality of a partition of the mesh (see 
+# partitionMesh); the number of elements in each part, the imbalance (the
+# largest part divided by the average part), the edge cut (the number of 
+# element edges on the interface of two parts), and the number of nodes
+# on the interface of two or more parts
+def getPartitionMetrics(ikle,epart,nparts):
+  
+  sizes = np.bincount(epart, minlength=nparts)
+  imbalance = np.max(sizes) / (float(len(epart)) / nparts)
+  
+  pairs = getDualEdges(ikle)
+  edge_cut = int(np.sum(epart[pairs[:,0]] != epart[pairs[:,1]]))
+  
+  # nodes that are in the elements of more than one part
+  nodes = ikle.ravel()
+  parts = np.repeat(epart, ikle.shape[1])
+  pmin = np.full(np.max(ikle)+1, nparts)
+  pmax = np.full(np.max(ikle)+1, -1)
+  np.minimum.at(pmin, nodes, parts)
+  np.maximum.at(pmax, nodes, parts)
+  interface = int(np.sum((pmax >= 0) & (pmin != pmax)))
+  
+  return sizes, imbalance, edge_cut, interface
+
+# this method returns the mesh of part p of a partition of the mesh (see 
+# partitionMesh), with its nodes numbered from zero; node_map holds the 
+# global node number of each node of the part, and elem_map the global 
+# element number of each element of the part (both zero based)
+def getPartMesh(x,y,z,ikle,epart,p):
+  
+  elem_map = np.where(epart == p)[0]
+  node_map = np.unique(ikle[elem_map])
+  ikle_p = np.searchsorted(node_map, ikle[elem_map])
+  
+  return len(node_map), len(elem_map), x[node_map], y[node_map], \
+    z[node_map], ikle_p, node_map, elem_map
+
+# this method takes the number of nodes n and the (zero based) boundary
+# nodes nbor (as returned by getBoundaryNodes), and returns the IPOBO array
+# (one based; zero for the nodes that are not on the boundary) and the text
+# of the *.cli file for use in Telemac (all boundaries closed)
+def getIPOBO_CLI(n,nbor):
+  nbor = np.asarray(nbor, dtype=np.int64)
+  nptfr = len(nbor)
+  
+  ppIPOB = np.zeros(n, dtype=np.int32)
+  ppIPOB[nbor] = np.arange(1, nptfr+1)
+  
+  cli_base = str('2 2 2 0.000 0.000 0.000 0.000 2 0.000 0.000 0.000 ')
+  fmt = cli_base + '%d %d\n'
+  rows = np.column_stack((nbor + 1, np.arange(1, nptfr+1))).ravel().tolist()
+  cli = (fmt * nptfr) % tuple(rows)
+  
+  return ppIPOB, cli
+
+# this method takes in an adcirc file, and returns the IPOBO and IKLE arrays;
+# if cli_file is given, the *.cli file for use in Telemac is written to it.
+# The boundary is found with getBoundaryNodes() (the same ordering as the
+# bnd_extr_stbtel.f90 Fortran program that was used before), so no external
+# program or temporary files are needed
 
 # note that this function returns the ikle and the ipobo arrays that are
 # one based, as this is what telemac needs
 
-def getIPOBO_IKLE(adcirc_file):
+def getIPOBO_IKLE(adcirc_file,cli_file=None):
   
-  try:
-    # this only works when the paths are sourced!
-    pputils_path = os.environ['PPUTILS']
-  except:
-    pputils_path = os.getcwd()
-
   # reads the adcirc file (note the ikle here is zero based)
   n,e,x,y,z,ikle = readAdcirc(adcirc_file)
   
   # #######################
-  # make sure the elements are oriented in CCW fashion
-  # go through each element, and make sure it is oriented in CCW fashion
-  for i in range(len(ikle)):
-    
-    # if the element is not CCW then must change its orientation
-    if not CCW( x[ikle[i,0]], y[ikle[i,0]], x[ikle[i,1]], y[ikle[i,1]], 
-      x[ikle[i,2]], y[ikle[i,2]] ):
-    
-      t0 = ikle[i,0]
-      t1 = ikle[i,1]
-      t2 = ikle[i,2]
-      
-      # switch orientation
-      ikle[i,0] = t2
-      ikle[i,2] = t0
+  # make sure the elements are oriented in CCW fashion (mesh_pp is imported
+  # here, as it imports this module)
+  from ppmodules.mesh_pp import ppMesh
+  mesh = ppMesh(n,e,x,y,z,ikle)
+  nbor = mesh.getBoundaryNodes()
   # #######################
 
-  # the above returns ikle that is zero based, but
-  # telemac will need them to be one-based; conversion is done below
-  ikle[:,0] = ikle[:,0] + 1
-  ikle[:,1] = ikle[:,1] + 1
-  ikle[:,2] = ikle[:,2] + 1
-  
-  # temporary ipobo.txt (this is the output from the bnd_extr_stbtel.f90)
-  temp_ipobo = 'ipobo.txt'
+  # the ikle above is zero based, but telemac will need it to be one-based
+  ikle = mesh.getCCWIkle() + 1
   
-  # now we are ready to generate the ppIPOB array by running a pre-compiled
-  # binary of bnd_extr_stbtel.f90
+  ppIPOB, cli = getIPOBO_CLI(n, nbor)
   
-  # to determine if the system is 32 or 64 bit
-  archtype = struct.calcsize('P') * 8
-
-  # gets the current directory
-  curdir = os.getcwd()
-
-  ########################################################################
-  if (os.name == 'posix'):
-    # to determine processor type
-    proctype = os.uname()[4][:]
-    
-    if (proctype == 'i686'):
-      callstr = pputils_path + '/boundary/bin/bnd_extr_stbtel_32'
-    elif (proctype == 'x86_64'):
-      callstr = pputils_path + '/boundary/bin/bnd_extr_stbtel_64'
-    elif (proctype == 'armv7l'):
-      callstr = pputils_path + '/boundary/bin/bnd_extr_stbtel_pi32'
-      
-    # make sure the binary is allowed to be executed
-    subprocess.call(['chmod', '+x', callstr])
-      
-    # execute the binary 
-    #print('Executing bnd_extr_stbtel program ...')
-    subprocess.call([callstr, adcirc_file, temp_ipobo])
-          
-  if (os.name == 'nt'):
-    # nt is for windows [still to update]
-    callstr = ".\\boundary\\bin\\bnd_extr_stbtel_32.exe"
-    subprocess.call([callstr, adcirc_file, temp_ipobo])
-    ########################################################################
-
-  # now we can read in the ipobo.txt file, and populate the ppIPOB variable
-  # as well as write the *.cli file
-
-  # read the ipobo.txt file as a master list
-  line = list()
-  with open('ipobo.txt', 'r') as f1:
-    for i in f1:
-      line.append(i)
-
-  # now we can write the temp.cli file
-  fcli = open('temp.cli', 'w')
-  cli_base = str('2 2 2 0.000 0.000 0.000 0.000 2 0.000 0.000 0.000 ')
-
-  # write the *.cli file
-  for i in range(len(line)):
-    fcli.write(cli_base + str(int(line[i])) + ' ' + str(i+1) + '\n')
-
-  # close the *.cli file
-  fcli.close()
-
-  # note the temp.cli gets renamed in the master script
-
-  # now store the ppIPOB array
-  ppIPOB = np.zeros(n, dtype=np.int32)
-
-  ipob_count = 0
-
-  # returns the ppIPOB array that is one based
-  for i in range(len(line)):
-    ipob_count = ipob_count + 1
-    ppIPOB[int(line[i])-1] = ipob_count
-
-  # now we can remove the ipobo.txt file
-  os.remove('ipobo.txt')
+  if (cli_file is not None):
+    fcli = open(cli_file, 'w')
+    fcli.write(cli)
+    fcli.close()
   
   return n,e,x,y,z,ikle,ppIPOB
   
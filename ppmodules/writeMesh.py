@@ -7,6 +7,20 @@ import numpy             as np             # numpy
 # Functions
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+# writes the rows of the columns in cols to fout, each formatted with fmt
+# (i.e., '%s %.3f %.3f %.3f\n'); the rows are formatted in chunks, with a
+# single string formatting operation for each chunk. The values are turned
+# into python ints and floats first, so the text is the same as when each
+# value is formatted on its own (i.e., with str() or '{:.3f}'.format()).
+def _writeRows(fout, fmt, cols, nrows, chunk=100000):
+  cols = [np.asarray(c) for c in cols]
+  for a in range(0, nrows, chunk):
+    b = min(nrows, a + chunk)
+    rows = np.empty((b-a, len(cols)), dtype=object)
+    for j in range(len(cols)):
+      rows[:,j] = cols[j][a:b]
+    fout.write((fmt * (b-a)) % tuple(rows.ravel().tolist()))
+
 # this function assumes the indices in the ikle array are zero based
 def writeAdcirc(n,e,x,y,z,ikle,name):
   
@@ -20,16 +34,15 @@ def writeAdcirc(n,e,x,y,z,ikle,name):
   fout.write(str(e) + ' ' + str(n) + '\n')
   
   # writes the nodes
-  for i in range(n):
-    fout.write(str(i+1) + ' ' + str('{:.3f}'.format(x[i] )) + ' ' + 
-      str('{:.3f}'.format(y[i])) + ' ' + str('{:.3f}'.format(z[i])) + '\n')
+  _writeRows(fout, '%s %.3f %.3f %.3f\n', 
+    [np.arange(1, n+1), x, y, z], n)
   
   # writes the elements
   # the readAdcirc function assigns the ikle starting at zero, so that is why
   # we have to add 1
-  for i in range(e):
-    fout.write(str(i+1) + ' 3 ' + str(ikle[i,0]+1) + ' ' + str(ikle[i,1]+1) + 
-      ' ' +   str(ikle[i,2]+1) + '\n')
+  ikle = np.asarray(ikle)
+  _writeRows(fout, '%s 3 %s %s %s\n', 
+    [np.arange(1, e+1), ikle[0:e,0]+1, ikle[0:e,1]+1, ikle[0:e,2]+1], e)
 
   # close the fout file
   fout.close()
@@ -48,14 +61,13 @@ def write2dm(n,e,x,y,z,ikle,name):
 
   # writes the elements
   # the n,e,x,y,z,ikle are zero based, so we add 1 to make it 1 based
-  for i in range(e):
-    fout.write('E3T ' + str(i+1) + ' ' + str(ikle[i,0]+1) + ' ' + str(ikle[i,1]+1) + 
-      ' ' +   str(ikle[i,2]+1) + ' 1' + '\n')
+  ikle = np.asarray(ikle)
+  _writeRows(fout, 'E3T %s %s %s %s 1\n', 
+    [np.arange(1, e+1), ikle[0:e,0]+1, ikle[0:e,1]+1, ikle[0:e,2]+1], e)
 
   # writes the nodes
-  for i in range(n):
-    fout.write('ND ' + str(i+1) + ' ' + str('{:.3f}'.format(x[i] )) + ' ' + 
-      str('{:.3f}'.format(y[i])) + ' ' + str('{:.3f}'.format(z[i])) + '\n')
+  _writeRows(fout, 'ND %s %.3f %.3f %.3f\n', 
+    [np.arange(1, n+1), x, y, z], n)
 
   # close the fout file
   fout.close()
@@ -78,22 +90,18 @@ def writeVTKscalar(n,e,x,y,z,ikle,fname,vname):
   fout.write('POINTS ' + str(len(x)) + ' float' + '\n')
   
   # to write the node coordinates
-  for i in range(len(x)):
-    fout.write(str('{:.3f}'.format(x[i])) + ' ' + 
-      str('{:.3f}'.format(y[i])) + ' ' + str('{:.3f}'.format(0.0)) + 
-      '\n')
+  _writeRows(fout, '%.3f %.3f 0.000\n', [x, y], len(x))
       
   # to write the node connectivity table
   fout.write('CELLS ' + str(len(ikle)) + ' ' + str(len(ikle)*4) + '\n')
   
-  for i in range(len(ikle)):
-    fout.write('3 ' + str(ikle[i][0]) + ' ' + str(ikle[i][1]) + ' ' + 
-      str(ikle[i][2]) + '\n')
+  ikle = np.asarray(ikle)
+  _writeRows(fout, '3 %s %s %s\n', [ikle[:,0], ikle[:,1], ikle[:,2]], 
+    len(ikle))
       
   # to write the cell types
   fout.write('CELL_TYPES ' + str(len(ikle)) + '\n')
-  for i in range(len(ikle)):
-    fout.write('5' + '\n')
+  fout.write('5\n' * len(ikle))
     
   # write the empty line
   fout.write('' + '\n')
@@ -105,10 +113,8 @@ def writeVTKscalar(n,e,x,y,z,ikle,fname,vname):
   fout.write('SCALARS ' + vname + '\n')
   fout.write('float' + '\n')
   fout.write('LOOKUP_TABLE default' + '\n')
-  for i in range(len(x)):
-    fout.write(str('{:.3f}'.format(z[i])) + '\n')
+  _writeRows(fout, '%.3f\n', [z], len(x))
 
   fout.close()
   
   return None
-
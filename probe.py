@@ -16,6 +16,10 @@
 # Revised: Apr 30, 2016
 # Added ability to probe 3d *.slf files.
 #
+# Revised: Oct 17, 2026
+# If a valid *.slfidx index file exists next to the *.slf file (see 
+# scan.py), the times are taken from the index instead of the *.slf file.
+#
 # Uses: Python 2 or 3, Numpy
 #
 # Example: python probe2.py -i input.slf
@@ -50,7 +54,8 @@ print("The input file being probed: " + input_file)
 # constructor for pp_SELAFIN class
 slf = ppSELAFIN(input_file)
 slf.readHeader()
-slf.readTimes()
+if not slf.readIndex():
+  slf.readTimes()
 
 times = slf.getTimes()
 vnames = slf.getVarNames()
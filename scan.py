@@ -20,13 +20,30 @@
 # Rather than scanning data for all time steps, scan the file for a
 # particular time step only.
 #
+# Revised: Oct 17, 2026
+# Added the optional -x flag that writes a *.slfidx index file next to 
+# the *.slf file. The index holds the times, frame offsets, and min, max
+# and mean of every variable for every time step. When a valid index 
+# exists, the min and max are taken from it instead of the *.slf file.
+#
+# Revised: Oct 17, 2026
+# Added the --all option that scans all time steps (reading each one only
+# once), and prints the min, max, mean, std, approximate percentiles and
+# the number of non-finite values (nan or inf) of every variable. The
+# results are stored in the *.slfidx index file, and are reused by later
+# runs (and by sel2png.py) for as long as the *.slf file is not changed.
+#
 # Uses: Python 2 or 3, Numpy
 #
 # Example: python scan.py -i input.slf -t 3
+#          python scan.py -i input.slf -t 3 -x
+#          python scan.py -i input.slf --all
 # 
 # where:
 #       --> -i is the telemac *.slf file being probed
 #       --> -t is the index of the time step being probed
+#       --> -x (optional) writes the *.slfidx index file
+#       --> --all scans all time steps instead of a single one
 #
 #~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 # Global Imports
@@ -41,19 +58,40 @@ from ppmodules.selafin_io_pp import *
 # MAIN
 #+++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++++
 #
-if len(sys.argv) == 5:
+write_index = False
+scan_all = False
+if len(sys.argv) == 4 and sys.argv[3] == '--all':
+  input_file = sys.argv[2]   # input *.slf file
+  t = 0
+  write_index = True
+  scan_all = True
+elif len(sys.argv) == 5:
   input_file = sys.argv[2]   # input *.slf file
   t = int(sys.argv[4])
+elif len(sys.argv) == 6 and sys.argv[5] == '-x':
+  input_file = sys.argv[2]   # input *.slf file
+  t = int(sys.argv[4])
+  write_index = True
 else:
   print('Wrong number of Arguments, stopping now...')
   print('Example usage:')
   print('python scan.py -i input.slf -t 3')
+  print('python scan.py -i input.slf -t 3 -x')
+  print('python scan.py -i input.slf --all')
   sys.exit()
 
 # constructor for pp_SELAFIN class
 slf = ppSELAFIN(input_file)
 slf.readHeader()
-slf.readTimes()
+
+# use the index file if there is a valid one; otherwise read the times
+has_index = slf.readIndex()
+if not has_index:
+  slf.readTimes()
+  
+if (write_index and not has_index):
+  slf.writeIndex()
+  has_index = True
 
 times = slf.getTimes()
 vnames = slf.getVarNames()
@@ -61,7 +99,7 @@ vunits = slf.getVarUnits()
 ftype,fsize = slf.getPrecision()
 nplan = slf.getNPLAN()
 
-if (t >= len(times)):
+if (t >= len(times) and not scan_all):
   print('time step is not within the file. Exiting!')
   sys.exit()
 
@@ -93,12 +131,19 @@ else:
   precision = 'unknown'
 
 # prints variable names and their min and max values from a particular time step
-slf.readVariables(t)
-master_results = slf.getVarValues()
+if scan_all:
+  pass
+elif has_index:
+  stats = slf.getVarStats()
+  minmax[:,0] = stats[t,:,0]
+  minmax[:,1] = stats[t,:,1]
+else:
+  slf.readVariables(t)
+  master_results = slf.getVarValues()
 
-for j in range(numvars):
-  minmax[j,0] = np.min(master_results[j,:])
-  minmax[j,1] = np.max(master_results[j,:])
+  for j in range(numvars):
+    minmax[j,0] = np.min(master_results[j,:])
+    minmax[j,1] = np.max(master_results[j,:])
   
 print('#########################################################')
 print("The input file being scaned: " + input_file)
@@ -109,9 +154,31 @@ if (slf_type == '3d'):
 print('Number of elements: ' + str(NELEM))
 print('Number of nodes: ' + str(NPOIN))
 print('Number of time steps: ' + str(len(times)))
-print('Index of output time step: ' + str(t))          
+if not scan_all:
+  print('Index of output time step: ' + str(t))          
 print(' ')
 print('#########################################################')
+
+# statistics of each variable over all time steps
+if scan_all:
+  gstats, pct_levels, pct, nonfinite = slf.getVarGlobalStats()
+  print('Variables in '+input_file+' (all time steps) are: ')
+  print('---------------------------------------------------------')
+  for i in range(len(vnames)):
+    print('    ',i, '-->', vnames[i] + ' [' + vunits[i].strip() + ']')
+    print('          min: ' + str("{:12.3f}".format(gstats[i,0])) +
+      '   max: ' + str("{:12.3f}".format(gstats[i,1])))
+    print('         mean: ' + str("{:12.3f}".format(gstats[i,2])) +
+      '   std: ' + str("{:12.3f}".format(gstats[i,3])))
+    for j in range(len(pct_levels)):
+      print('          p' + str("{:<3d}".format(int(pct_levels[j]))) + 
+        str("{:12.3f}".format(pct[i,j])))
+    print('    non-finite: ' + str(nonfinite[i]))
+  print(' ')
+  print('#########################################################')
+  print('All done!')
+  sys.exit()
+
 print('Variables in '+input_file+' are: ')
 print('---------------------------------------------------------')
 print('     v     variable               min         max unit'   )
@@ -13,6 +13,9 @@
 # Modified: Feb 21, 2016
 # Made it work under python 2 or 3
 #
+# Modified: Oct 17, 2026
+# Only the record of the gridded variable is read from the *.slf file.
+#
 # Purpose: Script designed to open 2D telemac binary file, read the
 # the desired output to an ESRI *.asc file for use in displaying within a
 # GIS environment
@@ -63,7 +66,7 @@ output_file = sys.argv[10]       # output *.asc grid file
 slf = ppSELAFIN(input_file)
 slf.readHeader()
 slf.readTimes()
-slf.readVariables(t)
+slf.readVariables(t, [var_index])
 
 # gets some of the mesh properties from the *.slf file
 NELEM, NPOIN, NDP, IKLE, IPOBO, x, y = slf.getMesh()
@@ -72,7 +75,7 @@ NELEM, NPOIN, NDP, IKLE, IPOBO, x, y = slf.getMesh()
 # at zero
 IKLE[:,:] = IKLE[:,:] - 1
 
-# these are the results for all variables, for time step t
+# these are the results for the gridded variable, for time step t
 master_results = slf.getVarValues() 
 
 # creates a triangulation grid using matplotlib function Triangulation
@@ -98,7 +101,7 @@ x_regs = xreg[1,:]
 y_regs = yreg[:,1]
 
 # to interpolate to a reg grid
-interpolator = mtri.LinearTriInterpolator(triang, master_results[var_index])
+interpolator = mtri.LinearTriInterpolator(triang, master_results[0])
 z = interpolator(xreg,yreg)
 
 print("Shape of array z: " + str(z.shape[0]))
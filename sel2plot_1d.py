@@ -14,6 +14,8 @@
 #
 # Updated: Feb 22, 2016 - uses selafin_io_pp class (works with python 2 and 3).
 #
+# Updated: Oct 17, 2026 - reads only the records of the plotted variables.
+#
 # Purpose: Script designed to take a 2d *.slf results file and a pputils line
 # (i.e., a cross section or a profile line) and drapes the results (from a
 # specified variable) onto the line for all time steps in the *.slf file.
@@ -136,9 +138,9 @@ if (len(sys.argv) == 9):
   # if there is only one variable
   # for every time step in the results file
   for i in range(len(times)):
-    res.readVariables(i)
+    res.readVariables(i, [var_idx])
     slf_results = res.getVarValues()
-    interpolator = mtri.LinearTriInterpolator(triang, slf_results[var_idx,:])
+    interpolator = mtri.LinearTriInterpolator(triang, slf_results[0,:])
     interp_var = interpolator(lnx, lny)
     
     # put -999.0 if the line is outside of the results file domain
@@ -150,12 +152,12 @@ elif (len(sys.argv) == 10):
   # if there are two variables, then compute magnitude
   # for every time step in the results file
   for i in range(len(times)):
-    res.readVariables(i)
+    res.readVariables(i, [var1_idx, var2_idx])
     slf_results = res.getVarValues()
-    interpolator1 = mtri.LinearTriInterpolator(triang, slf_results[var1_idx,:])
+    interpolator1 = mtri.LinearTriInterpolator(triang, slf_results[0,:])
     interp_var1 = interpolator1(lnx, lny)
     
-    interpolator2 = mtri.LinearTriInterpolator(triang, slf_results[var2_idx,:])
+    interpolator2 = mtri.LinearTriInterpolator(triang, slf_results[1,:])
     interp_var2 = interpolator2(lnx, lny)
     
     # compute magnitude of the two variables
@@ -168,8 +170,11 @@ elif (len(sys.argv) == 10):
     interp_var_list.append(mag)
 
 # to interpolate the bottom variable if it exists
+# (the bottom is taken from the last time step in the file)
 if (bottom_idx != -1):
-  bot_interpolator = mtri.LinearTriInterpolator(triang, slf_results[bottom_idx])
+  res.readVariables(len(times)-1, [bottom_idx])
+  slf_results = res.getVarValues()
+  bot_interpolator = mtri.LinearTriInterpolator(triang, slf_results[0])
   bottom_var = bot_interpolator(lnx, lny)
 
 # convert interp_var_list to numpy array
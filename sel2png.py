@@ -46,6 +46,19 @@
 # Revised: Oct 24, 2020
 # Added a white background arount the time stamp. This makes it nicer
 # for the eyes, especially when the time stamp goes over the mesh.
+#
+# Revised: Oct 17, 2026
+# When CBAR_MIN and CBAR_MAX in the *.cfg file are both -2, the colour
+# bar limits are the min and max of the variable over all time steps,
+# taken from the *.slfidx index file (see scan.py --all). The index is
+# written if it does not exist. This keeps the same colour bar for all
+# of the *.png files. For a vector magnitude, the range is found with a
+# pass through the two variables. If the variable has no finite values,
+# the limits of each time step are used. Elements with values that are
+# not finite (i.e., dry) are not coloured.
+#
+# Revised: Oct 17, 2026
+# Uses the shared frame cache if PPUTILS_FRAME_CACHE is set.
 # 
 # Using: Python 2 or 3, Matplotlib, Numpy
 #
@@ -165,7 +178,17 @@ yur = float(params3[4])
 # use selafin_io_pp class ppSELAFIN
 slf = ppSELAFIN(input_file)
 slf.readHeader()
-slf.readTimes()
+
+# the index file is only needed for colour bar limits over all time steps
+if ((cbar_min_global == -2) and (cbar_max_global == -2)):
+  if not slf.readIndex():
+    print('Writing the index file ' + slf.idx_file)
+    slf.writeIndex()
+else:
+  slf.readTimes()
+
+# the shared frame cache is used if PPUTILS_FRAME_CACHE is set
+slf.useFrameCacheFromEnv()
 
 # gets the number of planes
 NPLAN = slf.getNPLAN()
@@ -242,6 +265,36 @@ for i in range(len(variables)):
 # gets some of the mesh properties from the *.slf file
 NELEM, NPOIN, NDP, IKLE, IPOBO, x, y = slf.getMesh()
 
+# colour bar limits from the min and max over all time steps
+if ((cbar_min_global == -2) and (cbar_max_global == -2)):
+  if (var_index2 > 0):
+    # the range of the vector magnitude is not in the index (the min and
+    # max of the components only bound it), so it is found with a pass 
+    # through the two variables; values that are not finite are skipped
+    cbar_min_global = np.inf
+    cbar_max_global = -np.inf
+    for t, time, vals in slf.iterFrames(vars=[var_index1, var_index2]):
+      mag = np.sqrt(np.power(vals[0],2) + np.power(vals[1],2))
+      mag = mag[np.isfinite(mag)]
+      if (len(mag) > 0):
+        cbar_min_global = min(cbar_min_global, np.min(mag))
+        cbar_max_global = max(cbar_max_global, np.max(mag))
+  else:
+    gstats = slf.getVarGlobalStats()[0]
+    cbar_min_global = gstats[var_index1,0]
+    cbar_max_global = gstats[var_index1,1]
+  
+  if (np.isfinite(cbar_min_global) and np.isfinite(cbar_max_global)):
+    if ((cbar_max_global - cbar_min_global) < 0.001):
+      cbar_max_global = cbar_min_global + 0.001
+  else:
+    # no finite values over all time steps (i.e., the variable is all 
+    # dry); the limits of each time step are used instead
+    print('No finite values of the variable in the file; using the ' +
+      'colour bar limits of each time step')
+    cbar_min_global = -1
+    cbar_max_global = -1
+
 # define u and v for plotting (if needed)
 u = np.zeros(NPOIN)
 v = np.zeros(NPOIN)
@@ -297,9 +350,14 @@ for count, item in enumerate(filenames):
   triang = mtri.Triangulation(x, y, IKLE)
   
   if ((cbar_min_global == -1) and (cbar_max_global == -1)):
-    # this is the range of the colour coding
-    cbar_min = np.min(plot_array)
-    cbar_max = np.max(plot_array)
+    # this is the range of the colour coding (of the finite values)
+    finite = plot_array[np.isfinite(plot_array)]
+    if (len(finite) > 0):
+      cbar_min = np.min(finite)
+      cbar_max = np.max(finite)
+    else:
+      cbar_min = 0.0
+      cbar_max = 0.0
     
     if ((cbar_max - cbar_min) < 0.001):
       cbar_max = cbar_min + 0.001
@@ -332,11 +390,26 @@ for count, item in enumerate(filenames):
   # adjust the levels
   levels = np.linspace(cbar_min, cbar_max, 16)
   
+  # values that are not finite (i.e., dry nodes) are not plotted; the
+  # elements that touch them are masked
+  bad = ~np.isfinite(plot_array)
+  dry = np.any(bad[IKLE], axis=1)
+  plot_array = np.where(bad, cbar_min, plot_array)
+  
   plt.figure()
   plt.gca().set_aspect('equal')
   cmap = cm.get_cmap(name=cbar_color_map)
-  plt.tricontourf(triang, plot_array, levels=levels,
-    cmap=cmap, antialiased=True)
+  if np.all(dry):
+    # all of the elements are dry, so only the mesh is drawn
+    plt.triplot(triang, color='0.8', linewidth=0.1)
+    mappable = cm.ScalarMappable(norm=plt.Normalize(cbar_min, cbar_max),
+      cmap=cmap)
+    mappable.set_array(np.array([]))
+  else:
+    if np.any(dry):
+      triang.set_mask(dry)
+    mappable = plt.tricontourf(triang, plot_array, levels=levels,
+      cmap=cmap, antialiased=True)
   
   # axis limits (the zoom flag controls this)
   if (zoom > 0):
@@ -346,7 +419,8 @@ for count, item in enumerate(filenames):
   plt.axis('off')
   
   # this is for the colorbar
-  cb = plt.colorbar(orientation='vertical', shrink=0.3,format='%.3f')
+  cb = plt.colorbar(mappable, ax=plt.gca(), orientation='vertical', 
+    shrink=0.3,format='%.3f')
   cb.set_ticks(levels)
   cb.ax.tick_params(labelsize=5)
   
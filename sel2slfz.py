@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 sel2slfz.py                           #
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+#
+# Date: Oct 17, 2026
+#
+# Purpose: Script takes in a *.slf file, and writes a compressed archive
+# (*.slfz) of it. The record of each variable at each time step is 
+# compressed on its own, and the archive has an index of the records, so
+# that any time step or variable can be read without decompressing the
+# rest. The scripts that read *.slf files with ppSELAFIN can read the
+# archive directly (i.e., use the *.slfz file as the input file). If a
+# tolerance is given, the values are rounded so that the error of each
+# value is at most the tolerance; this makes the archive much smaller.
+# Without a tolerance, the values are stored exactly. Use slfz2sel.py to
+# write the archive back to a *.slf file.
+#
+# Uses: Python 2 or 3, Numpy (lzma compression needs Python 3)
+#
+# Example:
+#
+# python sel2slfz.py -i in.slf -o out.slfz
+# python sel2slfz.py -i in.slf -o out.slfz -c lzma -t 0.001
+# where:
+# -i input *.slf file
+# -o output archive file
+# -c compression (zlib or lzma); default is zlib
+# -t tolerance of the values (same units as each variable); default is 0,
+#    which keeps the values exactly
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+import os,sys
+import numpy as np
+from ppmodules.selafin_io_pp import *
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# MAIN
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+curdir = os.getcwd()
+#
+# I/O
+if len(sys.argv) == 5:
+  input_file = sys.argv[2]
+  output_file = sys.argv[4]
+  compression = 'zlib'
+  tolerance = 0.0
+elif len(sys.argv) == 9:
+  input_file = sys.argv[2]
+  output_file = sys.argv[4]
+  compression = sys.argv[6]
+  tolerance = float(sys.argv[8])
+else:
+  print('Wrong number of Arguments, stopping now...')
+  print('Usage:')
+  print('python sel2slfz.py -i in.slf -o out.slfz')
+  print('python sel2slfz.py -i in.slf -o out.slfz -c lzma -t 0.001')
+  sys.exit()
+
+if (compression not in ['zlib', 'lzma']):
+  print('Compression must be zlib or lzma. Exiting!')
+  sys.exit()
+
+if (tolerance < 0):
+  print('Tolerance must not be negative. Exiting!')
+  sys.exit()
+
+# reads the *.slf file
+slf = ppSELAFIN(input_file)
+slf.readHeader()
+slf.readTimes()
+
+print('Writing archive ' + output_file)
+slf.writeArchive(output_file, compression=compression, tolerance=tolerance)
+slf.close()
+
+in_size = os.path.getsize(input_file)
+out_size = os.path.getsize(output_file)
+print('Size of archive: ' + str(out_size) + ' bytes (' +
+  str("{:.1f}".format(100.0 * out_size / in_size)) + '% of input)')
+
+print('All done!')
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 slfcache.py                           #
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+#
+# Date: Oct 17, 2026
+#
+# Purpose: Script creates (or removes) a cache of decoded time steps of a
+# *.slf file in shared memory. When several scripts work on the same
+# *.slf file at the same time (i.e., sel2png.py, extract_line_v.py and
+# computeQ.py running in parallel), each one normally reads and decodes
+# every time step on its own. With the cache, each time step is read once
+# and kept in memory, and the other scripts take it from there. To make
+# the scripts use the cache, set the environment variable
+# PPUTILS_FRAME_CACHE to the number of time steps to keep in memory (the
+# first script to start creates the cache, if this script was not run).
+# Only the scripts that read a finished *.slf file use it (sel2png.py, 
+# extract_line_v.py, and the scripts that use parallel_pp.py, such as 
+# computeQ.py). The cache stays in memory until it is removed with the -u
+# option. The cache is tied to the size and modification time of the 
+# *.slf file, so a changed file gets a new cache. Needs Python 3.8 or 
+# newer.
+#
+# Uses: Python 3, Numpy
+#
+# Example:
+#
+# python slfcache.py -i in.slf -n 32
+# python slfcache.py -i in.slf -u
+# where:
+# -i input *.slf file
+# -n number of time steps to keep in memory; the first n time steps are
+#    read into the cache
+# -u removes the cache from memory
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+import os,sys
+import numpy as np
+from ppmodules.selafin_io_pp import *
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# MAIN
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+curdir = os.getcwd()
+#
+# I/O
+if len(sys.argv) == 5 and sys.argv[3] == '-n':
+  input_file = sys.argv[2]
+  nslots = int(sys.argv[4])
+  remove = False
+elif len(sys.argv) == 4 and sys.argv[3] == '-u':
+  input_file = sys.argv[2]
+  nslots = 1
+  remove = True
+else:
+  print('Wrong number of Arguments, stopping now...')
+  print('Usage:')
+  print('python slfcache.py -i in.slf -n 32')
+  print('python slfcache.py -i in.slf -u')
+  sys.exit()
+
+if (nslots < 1):
+  print('Number of time steps to cache must be at least 1. Exiting!')
+  sys.exit()
+
+# removes the cache only if it exists (it is not created to be removed)
+if remove:
+  if removeFrameCache(input_file):
+    print('Removed the cache of ' + input_file)
+  else:
+    print('There is no cache of ' + input_file)
+  print('All done!')
+  sys.exit()
+
+# reads the *.slf file; the cache is created here if it does not exist
+slf = ppSELAFIN(input_file)
+slf.readHeader()
+slf.readTimes()
+slf.useFrameCache(nslots)
+
+# read the first time steps into the cache
+n = min(slf.cache.nslots, len(slf.getTimes()))
+for t in range(n):
+  slf.cache.getFrame(t)
+print('Cache of ' + input_file + ' holds ' + str(slf.cache.nslots) + 
+  ' time steps; ' + str(n) + ' were read')
+
+slf.close()
+
+print('All done!')
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 slfz2sel.py                           #
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+#
+# Date: Oct 17, 2026
+#
+# Purpose: Script takes in a compressed archive (*.slfz) written by
+# sel2slfz.py, and writes it back to a *.slf file. The header of the 
+# *.slf file is the same as the one of the original *.slf file. If the 
+# archive was written without a tolerance, the *.slf file is the same as
+# the original.
+#
+# Uses: Python 2 or 3, Numpy
+#
+# Example:
+#
+# python slfz2sel.py -i in.slfz -o out.slf
+# where:
+# -i input archive file
+# -o output *.slf file
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+import os,sys
+import numpy as np
+from ppmodules.selafin_io_pp import *
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# MAIN
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+curdir = os.getcwd()
+#
+# I/O
+if len(sys.argv) != 5 :
+  print('Wrong number of Arguments, stopping now...')
+  print('Usage:')
+  print('python slfz2sel.py -i in.slfz -o out.slf')
+  sys.exit()
+
+input_file = sys.argv[2]
+output_file = sys.argv[4]
+
+# reads the archive
+slf = ppSELAFIN(input_file)
+slf.readHeader()
+
+if not slf.archive:
+  print(input_file + ' is not an archive written by sel2slfz.py. Exiting!')
+  sys.exit()
+
+slf.readTimes()
+
+print('Writing file ' + output_file)
+slf.extractArchive(output_file)
+slf.close()
+
+print('All done!')
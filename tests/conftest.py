@@ -0,0 +1,53 @@
+#
+# Fixtures for the tests of pputils; the tests are run from the top 
+# directory of pputils with: python -m pytest tests
+#
+import os,sys
+import numpy as np
+import pytest
+
+# the scripts and ppmodules are imported from the top directory
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+  sys.path.insert(0, ROOT)
+
+from ppmodules.selafin_io_pp import *
+
+# writes a *.slf file with a regular triangular mesh of nx by ny nodes, 
+# nvars variables and ntimes time steps (time step t is at time 10*t); 
+# the value of variable v at node j and time step t is 1000*v + 10*t + j
+def writeSlf(slf_file, nx=4, ny=3, nvars=2, ntimes=5, ftype='f', fsize=4):
+  x, y = np.meshgrid(np.arange(nx, dtype=np.float64), 
+    np.arange(ny, dtype=np.float64))
+  x = x.ravel()
+  y = y.ravel()
+  ikle = list()
+  for j in range(ny-1):
+    for i in range(nx-1):
+      a = j*nx + i
+      ikle.append([a, a+1, a+nx+1])
+      ikle.append([a, a+nx+1, a+nx])
+  ikle = np.array(ikle, dtype=np.int32) + 1
+  
+  slf = ppSELAFIN(slf_file)
+  slf.setPrecision(ftype, fsize)
+  slf.setTitle('test')
+  slf.setVarNames(['VAR ' + str(v) for v in range(nvars)])
+  slf.setVarUnits(['M' for v in range(nvars)])
+  slf.setIPARAM([1, 0, 0, 0, 0, 0, 0, 0, 0, 0])
+  slf.setMesh(len(ikle), len(x), 3, ikle, np.zeros(len(x), dtype=np.int32),
+    x, y)
+  slf.writeHeader()
+  for t in range(ntimes):
+    slf.writeVariables(10.0*t, frameValues(nvars, len(x), t))
+  slf.close()
+  return slf_file
+
+# values of time step t written by writeSlf
+def frameValues(nvars, npoin, t):
+  return (1000.0*np.arange(nvars)[:,None] + 10.0*t + 
+    np.arange(npoin)[None,:])
+
+@pytest.fixture
+def slf_file(tmp_path):
+  return writeSlf(str(tmp_path / 'test.slf'))
@@ -0,0 +1,59 @@
+#
+# Tests of crop_sel_xy.py
+#
+import os,sys
+import subprocess
+import numpy as np
+
+from conftest import ROOT, writeSlf
+from ppmodules.selafin_io_pp import *
+from ppmodules.utilities import removePinchNodes
+
+# runs crop_sel_xy.py, and returns what it printed
+def runCrop(cwd, *args):
+  env = dict(os.environ)
+  env['PYTHONPATH'] = ROOT + os.pathsep + env.get('PYTHONPATH', '')
+  out = subprocess.run([sys.executable, os.path.join(ROOT, 'crop_sel_xy.py')]
+    + list(args), cwd=cwd, env=env, stdout=subprocess.PIPE, 
+    stderr=subprocess.STDOUT, universal_newlines=True)
+  assert out.returncode == 0, out.stdout
+  return out.stdout
+
+# the 3x3 node mesh has two elements ((0,0),(1,0),(1,1)) and 
+# ((1,1),(2,1),(2,2)) that share only the node (1,1); a thin polygon along
+# the diagonal keeps only these two
+def test_crop_polygon_with_pinch_node(tmp_path):
+  slf_file = writeSlf(str(tmp_path / 'in.slf'), nx=3, ny=3, ntimes=2)
+  np.savetxt(str(tmp_path / 'poly.csv'), np.array([[0, 0.3, 0.1], 
+    [0, 0.6, 0.1], [0, 1.9, 1.4], [0, 1.9, 1.7], [0, 0.3, 0.1]]), 
+    delimiter=',')
+  
+  out = runCrop(str(tmp_path), '-i', 'in.slf', '-p', 'poly.csv', 
+    '-o', 'out.slf')
+  assert 'Warning' in out
+  
+  slf = ppSELAFIN(str(tmp_path / 'out.slf'))
+  slf.readHeader()
+  slf.readTimes()
+  NELEM, NPOIN, NDP, IKLE, IPOBO, x, y = slf.getMesh()
+  
+  # one of the two elements is left, and each of its nodes is on the 
+  # boundary exactly once
+  assert NELEM == 1
+  assert NPOIN == 3
+  assert sorted(IPOBO.tolist()) == [1, 2, 3]
+  assert len(slf.getTimes()) == 2
+  slf.close()
+
+# two fans meet at node 0; the larger one (two elements) is kept
+def test_removePinchNodes_keeps_largest_fan():
+  ikle = np.array([[0, 1, 2], [0, 2, 3], [0, 4, 5]])
+  keep, pinch = removePinchNodes(ikle)
+  assert keep.tolist() == [True, True, False]
+  assert pinch.tolist() == [0]
+
+def test_removePinchNodes_without_pinch():
+  ikle = np.array([[0, 1, 2], [0, 2, 3]])
+  keep, pinch = removePinchNodes(ikle)
+  assert keep.all()
+  assert len(pinch) == 0
@@ -0,0 +1,57 @@
+#
+# Tests of the shared memory frame cache (ppFrameCache in selafin_io_pp.py)
+#
+import threading
+import numpy as np
+import pytest
+
+from conftest import writeSlf, frameValues
+from ppmodules.selafin_io_pp import *
+from ppmodules.selafin_io_pp import shared_memory
+
+pytestmark = pytest.mark.skipif(shared_memory is None, 
+  reason='frame cache needs Python 3.8 or newer')
+
+@pytest.fixture
+def cached_slf(tmp_path):
+  slf_file = writeSlf(str(tmp_path / 'cache.slf'), ntimes=40)
+  slf = ppSELAFIN(slf_file)
+  slf.readHeader()
+  slf.readTimes()
+  # few slots, so that time steps are dropped and read again
+  slf.useFrameCache(3)
+  yield slf
+  slf.close()
+  removeFrameCache(slf_file)
+
+# iterFrames() reads through the cache on a background thread, while the
+# main thread reads other time steps through the same cache
+def test_iterFrames_with_concurrent_readVariables(cached_slf):
+  slf = cached_slf
+  npoin = slf.getNPOIN()
+  errors = list()
+  
+  def main_reads():
+    try:
+      for k in range(200):
+        t = (7*k) % 40
+        slf.readVariables(t)
+        assert np.array_equal(slf.getVarValues(), frameValues(2, npoin, t))
+    except Exception as e:
+      errors.append(e)
+  
+  for rnd in range(3):
+    th = threading.Thread(target=main_reads)
+    th.start()
+    seen = list()
+    for t, time, vals in slf.iterFrames(prefetch=2):
+      assert time == 10.0*t
+      assert np.array_equal(vals, frameValues(2, npoin, t))
+      seen.append(t)
+    th.join()
+    assert seen == list(range(40))
+  assert errors == []
+
+def test_removeFrameCache_does_not_create(tmp_path):
+  slf_file = writeSlf(str(tmp_path / 'none.slf'))
+  assert not removeFrameCache(slf_file)
@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+import pytest
+
+from ppmodules import readMesh
+from ppmodules.readMesh import readAdcirc, useMeshCache
+
+def writeGrd(grd_file):
+  with open(grd_file, 'w') as f:
+    f.write('test\n')
+    f.write('2 4\n')
+    f.write('1 0.0 0.0 1.0\n')
+    f.write('2 1.0 0.0 2.0\n')
+    f.write('3 1.0 1.0 3.0\n')
+    f.write('4 0.0 1.0 4.0\n')
+    f.write('1 3 1 2 3\n')
+    f.write('2 3 1 3 4\n')
+
+@pytest.fixture
+def grd_file(tmp_path, monkeypatch):
+  monkeypatch.setitem(readMesh._mesh_cache, 'is_set', False)
+  monkeypatch.setitem(readMesh._mesh_cache, 'location', None)
+  monkeypatch.setitem(readMesh._mesh_cache, 'max_size', None)
+  monkeypatch.delenv('PPUTILS_MESH_CACHE', raising=False)
+  grd = str(tmp_path / 'tin.grd')
+  writeGrd(grd)
+  return grd
+
+def checkMesh(mesh):
+  n,e,x,y,z,ikle = mesh
+  assert (n, e) == (4, 2)
+  assert np.array_equal(z, [1.0, 2.0, 3.0, 4.0])
+  assert np.array_equal(ikle, [[0, 1, 2], [0, 2, 3]])
+
+def test_snapshot_arrays_are_not_memory_mapped(grd_file):
+  useMeshCache('local')
+  checkMesh(readAdcirc(grd_file))
+  assert os.path.isfile(grd_file + '.npz')
+  
+  mesh = readAdcirc(grd_file)
+  checkMesh(mesh)
+  for a in mesh[2:]:
+    assert not isinstance(a, np.memmap)
+
+@pytest.mark.parametrize('location', [None, False])
+def test_explicit_off_wins_over_environment(grd_file, monkeypatch, location):
+  monkeypatch.setenv('PPUTILS_MESH_CACHE', 'local')
+  useMeshCache(location)
+  checkMesh(readAdcirc(grd_file))
+  assert not os.path.exists(grd_file + '.npz')
+
+def test_unusable_cache_directory_falls_back(grd_file, tmp_path):
+  # a file where the cache directory should be
+  blocker = tmp_path / 'blocker'
+  blocker.write_text('')
+  useMeshCache(str(blocker / 'cache'))
+  checkMesh(readAdcirc(grd_file))
@@ -0,0 +1,93 @@
+#
+# Tests of the ppSELAFIN class (selafin_io_pp.py)
+#
+import os
+
+import numpy as np
+import pytest
+
+from conftest import writeSlf, frameValues
+from ppmodules.selafin_io_pp import *
+
+def openSlf(slf_file):
+  slf = ppSELAFIN(slf_file)
+  slf.readHeader()
+  slf.readTimes()
+  return slf
+
+def test_resampleFrames_interpolates(slf_file):
+  slf = openSlf(slf_file)
+  npoin = slf.getNPOIN()
+  out = list(slf.resampleFrames([0.0, 15.0, 40.0]))
+  assert [t for t, vals in out] == [0.0, 15.0, 40.0]
+  assert np.allclose(out[0][1], frameValues(2, npoin, 0))
+  assert np.allclose(out[1][1], frameValues(2, npoin, 1.5))
+  assert np.allclose(out[2][1], frameValues(2, npoin, 4))
+  slf.close()
+
+def test_resampleFrames_without_time_steps(tmp_path):
+  slf = openSlf(writeSlf(str(tmp_path / 'empty.slf'), ntimes=0))
+  with pytest.raises(ValueError):
+    list(slf.resampleFrames([0.0, 10.0]))
+  slf.close()
+
+@pytest.mark.parametrize('new_times', [[-5.0, 10.0], [10.0, 45.0]])
+def test_resampleFrames_outside_times(slf_file, new_times):
+  slf = openSlf(slf_file)
+  with pytest.raises(ValueError):
+    list(slf.resampleFrames(new_times))
+  slf.close()
+
+def test_appendHeader_adds_time_steps(slf_file):
+  slf = openSlf(slf_file)
+  NBV1 = len(slf.getVarNames())
+  NPOIN = slf.getNPOIN()
+  slf.close()
+  
+  out = ppSELAFIN(slf_file)
+  out.setVarNames(['A', 'B'])
+  out.setMesh(0, NPOIN, 3, None, None, None, None)
+  out.appendHeader()
+  out.writeVariables(50.0, frameValues(NBV1, NPOIN, 5))
+  out.close()
+  
+  slf = openSlf(slf_file)
+  assert slf.getTimes() == [0.0, 10.0, 20.0, 30.0, 40.0, 50.0]
+  slf.readVariables(5)
+  assert np.allclose(slf.getVarValues(), frameValues(NBV1, NPOIN, 5))
+  slf.close()
+
+@pytest.mark.parametrize('nvars, nx, ftype, fsize', [
+  (3, 4, 'f', 4), (2, 5, 'f', 4), (2, 4, 'd', 8)])
+def test_appendHeader_with_different_dimensions(slf_file, tmp_path, nvars, 
+  nx, ftype, fsize):
+  other = writeSlf(str(tmp_path / 'other.slf'), nx=nx, nvars=nvars, 
+    ftype=ftype, fsize=fsize)
+  slf = openSlf(other)
+  
+  out = ppSELAFIN(slf_file)
+  out.setPrecision(ftype, fsize)
+  out.setVarNames(slf.getVarNames())
+  out.setMesh(0, slf.getNPOIN(), 3, None, None, None, None)
+  slf.close()
+  size = os.path.getsize(slf_file)
+  with pytest.raises(ValueError):
+    out.appendHeader()
+  out.close()
+  assert os.path.getsize(slf_file) == size
+
+def test_appendHeader_with_partial_time_step(slf_file):
+  with open(slf_file, 'ab') as f:
+    f.write(b'\0' * 10)
+  size = os.path.getsize(slf_file)
+  
+  out = ppSELAFIN(slf_file)
+  with pytest.raises(ValueError):
+    out.appendHeader()
+  out.close()
+  assert os.path.getsize(slf_file) == size
+  
+  out = ppSELAFIN(slf_file)
+  out.appendHeader(truncate=True)
+  out.close()
+  assert os.path.getsize(slf_file) == size - 10
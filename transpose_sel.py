@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+#
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#                                                                       #
+#                                 transpose_sel.py                      #
+#                                                                       #
+#+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!+!
+#
+# Author: Pat Prodanovic, Ph.D., P.Eng.
+#
+# Date: Oct 17, 2026
+#
+# Purpose: Script takes in a *.slf file, and writes a time major companion
+# file (*.slft) next to it. A *.slf file stores all nodes for one time
+# step after another, so the time series at a single node is spread over
+# the whole file. The companion file stores all time steps of a variable 
+# at a node one after another, which makes the time series at a node a
+# single contiguous read. Once the companion file is written, the time 
+# series readers of ppSELAFIN (and extract_pt.py) use it whenever it is
+# cheaper than reading the *.slf file. The companion file is ignored once
+# the *.slf file is changed; simply run this script again. The *.slf 
+# file is read once, a block of time steps at a time.
+#
+# Uses: Python 2 or 3, Numpy
+#
+# Example:
+#
+# python transpose_sel.py -i in.slf
+# where:
+# -i input *.slf file
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# Global Imports
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+import os,sys
+import numpy as np
+from ppmodules.selafin_io_pp import *
+#
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+# MAIN
+#~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+curdir = os.getcwd()
+#
+# I/O
+if len(sys.argv) != 3 :
+  print('Wrong number of Arguments, stopping now...')
+  print('Usage:')
+  print('python transpose_sel.py -i in.slf')
+  sys.exit()
+
+input_file = sys.argv[2]
+
+# reads the *.slf file
+slf = ppSELAFIN(input_file)
+slf.readHeader()
+
+if slf.readTransposed():
+  print('Companion file ' + slf.t_file + ' is up to date. Exiting!')
+  sys.exit()
+
+print('Writing companion file ' + slf.t_file)
+slf.writeTransposed()
+
+slf.close()
+
+print('All done!')